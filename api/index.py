@@ -18,9 +18,16 @@ if backend_path not in sys.path:
 # Change working directory to backend for relative imports
 os.chdir(backend_path)
 
+# Time the cold-start imports and defer router imports to their first request
+os.environ.setdefault("LAZY_ROUTERS", "1")
+
 try:
+    from services.import_timing import import_timer
+    import_timer.start()
     from mangum import Mangum
     from app.main import app
+    import_timer.stop()
+    print(import_timer.summary())  # Shows up in Vercel logs; full breakdown at /startup/report
     
     # Wrap FastAPI app with Mangum for AWS Lambda/Vercel compatibility
     mangum_handler = Mangum(app, lifespan="off")
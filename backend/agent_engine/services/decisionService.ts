@@ -309,7 +309,8 @@ if (typeof require !== 'undefined' && require.main === module) {
 }
 
 // Alternative: Read all stdin at once (better for subprocess calls)
-if (process.stdin.isTTY === false) {
+// Only when run directly: decisionWorker.ts imports this module and owns stdin
+if (require.main === module && process.stdin.isTTY === false) {
   // Running in non-interactive mode (piped input)
   let inputData = '';
   process.stdin.setEncoding('utf8');
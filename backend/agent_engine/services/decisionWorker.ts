@@ -0,0 +1,77 @@
+/**
+ * Decision Worker
+ * Long-lived JSON-RPC worker that runs decision pipelines for batch requests,
+ * so a batch shares one warm Node process (and its Gemini / Snowflake clients).
+ *
+ * Protocol: Content-Length framed JSON-RPC 2.0 over stdio (see src/services/jsonRpcWorker.ts).
+ */
+
+import { processDecision } from './decisionService';
+import { fetchAllPolymarketMarkets, PolymarketMarket } from '../market_selection/polymarket';
+import { MarketData, AgentData } from '../agents/baseAgent';
+import { Handler, serveJsonRpc } from '../../src/services/jsonRpcWorker';
+
+interface EnrichedEntry {
+  market: MarketData;
+  polymarket: Record<string, any> | null;
+}
+
+function findListing(market: MarketData, listings: PolymarketMarket[]): PolymarketMarket | undefined {
+  const question = typeof market.question === 'string' ? market.question.trim().toLowerCase() : '';
+  return listings.find(m =>
+    (market.symbol && (m.condition_id === market.symbol || m.conditionId === market.symbol)) ||
+    (question && typeof m.question === 'string' && m.question.trim().toLowerCase() === question)
+  );
+}
+
+function yesPrice(listing: PolymarketMarket): number | undefined {
+  const yes = listing.outcomes?.find(o => o.name.toLowerCase().includes('yes'));
+  return yes?.price ?? listing.outcomes?.[0]?.price;
+}
+
+/**
+ * Fill in each market from ONE Polymarket listing fetch shared by the whole batch.
+ * Fields the caller supplied win; markets that aren't listed pass through unchanged.
+ */
+async function enrichMarkets(markets: MarketData[]): Promise<EnrichedEntry[]> {
+  let listings: PolymarketMarket[] = [];
+  try {
+    listings = await fetchAllPolymarketMarkets();
+  } catch (error) {
+    console.error('[DecisionWorker] Market listing unavailable, skipping enrichment:', error);
+  }
+
+  return markets.map(market => {
+    const listing = findListing(market, listings);
+    if (!listing) {
+      return { market, polymarket: null };
+    }
+    return {
+      market: {
+        ...market,
+        symbol: market.symbol || listing.condition_id || listing.conditionId,
+        question: market.question || listing.question,
+        price: typeof market.price === 'number' ? market.price : (yesPrice(listing) ?? 0.5),
+        volume24h: market.volume24h ?? (listing.volume || listing.total_volume || 0),
+        marketCap: market.marketCap ?? (listing.liquidity || listing.total_liquidity || 0),
+      },
+      polymarket: {
+        conditionId: listing.condition_id || listing.conditionId,
+        volume: listing.volume || listing.total_volume || 0,
+        liquidity: listing.liquidity || listing.total_liquidity || 0,
+        outcomes: listing.outcomes || [],
+        active: listing.active,
+        closed: listing.closed,
+        endDate: listing.end_date_iso || listing.endDate,
+      },
+    };
+  });
+}
+
+const methods: Record<string, Handler> = {
+  ping: async () => 'pong',
+  enrichMarkets,
+  processDecision: (market: MarketData, data: AgentData) => processDecision(market, data),
+};
+
+serveJsonRpc({ name: 'DecisionWorker', methods });
@@ -4,16 +4,54 @@ This file should only contain app setup and router registration.
 All endpoints should be organized in separate router files.
 """
 import os
+import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-# Import routers
-from routers import vault, users, positions, governance, agents, reports, agentDecision
+from db.database import database
+from db.repositories import dashboard_reads
+from services.dashboard_worker import dashboard_worker
+from services.cache import dashboard_cache
+from services.decision_cache import decision_cache
+from services.http_cache import HTTPCacheMiddleware
+from services.import_timing import import_timer
+from services.lazy_routers import LAZY_ROUTERS, LazyRouterMiddleware, RouterRegistry
+from services.metrics import MetricsMiddleware, metrics
+from services.profiler import ProfilerMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start the dashboard worker up front so the first request doesn't pay for it.
+    # If it can't start (e.g. no Node), calls start it lazily and fall back on error.
+    # With DATABASE_URL set, reads are served in-process and the worker isn't needed.
+    if dashboard_reads is None:
+        try:
+            await dashboard_worker.start()
+        except Exception as e:
+            print(f"Dashboard worker not started: {e}")
+    # Load stored decisions now rather than on the first cache miss
+    await decision_cache.replay()
+    yield
+    # With lazy routers the decision router may never have been imported
+    agent_decision = sys.modules.get("routers.agentDecision")
+    if agent_decision is not None:
+        await agent_decision.decision_jobs.stop()
+    decision_batch = sys.modules.get("services.decision_batch")
+    if decision_batch is not None:
+        await decision_batch.decision_worker.stop()
+    await dashboard_worker.stop()
+    if database is not None:
+        database.close()
+
 
 app = FastAPI(
     title="Quack API",
     description="API for Solana AI Hedge Syndicate",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS Configuration
@@ -44,24 +82,46 @@ if railway_env:
     # Also allow all origins in Railway (can be restricted for production)
     allowed_origins = ["*"]
 
+# ETags, 304s and compression for GET responses (inside CORS, so 304s get CORS headers)
+app.add_middleware(
+    HTTPCacheMiddleware,
+    minimum_size=int(os.getenv("HTTP_COMPRESS_MIN_SIZE", "1024")),
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins if allowed_origins != ["*"] else ["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Register routers
-app.include_router(vault.router, prefix="/api/vault", tags=["vault"])
-app.include_router(users.router, prefix="/api/user", tags=["user"])
+# Per-route request counts, latency and in-flight gauges, exported at /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Opt-in stack sampling of single requests (PROFILER_SECRET / PROFILE_SAMPLE_RATE)
+app.add_middleware(ProfilerMiddleware)
+
+# Register routers (module under routers/, prefix, tags)
+routers = RouterRegistry(app)
+routers.add("vault", "/api/vault", ["vault"])
+routers.add("users", "/api/user", ["user"])
 # Also register users router with /api/users for frontend compatibility
-app.include_router(users.router, prefix="/api/users", tags=["user"])
-app.include_router(positions.router, prefix="/api/positions", tags=["positions"])
-app.include_router(governance.router, prefix="/api/governance", tags=["governance"])
-app.include_router(agents.router, prefix="/api/agents", tags=["agents"])
-app.include_router(reports.router, prefix="/api/reports", tags=["reports"])
-app.include_router(agentDecision.router, prefix="/api/agents", tags=["agents"])
+routers.add("users", "/api/users", ["user"])
+routers.add("positions", "/api/positions", ["positions"])
+routers.add("governance", "/api/governance", ["governance"])
+routers.add("agents", "/api/agents", ["agents"])
+routers.add("reports", "/api/reports", ["reports"])
+routers.add("agentDecision", "/api/agents", ["agents"])
+routers.add("decisions", "/api/agents", ["agents"])
+routers.add("admin", "/api/admin", ["admin"])
+
+if LAZY_ROUTERS:
+    # Serverless cold starts: import each router on the first request under its prefix
+    app.add_middleware(LazyRouterMiddleware, registry=routers)
+else:
+    routers.load()
 
 
 @app.get("/")
@@ -74,4 +134,24 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    decision_engine = sys.modules.get("services.decision_engine")
+    return {
+        "caches": [dashboard_cache.stats(), decision_cache.stats()],
+        "single_flight": [decision_engine.decision_flights.stats()] if decision_engine else [],
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 
+@app.get("/startup/report")
+async def startup_report():
+    return {
+        "lazy_routers": LAZY_ROUTERS,
+        "routers": routers.stats(),
+        "imports": import_timer.report() if import_timer.modules else None,
+    }
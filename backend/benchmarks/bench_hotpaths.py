@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the data-generation, transform and serialization hot paths
+Run from backend/: python benchmarks/bench_hotpaths.py [--scales 365,10000,100000] [--json] [--baseline FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Benchmarks generate their own data; never map a snapshot from the working tree
+os.environ["CONSISTENT_DATA_SNAPSHOT"] = ""
+# Nor write fake decisions into a persistent decision cache
+os.environ.setdefault("DECISION_CACHE_PATH", "")
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from benchmarks.fixtures import fake_decisions
+from data import consistent_data
+from routers import governance
+from schemas.governance import ProposalsResponse
+from schemas.vault import PortfolioAmountResponse
+from services import decision_transform
+from services.serialization import dump_json
+
+
+def measure(fn, repeat: int, setup=None):
+    """
+    Per-call wall time (ms) over ``repeat`` runs; cheap calls are looped for
+    at least 0.2s per run. ``setup`` runs untimed before every call, for
+    cases that must start cold.
+    """
+    if setup is None:
+        timer = timeit.Timer(fn)
+        loops, _ = timer.autorange()
+        samples = [t / loops for t in timer.repeat(repeat, loops)]
+    else:
+        loops = 1
+        samples = []
+        for _ in range(repeat):
+            setup()
+            samples.append(timeit.timeit(fn, number=1))
+    return {
+        "loops": loops,
+        "ms_min": round(min(samples) * 1000, 4),
+        "ms_median": round(statistics.median(samples) * 1000, 4),
+    }
+
+
+class Scaled:
+    """
+    Rebuild consistent_data's bets at ``bets`` rows for the duration of a block.
+    """
+
+    def __init__(self, bets: int):
+        self.bets = bets
+
+    def __enter__(self):
+        self._saved = consistent_data.TOTAL_BETS, consistent_data.BET_STORE, governance.BET_STORE
+        consistent_data.TOTAL_BETS = self.bets
+        store = consistent_data.generate_bet_store(datetime.now())
+        consistent_data.BET_STORE = governance.BET_STORE = store
+        return store
+
+    def __exit__(self, *exc):
+        consistent_data.TOTAL_BETS, consistent_data.BET_STORE, governance.BET_STORE = self._saved
+
+
+def bet_cases(scale: int):
+    with Scaled(scale) as store:
+        yield "consistent_data.generate_bet_store", lambda: consistent_data.generate_bet_store(datetime.now()), None
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "bench.snapshot"
+            consistent_data.write_bet_snapshot(path)
+            saved_path = consistent_data.SNAPSHOT_PATH
+            consistent_data.SNAPSHOT_PATH = str(path)
+            try:
+                yield "consistent_data.load_bet_store (snapshot)", consistent_data.load_bet_store, None
+            finally:
+                consistent_data.SNAPSHOT_PATH = saved_path
+
+        def bet_stats():
+            settled = store.positions(status="APPROVED", bet_status="CLOSED")
+            return (
+                int(np.count_nonzero(store.result[settled] == consistent_data.RESULT_WIN)),
+                float(store.pnl[settled].sum()),
+            )
+
+        yield "consistent_data bet stats", bet_stats, None
+
+        middle = governance.BET_STORE.key(store.to_dict(len(store) // 2))
+        cursor = {"t": middle[0], "id": middle[1]}
+        yield "governance.fetch_mock_page (100, mid cursor)", lambda: governance.fetch_mock_page(100, None, cursor), None
+
+        proposals = [governance.bet_to_proposal(bet) for bet in store]
+        adapter = TypeAdapter(ProposalsResponse)
+        yield "serialize proposals (response_model)", lambda: json.dumps(jsonable_encoder(adapter.validate_python(proposals))), None
+        yield "serialize proposals (dump_json)", lambda: dump_json(proposals), None
+
+
+def decision_cases(scale: int):
+    decisions = fake_decisions(scale)
+
+    def transform():
+        return decision_transform.decisions_to_proposals(decisions, detailed=True)
+
+    yield "decisions_to_proposals (detailed, cold)", transform, decision_transform.clear_memo
+    transform()
+    yield "decisions_to_proposals (detailed, memoized)", transform, None
+    decision_transform.clear_memo()
+
+
+def history_cases(days: int):
+    def history():
+        return consistent_data.generate_portfolio_amount_history(days, points=days)
+
+    yield "generate_portfolio_amount_history (cold)", history, consistent_data._portfolio_history_cache.clear
+    yield "generate_portfolio_amount_history (cached)", history, None
+    adapter = TypeAdapter(PortfolioAmountResponse)
+    data = history()
+    yield "serialize portfolio history (response_model)", lambda: json.dumps(jsonable_encoder(adapter.validate_python(data))), None
+
+
+def position_cases(scale: int):
+    yield "generate_positions", consistent_data.generate_positions, None
+
+
+def run(scales, decision_scales, days, repeat, only):
+    suites = [("bets", scale, bet_cases) for scale in scales]
+    suites += [("decisions", scale, decision_cases) for scale in decision_scales]
+    suites += [("days", n, history_cases) for n in days]
+    suites.append(("open bets", consistent_data.OPEN_BETS_COUNT, position_cases))
+    results = []
+    for unit, scale, cases in suites:
+        # Cases are yielded from inside their fixtures' setup, so they're measured in place
+        for name, fn, setup in cases(scale):
+            if only and only not in name:
+                continue
+            results.append({"case": name, "scale": scale, "unit": unit, **measure(fn, repeat, setup)})
+    return results
+
+
+def compare(results, baseline_path: Path, threshold: float):
+    """
+    Cases slower than ``threshold`` x their median in a previous --json run.
+    """
+    baseline = {
+        (row["case"], row["scale"]): row["ms_median"]
+        for row in json.loads(baseline_path.read_text())["results"]
+    }
+    regressions = []
+    for row in results:
+        before = baseline.get((row["case"], row["scale"]))
+        if before:
+            row["baseline_ms_median"] = before
+            row["ratio"] = round(row["ms_median"] / before, 3)
+            if row["ratio"] > threshold:
+                regressions.append(row)
+    return regressions
+
+
+def parse_ints(value: str):
+    return [int(item) for item in value.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=parse_ints, default=[365, 10000, 100000], help="Bet counts")
+    parser.add_argument("--decision-scales", type=parse_ints, default=[100, 1000, 10000], help="Decision row counts")
+    parser.add_argument("--days", type=parse_ints, default=[30, 365, 1095], help="Portfolio history lengths")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="Run only cases whose name contains this")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    parser.add_argument("--baseline", type=Path, help="Earlier --json output to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio that counts as a regression")
+    args = parser.parse_args()
+
+    results = run(args.scales, args.decision_scales, args.days, args.repeat, args.only)
+    regressions = compare(results, args.baseline, args.threshold) if args.baseline else []
+
+    if args.json:
+        print(json.dumps({
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "results": results,
+            "regressions": [f"{row['case']} @ {row['scale']}" for row in regressions],
+        }, indent=2))
+    else:
+        print(f"{'case':48} {'scale':>8} {'median ms':>11} {'min ms':>10} {'loops':>7}")
+        for row in results:
+            ratio = f"  x{row['ratio']:.2f}" if "ratio" in row else ""
+            print(
+                f"{row['case']:48} {row['scale']:>8} {row['ms_median']:>11.4f} {row['ms_min']:>10.4f} "
+                f"{row['loops']:>7}{ratio}"
+            )
+        for row in regressions:
+            print(f"REGRESSION: {row['case']} @ {row['scale']} is {row['ratio']:.2f}x its baseline")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
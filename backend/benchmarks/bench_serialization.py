@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Per-request CPU cost of the largest JSON endpoints, default vs FAST_RESPONSES
+Drives the app in-process over ASGI (needs httpx); run from backend/: python benchmarks/bench_serialization.py
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Fake decisions must never reach a persistent decision cache
+os.environ.setdefault("DECISION_CACHE_PATH", "")
+
+import httpx
+from app.main import app
+from benchmarks.fixtures import fake_decisions
+from services import serialization
+from services.cache import dashboard_cache
+
+DECISIONS_LIMIT = 100
+
+ENDPOINTS = [
+    ("proposals (mock, 100)", "/api/governance/proposals?use_real_data=false&limit=100"),
+    ("decisions (detailed, 100)", f"/api/agents/decisions?limit={DECISIONS_LIMIT}"),
+    ("tvl history (1095d, 1000 pts)", "/api/vault/tvl/history?days=1095&points=1000"),
+    ("portfolio amount (1095d)", "/api/vault/portfolio/amount?days=1095"),
+    ("nav history (365d, daily)", "/api/vault/nav/history?days=365&points=365"),
+]
+
+
+async def measure(client: httpx.AsyncClient, url: str, requests: int, warmup: int):
+    for _ in range(warmup):
+        (await client.get(url)).raise_for_status()
+    samples = []
+    for _ in range(requests):
+        start = time.process_time()
+        response = await client.get(url)
+        samples.append(time.process_time() - start)
+        response.raise_for_status()
+    return samples, response.content
+
+
+async def run(requests: int, warmup: int):
+    # Serve the decisions endpoint from the dashboard cache instead of Snowflake
+    dashboard_cache.ttl = 3600
+    dashboard_cache.set(("getLatestDecisions", (DECISIONS_LIMIT,)), fake_decisions(DECISIONS_LIMIT))
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, url in ENDPOINTS:
+            row = {"endpoint": name, "url": url}
+            bodies = {}
+            for mode, enabled in (("default", False), ("fast", True)):
+                serialization.FAST_RESPONSES = enabled
+                samples, body = await measure(client, url, requests, warmup)
+                bodies[mode] = json.loads(body)
+                row[mode] = {
+                    "cpu_ms_mean": round(statistics.mean(samples) * 1000, 3),
+                    "cpu_ms_p50": round(statistics.median(samples) * 1000, 3),
+                    "bytes": len(body),
+                }
+            row["speedup"] = round(row["default"]["cpu_ms_mean"] / row["fast"]["cpu_ms_mean"], 2)
+            row["same_payload"] = bodies["default"] == bodies["fast"]
+            results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.requests, args.warmup))
+    if args.json:
+        print(json.dumps({"json_library": "orjson" if serialization.orjson else "pydantic-core", "results": results}, indent=2))
+        return
+
+    print(f"{'endpoint':32} {'default ms':>11} {'fast ms':>9} {'speedup':>8} {'bytes':>9}  same")
+    for row in results:
+        print(
+            f"{row['endpoint']:32} {row['default']['cpu_ms_mean']:>11.3f} {row['fast']['cpu_ms_mean']:>9.3f} "
+            f"{row['speedup']:>7.2f}x {row['fast']['bytes']:>9}  {row['same_payload']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Synthetic inputs and stand-in backends shared by the benchmarks
+Decision rows shaped like dashboard.ts output and fake upstreams, so no Snowflake or Node is needed
+"""
+import asyncio
+import json
+import random
+
+from services.dashboard_worker import DashboardWorkerError, dashboard_worker
+from services.decision_engine import decision_engine
+
+
+def fake_decisions(count: int):
+    # Decision rows shaped like dashboard.ts getLatestDecisions output
+    decisions = []
+    for i in range(count):
+        agent_outputs = [
+            {
+                "agent": f"agent-{a}",
+                "decision": {
+                    "direction": "YES" if (i + a) % 3 else "NO",
+                    "confidence": 60 + (i * a) % 35,
+                    "reasoning": f"Agent {a} analysis of market {i}: " + "liquidity and momentum look supportive. " * 12,
+                },
+            }
+            for a in range(5)
+        ]
+        decisions.append({
+            "id": f"decision-{i:05d}",
+            "market_id": f"market-{i}",
+            "market_question": f"Will benchmark market {i} resolve YES?",
+            "final_direction": "YES" if i % 2 else "NO",
+            "final_size": 1000 + i * 17.5,
+            "consensus_reasoning": "Consensus reasoning. " * 40,
+            "agent_outputs": json.dumps(agent_outputs),
+            "created_at": f"2025-01-{1 + i % 28:02d}T12:00:{i % 60:02d}.000Z",
+        })
+    return decisions
+
+
+class FakeBackend:
+    """
+    Latency and failure model for a stand-in upstream: each call waits
+    ``latency_ms`` +/- ``jitter_ms`` and fails with probability ``failure_rate``.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+
+    async def wait(self) -> bool:
+        """
+        Sleep for one call's latency; returns whether the call should fail.
+        """
+        self.calls += 1
+        delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        await asyncio.sleep(max(0.0, delay) / 1000)
+        failed = self._random.random() < self.failure_rate
+        self.failures += failed
+        return failed
+
+
+class FakeDashboard(FakeBackend):
+    """
+    Stand-in for the dashboard worker (Snowflake) serving ``fake_decisions``.
+    ``install`` routes every dashboard call through it, below the shared cache.
+    """
+
+    def __init__(self, decisions: int = 500, **kwargs):
+        super().__init__(**kwargs)
+        rows = fake_decisions(decisions)
+        self.decisions = sorted(rows, key=lambda d: (d["created_at"], d["id"]), reverse=True)
+        self.by_id = {d["id"]: d for d in rows}
+
+    def install(self):
+        dashboard_worker.call = self.call
+
+    def uninstall(self):
+        dashboard_worker.__dict__.pop("call", None)
+
+    async def call(self, method: str, *params, timeout=None):
+        if await self.wait():
+            raise DashboardWorkerError(f"Fake dashboard failure in {method}")
+        if method == "getLatestDecisions":
+            return self.decisions[:params[0]]
+        if method == "getDecisionsPage":
+            limit, direction, after_ts, after_id = params
+            rows = self.decisions
+            if direction:
+                rows = [d for d in rows if d["final_direction"] == direction]
+            if after_ts and after_id:
+                rows = [d for d in rows if (d["created_at"], d["id"]) < (after_ts, after_id)]
+            return rows[:limit]
+        if method == "getDecisionById":
+            return self.by_id.get(params[0])
+        return []
+
+
+class FakeDecisionEngine(FakeBackend):
+    """
+    Stand-in for the Node decision pipeline. ``install`` replaces only the
+    subprocess step, so queueing, the debate hub and caching stay real.
+    """
+
+    def install(self):
+        decision_engine._execute = self.execute
+
+    def uninstall(self):
+        decision_engine.__dict__.pop("_execute", None)
+
+    async def execute(self, request_json: bytes, on_progress=None):
+        if on_progress:
+            on_progress("[DecisionService] Running agents for market (fake engine)")
+        if await self.wait():
+            raise Exception("ts-node error: fake decision engine failure")
+        market = json.loads(request_json).get("market") or {}
+        outputs = [
+            {
+                "agent": f"agent-{a}",
+                "decision": {
+                    "direction": "YES" if a % 2 else "NO",
+                    "confidence": 60.0 + a * 5,
+                    "size": 100.0,
+                    "reasoning": f"Agent {a} reasoning.",
+                },
+            }
+            for a in range(5)
+        ]
+        return {
+            "status": "ok",
+            "decision_id": f"fake-{self.calls}",
+            "investment_decision": {"direction": "YES", "size": 250.0, "confidence": 72.0, "summary": "Fake consensus."},
+            "agent_analysis": [{"agent_name": o["agent"], **o["decision"]} for o in outputs],
+            "conversation_logs": {"initial_decisions": outputs, "final_decisions": outputs},
+            "market_info": market,
+        }
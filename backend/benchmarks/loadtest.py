@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+In-process load test of the FastAPI app with fake Snowflake / decision engine backends
+Run from backend/: python benchmarks/loadtest.py [--concurrency 50] [--duration 5] [--json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("TIMESERIES_DIR", "")
+os.environ.setdefault("DECISION_CACHE_PATH", "")
+
+import httpx
+import numpy as np
+from app.main import app
+from benchmarks.fixtures import FakeDashboard, FakeDecisionEngine
+from services.cache import dashboard_cache
+from services.metrics import FALLBACK_RESPONSES
+
+DECISION_BODY = {"market": {"question": "Will the load test pass?", "price": 0.5}}
+
+# name, method, path ({decision_id} is filled per request), JSON body
+ENDPOINTS = [
+    ("proposals (real)", "GET", "/api/governance/proposals?limit=50", None),
+    ("proposals (mock)", "GET", "/api/governance/proposals?use_real_data=false&limit=50", None),
+    ("decisions", "GET", "/api/agents/decisions?limit=20", None),
+    ("debate transcript", "GET", "/api/agents/debate/{decision_id}", None),
+    ("decision by id", "GET", "/api/agents/decisions/{decision_id}", None),
+    ("tvl history", "GET", "/api/vault/tvl/history?days=365", None),
+    ("vault stats", "GET", "/api/vault/stats", None),
+    ("run decision", "POST", "/api/agents/decision", DECISION_BODY),
+]
+
+
+def percentiles_ms(samples: List[float]) -> Dict[str, Optional[float]]:
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+    return {
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(max(samples) * 1000, 3),
+    }
+
+
+async def monitor_loop_lag(samples: List[float], stop: asyncio.Event, interval: float = 0.01):
+    # How late a short sleep wakes up: time the loop spent unable to run ready tasks
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - started - interval))
+
+
+async def run_phase(
+    client: httpx.AsyncClient,
+    endpoints: List[tuple],
+    decision_ids: List[str],
+    concurrency: int,
+    duration: float,
+    seed: int,
+) -> Dict[str, Any]:
+    """
+    ``concurrency`` closed-loop clients send requests to ``endpoints`` (chosen
+    at random) for ``duration`` seconds.
+
+    Latency is time spent inside the app. CPU-bound handlers block the shared
+    loop, so the queueing a new request would see shows up as loop lag.
+    Responses the app served from mock data after a failure count as errors
+    even though their status is 200.
+    """
+    rng = random.Random(seed)
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    lag: List[float] = []
+    stop = asyncio.Event()
+    deadline = loop.time() + duration
+
+    async def client_loop():
+        while loop.time() < deadline:
+            _, method, path, body = rng.choice(endpoints)
+            url = path.format(decision_id=rng.choice(decision_ids))
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                statuses[response.status_code] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+            # In-process requests that never wait on I/O don't suspend; yield like a socket would
+            await asyncio.sleep(0)
+
+    monitor = asyncio.create_task(monitor_loop_lag(lag, stop))
+    fallbacks_before = FALLBACK_RESPONSES.total()
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+
+    fallbacks = int(FALLBACK_RESPONSES.total() - fallbacks_before)
+    ok = sum(count for status, count in statuses.items() if isinstance(status, int) and status < 400) - fallbacks
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "error_rate": round(1 - ok / len(latencies), 4) if latencies else None,
+        "fallbacks": fallbacks,
+        "statuses": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        "latency_ms": percentiles_ms(latencies),
+        "loop_lag_ms": percentiles_ms(lag),
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    dashboard = FakeDashboard(
+        decisions=args.decisions,
+        latency_ms=args.dashboard_latency_ms,
+        jitter_ms=args.dashboard_jitter_ms,
+        failure_rate=args.dashboard_failure_rate,
+        seed=args.seed,
+    )
+    engine = FakeDecisionEngine(
+        latency_ms=args.engine_latency_ms,
+        jitter_ms=args.engine_jitter_ms,
+        failure_rate=args.engine_failure_rate,
+        seed=args.seed,
+    )
+    if args.cache_ttl is not None:
+        dashboard_cache.ttl = args.cache_ttl
+    decision_ids = list(dashboard.by_id)
+
+    endpoints = [e for e in ENDPOINTS if not args.only or args.only in e[0]]
+    phases = [(endpoint[0], [endpoint]) for endpoint in endpoints]
+    if args.mix and len(endpoints) > 1:
+        phases.append(("mix (all of the above)", endpoints))
+
+    dashboard.install()
+    engine.install()
+    results = []
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+            for name, phase_endpoints in phases:
+                dashboard_cache.invalidate()
+                row = await run_phase(client, phase_endpoints, decision_ids, args.concurrency, args.duration, args.seed)
+                results.append({"endpoint": name, **row})
+    finally:
+        dashboard.uninstall()
+        engine.uninstall()
+
+    return {
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "backends": {
+            "dashboard": {"latency_ms": args.dashboard_latency_ms, "failure_rate": args.dashboard_failure_rate,
+                          "calls": dashboard.calls, "failures": dashboard.failures},
+            "decision_engine": {"latency_ms": args.engine_latency_ms, "failure_rate": args.engine_failure_rate,
+                                "calls": engine.calls, "failures": engine.failures},
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent closed-loop clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per endpoint")
+    parser.add_argument("--only", help="Only endpoints whose name contains this")
+    parser.add_argument("--mix", action="store_true", help="Also run all selected endpoints together")
+    parser.add_argument("--decisions", type=int, default=500, help="Rows in the fake decisions table")
+    parser.add_argument("--dashboard-latency-ms", type=float, default=40.0)
+    parser.add_argument("--dashboard-jitter-ms", type=float, default=20.0)
+    parser.add_argument("--dashboard-failure-rate", type=float, default=0.01)
+    parser.add_argument("--engine-latency-ms", type=float, default=500.0)
+    parser.add_argument("--engine-jitter-ms", type=float, default=200.0)
+    parser.add_argument("--engine-failure-rate", type=float, default=0.05)
+    parser.add_argument("--cache-ttl", type=float, help="Override the dashboard cache TTL (0 disables caching)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"concurrency {report['concurrency']}, {report['duration_s']}s per endpoint")
+    print(
+        f"{'endpoint':24} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'lag p99':>8} {'lag max':>8} {'errors':>7} {'fallbk':>7}  statuses"
+    )
+    for row in report["results"]:
+        latency, lag = row["latency_ms"], row["loop_lag_ms"]
+        print(
+            f"{row['endpoint']:24} {row['throughput_rps']:>8.1f} {latency['p50']:>8.1f} {latency['p95']:>8.1f} "
+            f"{latency['p99']:>8.1f} {lag['p99']:>8.1f} {lag['max']:>8.1f} {row['error_rate']:>7.1%} {row['fallbacks']:>7}  {row['statuses']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
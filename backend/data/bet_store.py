@@ -0,0 +1,211 @@
+"""
+Columnar bet store
+Bets are kept as typed NumPy columns; display dicts are only built when serialized
+"""
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+BetKey = Tuple[str, str]  # (timestamp, id) - the store's sort order
+
+# Categorical columns are stored as small integer codes into these tuples
+STATUSES = ("PENDING", "APPROVED", "REJECTED", "EXECUTED")
+BET_STATUSES = ("OPEN", "CLOSED")
+RESULTS = (None, "WIN", "LOSS")
+VOTES = ("YES", "NO")
+
+RESULT_NONE, RESULT_WIN, RESULT_LOSS = 0, 1, 2
+
+COLUMN_DTYPES = {
+    "description": np.uint16,    # index into the store's descriptions
+    "status": np.uint8,          # index into STATUSES
+    "bet_status": np.uint8,      # index into BET_STATUSES
+    "result": np.uint8,          # index into RESULTS
+    "vote": np.uint8,            # index into VOTES
+    "position_size": np.int32,   # whole dollars
+    "risk_score": np.float32,
+    "confidence": np.uint8,
+    "timestamp": "datetime64[us]",
+    "pnl": np.float64,           # user's share of the win/loss, 0 if unsettled
+}
+
+
+class BetStore:
+    """
+    Column-oriented bets ordered by (timestamp, id).
+
+    Every column is a NumPy array of length ``len(store)`` and can be used
+    directly for vectorized aggregates. Lookups go through a sorted index on id
+    and precomputed position arrays for each status / betStatus filter.
+    """
+
+    def __init__(self, ids: Sequence[str], descriptions: Sequence[str], columns: Dict[str, Sequence]):
+        ids = np.asarray(ids, dtype=str)
+        columns = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+
+        # Sort once by (timestamp, id); lexsort uses the last key as primary
+        order = np.lexsort((ids, columns["timestamp"]))
+        self.ids = ids[order]
+        self.descriptions = list(descriptions)
+        for name, values in columns.items():
+            setattr(self, name, values[order])
+
+        # Id lookups binary-search this permutation instead of holding a dict
+        self._id_order = np.argsort(self.ids).astype(np.int32)
+
+        # Position arrays for every filter combination; None acts as a wildcard
+        self._positions: Dict[Tuple[Optional[int], Optional[int]], np.ndarray] = {}
+        every = np.ones(len(self.ids), dtype=bool)
+        status_masks = {None: every, **{code: self.status == code for code in range(len(STATUSES))}}
+        bet_status_masks = {None: every, **{code: self.bet_status == code for code in range(len(BET_STATUSES))}}
+        for status, status_mask in status_masks.items():
+            for bet_status, bet_status_mask in bet_status_masks.items():
+                self._positions[(status, bet_status)] = np.flatnonzero(status_mask & bet_status_mask).astype(np.int32)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Every array the store is made of, sorted and indexed, keyed by name
+        (see ``from_arrays``). Descriptions are not included.
+        """
+        arrays = {"ids": self.ids, "id_order": self._id_order}
+        arrays.update((name, getattr(self, name)) for name in COLUMN_DTYPES)
+        for (status, bet_status), positions in self._positions.items():
+            arrays[_positions_name(status, bet_status)] = positions
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], descriptions: Sequence[str]) -> "BetStore":
+        """
+        Rebuild a store from ``to_arrays`` output without copying or re-sorting,
+        e.g. from read-only views into a memory-mapped snapshot.
+        """
+        store = cls.__new__(cls)
+        store.ids = arrays["ids"]
+        store.descriptions = list(descriptions)
+        for name in COLUMN_DTYPES:
+            setattr(store, name, arrays[name])
+        store._id_order = arrays["id_order"]
+        store._positions = {
+            (status, bet_status): arrays[_positions_name(status, bet_status)]
+            for status in (None, *range(len(STATUSES)))
+            for bet_status in (None, *range(len(BET_STATUSES)))
+        }
+        return store
+
+    @classmethod
+    def from_records(cls, bets: Sequence[dict]) -> "BetStore":
+        """
+        Build a store from Proposal-style bet dicts (as produced by ``to_dict``).
+        """
+        descriptions: List[str] = []
+        description_codes: Dict[str, int] = {}
+        columns: Dict[str, list] = {name: [] for name in COLUMN_DTYPES}
+        for bet in bets:
+            description = bet["betDescription"]
+            if description not in description_codes:
+                description_codes[description] = len(descriptions)
+                descriptions.append(description)
+            columns["description"].append(description_codes[description])
+            columns["status"].append(STATUSES.index(bet["status"]))
+            columns["bet_status"].append(BET_STATUSES.index(bet["betStatus"]))
+            columns["result"].append(RESULTS.index(bet.get("betResult")))
+            columns["vote"].append(VOTES.index(bet["vote"]))
+            columns["position_size"].append(int(str(bet["positionSize"]).lstrip("$").replace(",", "")))
+            columns["risk_score"].append(bet["riskScore"])
+            columns["confidence"].append(bet["confidence"])
+            columns["timestamp"].append(np.datetime64(bet["timestamp"].rstrip("Z"), "us"))
+            columns["pnl"].append(bet.get("pnl", 0.0))
+        return cls([bet["id"] for bet in bets], descriptions, columns)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[dict]:
+        return (self.to_dict(position) for position in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the column arrays and position indexes.
+        """
+        return sum(array.nbytes for array in self.to_arrays().values())
+
+    def to_dict(self, position: int) -> dict:
+        """
+        Materialize one bet with its display strings.
+        """
+        return {
+            "id": str(self.ids[position]),
+            "betDescription": self.descriptions[self.description[position]],
+            "status": STATUSES[self.status[position]],
+            "betStatus": BET_STATUSES[self.bet_status[position]],
+            "betResult": RESULTS[self.result[position]],
+            "timestamp": self.timestamp[position].item().isoformat() + "Z",
+            "vote": VOTES[self.vote[position]],
+            "positionSize": f"${int(self.position_size[position]):,}",
+            "riskScore": round(float(self.risk_score[position]), 1),
+            "confidence": int(self.confidence[position]),
+        }
+
+    def get(self, bet_id: str) -> Optional[dict]:
+        rank = int(np.searchsorted(self.ids, bet_id, sorter=self._id_order))
+        if rank == len(self.ids) or self.ids[self._id_order[rank]] != bet_id:
+            return None
+        return self.to_dict(int(self._id_order[rank]))
+
+    def positions(self, status: Optional[str] = None, bet_status: Optional[str] = None) -> np.ndarray:
+        """
+        Sorted positions of bets matching the given status and/or betStatus.
+        Unknown values match nothing.
+        """
+        try:
+            status_code = STATUSES.index(status) if status is not None else None
+            bet_status_code = BET_STATUSES.index(bet_status) if bet_status is not None else None
+        except ValueError:
+            return np.empty(0, dtype=np.int32)
+        return self._positions[(status_code, bet_status_code)]
+
+    def query(self, status: Optional[str] = None, bet_status: Optional[str] = None) -> List[dict]:
+        """
+        Bets matching the given status and/or betStatus, oldest first.
+        """
+        return [self.to_dict(p) for p in self.positions(status, bet_status)]
+
+    def count(self, status: Optional[str] = None, bet_status: Optional[str] = None) -> int:
+        return len(self.positions(status, bet_status))
+
+    def page(
+        self,
+        limit: int,
+        after: Optional[BetKey] = None,
+        status: Optional[str] = None,
+        bet_status: Optional[str] = None,
+    ) -> Tuple[List[dict], bool]:
+        """
+        Up to ``limit`` matching bets strictly after the ``after`` key, and
+        whether more remain. O(log n + limit).
+        """
+        positions = self.positions(status, bet_status)
+        start = 0
+        if after is not None:
+            start = int(np.searchsorted(positions, self._rank_after(after)))
+        window = positions[start:start + limit + 1]
+        return [self.to_dict(p) for p in window[:limit]], len(window) > limit
+
+    def _rank_after(self, key: BetKey) -> int:
+        # Number of bets whose (timestamp, id) sorts at or before ``key``
+        timestamp = np.datetime64(str(key[0]).rstrip("Z"), "us")
+        lo = int(np.searchsorted(self.timestamp, timestamp, side="left"))
+        hi = int(np.searchsorted(self.timestamp, timestamp, side="right"))
+        return lo + int(np.searchsorted(self.ids[lo:hi], key[1], side="right"))
+
+    @staticmethod
+    def key(bet: dict) -> BetKey:
+        return bet["timestamp"], bet["id"]
+
+
+def _positions_name(status: Optional[int], bet_status: Optional[int]) -> str:
+    return "positions.{}.{}".format(
+        "*" if status is None else status,
+        "*" if bet_status is None else bet_status,
+    )
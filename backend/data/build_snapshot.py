@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Build step: write the consistent_data bet snapshot that workers memory-map at startup
+Run from backend/: python data/build_snapshot.py [--output PATH]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Don't map a stale snapshot while rebuilding it
+os.environ["CONSISTENT_DATA_SNAPSHOT"] = ""
+
+from data import consistent_data
+from services.snapshot import Snapshot
+
+DEFAULT_OUTPUT = Path(consistent_data.__file__).with_name("consistent_data.snapshot")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store = consistent_data.write_bet_snapshot(args.output)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    snapshot = Snapshot(args.output)
+    print(
+        f"Wrote {args.output} (dataset {snapshot.version}): {len(store)} bets, "
+        f"{snapshot.nbytes:,} bytes in {elapsed_ms:.0f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,23 @@ Consistent data generation for all endpoints
 Ensures data matches across vault stats, user stats, portfolio amount, etc.
 """
 from datetime import datetime, timedelta
+import hashlib
+import os
 import random
+from pathlib import Path
+import numpy as np
+from services.resample import DEFAULT_POINTS, downsample
+from services.snapshot import load_snapshot, write_snapshot
+from data.bet_store import (
+    BetStore, COLUMN_DTYPES, STATUSES, BET_STATUSES, RESULTS, VOTES, RESULT_WIN, RESULT_LOSS
+)
 
 # Fixed seed for reproducibility
 random.seed(42)
 
 # Vault constants
 TOTAL_VAULT_VALUE_USD = 2847392.45
+VAULT_SHARE_PRICE = 1.0847
 SOL_PRICE_USD = 150.0  # Current SOL price
 
 # User constants
@@ -27,13 +37,7 @@ CLOSED_BETS_COUNT = TOTAL_BETS - OPEN_BETS_COUNT
 
 # Generate bet outcomes (80% win rate for approved bets)
 random.seed(42)  # Reset seed for consistent results
-WIN_COUNT = 0
-LOSE_COUNT = 0
-TOTAL_WIN_AMOUNT = 0.0
 
-# Generate all bets
-ALL_BETS = []
-BET_OUTCOMES = []  # Store outcomes with dates for portfolio history
 BET_DESCRIPTIONS = [
     "Will Trump say tariff",
     "Will BTC hit $100k by March",
@@ -52,65 +56,116 @@ BET_DESCRIPTIONS = [
     "Will Bitcoin halving cause price surge?",
 ]
 
-# Generate 365 bets over the past year
-start_date = datetime.now() - timedelta(days=365)
-for i in range(TOTAL_BETS):
-    bet_date = start_date + timedelta(days=i)
-    bet_id = f"prop-{i+1:03d}"
+# Prebuilt bets: ``python data/build_snapshot.py`` writes them here, and every
+# worker maps the file instead of regenerating (empty string disables)
+SNAPSHOT_PATH = os.getenv("CONSISTENT_DATA_SNAPSHOT", str(Path(__file__).with_name("consistent_data.snapshot")))
+
+# Bump when the bet generation below changes; snapshots of other versions are ignored
+GENERATOR_VERSION = 1
+DATASET_VERSION = hashlib.blake2b(
+    repr((GENERATOR_VERSION, TOTAL_BETS, OPEN_BETS_COUNT, BET_DESCRIPTIONS, sorted(COLUMN_DTYPES.items()))).encode("utf-8"),
+    digest_size=8,
+).hexdigest()
+
+
+def generate_bet_store(now: datetime) -> BetStore:
+    """
+    Generate 365 bets over the year before ``now``, one value per column per bet.
+    Reseeds and advances the global ``random`` state.
+    """
+    random.seed(42)
+    bet_ids = []
+    bet_columns = {name: [] for name in COLUMN_DTYPES}
+    start_date = now - timedelta(days=365)
+    for i in range(TOTAL_BETS):
+        bet_date = start_date + timedelta(days=i)
+        pnl = 0.0
     
-    # 80% approval rate
-    is_approved = random.random() < 0.8
+        # 80% approval rate
+        is_approved = random.random() < 0.8
     
-    if is_approved:
-        # 80% win rate for approved bets
-        is_win = random.random() < 0.8
-        bet_status = "OPEN" if i >= (TOTAL_BETS - OPEN_BETS_COUNT) else "CLOSED"
+        if is_approved:
+            # 80% win rate for approved bets
+            is_win = random.random() < 0.8
+            bet_status = "OPEN" if i >= (TOTAL_BETS - OPEN_BETS_COUNT) else "CLOSED"
         
-        if bet_status == "CLOSED":
-            if is_win:
-                WIN_COUNT += 1
-                win_amount = random.uniform(100, 500)  # User's share of win
-                TOTAL_WIN_AMOUNT += win_amount
-                BET_OUTCOMES.append({
-                    "date": bet_date,
-                    "amount": win_amount,
-                    "type": "win"
-                })
+            if bet_status == "CLOSED":
+                if is_win:
+                    pnl = random.uniform(100, 500)  # User's share of win
+                else:
+                    pnl = -random.uniform(50, 200)  # User's share of loss
             else:
-                LOSE_COUNT += 1
-                loss_amount = random.uniform(50, 200)  # User's share of loss
-                TOTAL_WIN_AMOUNT -= loss_amount
-                BET_OUTCOMES.append({
-                    "date": bet_date,
-                    "amount": -loss_amount,
-                    "type": "loss"
-                })
-        else:
-            # Open bets - assume they'll win (for now)
-            pass
+                # Open bets - assume they'll win (for now)
+                pass
         
-        status = "APPROVED"
-        bet_result = "WIN" if (bet_status == "CLOSED" and is_win) else ("LOSS" if (bet_status == "CLOSED" and not is_win) else None)
-    else:
-        status = "REJECTED"
-        bet_status = "CLOSED"
-        bet_result = None
-    
-    bet_description = BET_DESCRIPTIONS[i % len(BET_DESCRIPTIONS)]
-    vote = "YES" if random.random() < 0.7 else "NO"
-    
-    ALL_BETS.append({
-        "id": bet_id,
-        "betDescription": bet_description,
-        "status": status,
-        "betStatus": bet_status,
-        "betResult": bet_result,
-        "timestamp": bet_date.isoformat() + "Z",
-        "vote": vote,
-        "positionSize": f"${random.randint(100, 1000):,}",
-        "riskScore": round(random.uniform(4.0, 9.0), 1),
-        "confidence": random.randint(60, 90),
-    })
+            status = "APPROVED"
+            bet_result = "WIN" if (bet_status == "CLOSED" and is_win) else ("LOSS" if (bet_status == "CLOSED" and not is_win) else None)
+        else:
+            status = "REJECTED"
+            bet_status = "CLOSED"
+            bet_result = None
+    
+        vote = "YES" if random.random() < 0.7 else "NO"
+    
+        bet_ids.append(f"prop-{i+1:03d}")
+        bet_columns["description"].append(i % len(BET_DESCRIPTIONS))
+        bet_columns["status"].append(STATUSES.index(status))
+        bet_columns["bet_status"].append(BET_STATUSES.index(bet_status))
+        bet_columns["result"].append(RESULTS.index(bet_result))
+        bet_columns["vote"].append(VOTES.index(vote))
+        bet_columns["position_size"].append(random.randint(100, 1000))
+        bet_columns["risk_score"].append(round(random.uniform(4.0, 9.0), 1))
+        bet_columns["confidence"].append(random.randint(60, 90))
+        bet_columns["timestamp"].append(bet_date)
+        bet_columns["pnl"].append(pnl)
+    
+    # Column-oriented bet store with id, status and betStatus indexes
+    return BetStore(bet_ids, BET_DESCRIPTIONS, bet_columns)
+
+
+def write_bet_snapshot(path: str = SNAPSHOT_PATH) -> BetStore:
+    """
+    Generate the bets and write them, with the ``random`` state that follows
+    generation, as a snapshot for ``load_bet_store``.
+    """
+    now = datetime.now()
+    store = generate_bet_store(now)
+    meta = {
+        "generated_at": now.isoformat(),
+        "descriptions": store.descriptions,
+        "random_state": random.getstate(),
+    }
+    write_snapshot(Path(path), store.to_arrays(), meta, DATASET_VERSION)
+    return store
+
+
+def load_bet_store() -> BetStore:
+    """
+    Bets from the snapshot at SNAPSHOT_PATH, generated in-process if there is
+    no up-to-date snapshot. Columns are read-only views into the mapped file;
+    only the timestamps are copied, shifted so the bets end today as if
+    they had just been generated.
+    """
+    snapshot = load_snapshot(Path(SNAPSHOT_PATH), DATASET_VERSION) if SNAPSHOT_PATH else None
+    if snapshot is None:
+        return generate_bet_store(datetime.now())
+    
+    arrays = dict(snapshot.arrays)
+    generated_at = np.datetime64(snapshot.meta["generated_at"], "us")
+    arrays["timestamp"] = arrays["timestamp"] + (np.datetime64(datetime.now(), "us") - generated_at)
+    # Continue from where generation left the global random state
+    version, state, gauss = snapshot.meta["random_state"]
+    random.setstate((version, tuple(state), gauss))
+    return BetStore.from_arrays(arrays, snapshot.meta["descriptions"])
+
+
+BET_STORE = load_bet_store()
+
+# Bet outcome stats over settled (approved, closed) bets - vectorized over the columns
+_settled = BET_STORE.positions(status="APPROVED", bet_status="CLOSED")
+WIN_COUNT = int(np.count_nonzero(BET_STORE.result[_settled] == RESULT_WIN))
+LOSE_COUNT = int(np.count_nonzero(BET_STORE.result[_settled] == RESULT_LOSS))
+TOTAL_WIN_AMOUNT = float(BET_STORE.pnl[_settled].sum())
 
 # Calculate user stats
 USER_WIN_COUNT = WIN_COUNT
@@ -123,89 +178,128 @@ USER_WIN_AMOUNT = TOTAL_WIN_AMOUNT
 FINAL_PORTFOLIO_AMOUNT = USER_DEPOSITED_USD + USER_WIN_AMOUNT
 
 # Get open bets (last 10 approved bets that are still open)
-OPEN_BETS = [bet for bet in ALL_BETS if bet["betStatus"] == "OPEN" and bet["status"] == "APPROVED"][-OPEN_BETS_COUNT:]
+OPEN_BETS = BET_STORE.query(status="APPROVED", bet_status="OPEN")[-OPEN_BETS_COUNT:]
 
 # Get closed bets (for positions that have closed)
-CLOSED_BETS = [bet for bet in ALL_BETS if bet["betStatus"] == "CLOSED" and bet["status"] == "APPROVED"][-10:]
+CLOSED_BETS = BET_STORE.query(status="APPROVED", bet_status="CLOSED")[-10:]
+
+# Portfolio history draws come from their own generator so they never touch
+# the global ``random`` state, and are cached per ``days`` for the current day
+PORTFOLIO_HISTORY_SEED = 42
+PORTFOLIO_HISTORY_CACHE_SIZE = 256
+_portfolio_history_day = None
+_portfolio_history_cache = {}
+
+
+def _bounded_growth_path(factors: np.ndarray, trend: float, start: float, low: float, high: float) -> np.ndarray:
+    """
+    a[t] = clip(a[t-1] * factors[t] + trend, low, high) with a[-1] = start.
+    Between clamps the recurrence has a closed form, so each stretch is solved
+    at once up to the first day it leaves the bounds, then restarted from the
+    bound it hit once the path comes off it.
+    """
+    amounts = np.empty(len(factors))
+    t, amount = 0, start
+    while t < len(factors):
+        # a[t] = a[t-1] * f[t] + trend  =>  a[t] = G[t] * (a0 + trend * sum(1 / G[:t+1]))
+        growth = np.cumprod(factors[t:])
+        segment = growth * (amount + trend * np.cumsum(1.0 / growth))
+        outside = np.flatnonzero((segment < low) | (segment > high))
+        if not len(outside):
+            amounts[t:] = segment
+            break
+        end = t + outside[0]
+        amounts[t:end] = segment[:outside[0]]
+        amount = amounts[end] = min(max(segment[outside[0]], low), high)
+        # Days that would leave the bound again from the bound stay on it
+        pushed = factors[end + 1:] * amount + trend
+        stays = pushed < low if amount == low else pushed > high
+        run = len(stays) if stays.all() else int(np.argmin(stays))
+        amounts[end + 1:end + 1 + run] = amount
+        t = end + 1 + run
+    return amounts
+
 
-def generate_portfolio_amount_history(days: int):
+def _portfolio_amount_path(days: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Daily portfolio amounts: alternating up/down market cycles plus volatility,
+    pulled toward FINAL_PORTFOLIO_AMOUNT over the last 10% of days.
+    """
+    start_amount = USER_DEPOSITED_USD
+    end_amount = FINAL_PORTFOLIO_AMOUNT
+    total_growth = end_amount - start_amount
+    trend_component = total_growth / days * 0.3  # Small base trend
+    
+    # Market cycles: first trend lasts 15-45 days, later ones 10-40, alternating up/down
+    lengths = np.concatenate(([rng.integers(15, 46)], rng.integers(10, 41, size=days // 10 + 1)))
+    directions = np.where(np.arange(len(lengths)) % 2 == 0, 1.0, -1.0)
+    trend_direction = np.repeat(directions, lengths)[:days]
+    
+    # Daily growth factor from the cycle and volatility components
+    cycle = trend_direction * rng.uniform(0.005, 0.02, size=days)
+    volatility = rng.uniform(-0.015, 0.015, size=days)
+    
+    # Kept within bounds every day, so a clamped path continues from the bound
+    amounts = _bounded_growth_path(
+        1.0 + cycle + volatility, trend_component, start_amount, start_amount * 0.5, end_amount * 1.5
+    )
+    
+    # Smoothly adjust to end amount (last 10% of data points)
+    if days > 10:
+        adjustment_start = int(days * 0.9)
+        tail = np.arange(adjustment_start, days)
+        target = start_amount + total_growth * (tail / days)
+        amounts[tail] += (target - amounts[tail]) * 0.3
+    
+    amounts[-1] = end_amount
+    return amounts
+
+
+def generate_portfolio_amount_history(
+    days: int,
+    points: int = DEFAULT_POINTS,
+    resolution: str = "raw",
+    method: str = "lttb",
+):
     """
     Generate portfolio amount history with realistic market trends.
     1. Starts at USER_DEPOSITED_USD
     2. Ends at FINAL_PORTFOLIO_AMOUNT
     3. Follows basic market trend: up, down, up with realistic volatility
+    The daily series is downsampled to ``points`` (see services.resample).
+    Results are memoized per arguments until the date changes; callers must
+    not mutate the returned list.
     """
-    data = []
-    current_amount = USER_DEPOSITED_USD
-    start_amount = USER_DEPOSITED_USD
-    end_amount = FINAL_PORTFOLIO_AMOUNT
+    global _portfolio_history_day
+    today = datetime.now().date()
+    if today != _portfolio_history_day:
+        _portfolio_history_cache.clear()
+        _portfolio_history_day = today
     
-    # Calculate overall trend (needed to reach end amount)
-    total_growth = end_amount - start_amount
-    avg_daily_trend = total_growth / days if days > 0 else 0
+    key = (days, points, resolution, method)
+    data = _portfolio_history_cache.get(key)
+    if data is not None:
+        return data
     
-    # Generate data points with market-like movements
-    start_date = datetime.now() - timedelta(days=days)
-    trend_direction = 1  # 1 for up, -1 for down
-    trend_duration = 0
-    trend_length = random.randint(15, 45)  # How long current trend lasts
+    if days <= 0:
+        return []
     
-    for i in range(days):
-        date = start_date + timedelta(days=i)
-        
-        # Change trend direction periodically (market cycles)
-        if trend_duration >= trend_length:
-            trend_direction *= -1  # Flip direction
-            trend_length = random.randint(10, 40)  # New trend duration
-            trend_duration = 0
-        
-        trend_duration += 1
-        
-        # Market movement: combination of trend and volatility
-        # Base trend (slight upward bias to reach target)
-        trend_component = avg_daily_trend * 0.3  # Small base trend
-        
-        # Market cycle (up/down movements)
-        cycle_component = trend_direction * random.uniform(0.005, 0.02) * current_amount
-        
-        # Daily volatility (random market fluctuations)
-        volatility = random.uniform(-0.015, 0.015) * current_amount
-        
-        # Combine all components
-        daily_change = trend_component + cycle_component + volatility
-        current_amount += daily_change
-        
-        # Ensure amount doesn't go negative and stays reasonable
-        current_amount = max(current_amount, start_amount * 0.5)
-        current_amount = min(current_amount, end_amount * 1.5)
-        
-        data.append({
-            "date": date.strftime("%b %d, %Y") if days > 30 else date.strftime("%b %d"),
-            "amount": round(current_amount, 2)
-        })
+    rng = np.random.default_rng([PORTFOLIO_HISTORY_SEED, days])
+    amounts = _portfolio_amount_path(days, rng)
     
-    # Smoothly adjust to end amount (last 10% of data points)
-    if len(data) > 10:
-        adjustment_start = int(len(data) * 0.9)
-        for i in range(adjustment_start, len(data)):
-            progress = (i - adjustment_start) / (len(data) - adjustment_start)
-            target_amount = start_amount + (total_growth * (i / len(data)))
-            current_amount = data[i]["amount"]
-            # Gradually move toward target
-            data[i]["amount"] = round(current_amount + (target_amount - current_amount) * 0.3, 2)
-    
-    # Ensure last value matches final amount exactly
-    if len(data) > 0:
-        data[-1]["amount"] = round(FINAL_PORTFOLIO_AMOUNT, 2)
-    
-    # Limit to ~200 points for performance
-    if len(data) > 200:
-        step = len(data) // 200
-        data = data[::step]
-        # Ensure last point is always included
-        if data[-1]["amount"] != round(FINAL_PORTFOLIO_AMOUNT, 2):
-            data[-1]["amount"] = round(FINAL_PORTFOLIO_AMOUNT, 2)
+    start_date = datetime.now() - timedelta(days=days)
+    dates = np.datetime64(start_date.date()) + np.arange(days)
+    positions = downsample(dates, amounts, points, resolution, method)
     
+    # Only the kept points are formatted
+    date_format = "%b %d, %Y" if days > 30 else "%b %d"
+    data = [
+        {"date": date.strftime(date_format), "amount": amount}
+        for date, amount in zip(dates[positions].tolist(), np.round(amounts[positions], 2).tolist())
+    ]
+    if len(_portfolio_history_cache) >= PORTFOLIO_HISTORY_CACHE_SIZE:
+        _portfolio_history_cache.pop(next(iter(_portfolio_history_cache)))
+    _portfolio_history_cache[key] = data
     return data
 
 def generate_positions():
@@ -0,0 +1,110 @@
+"""
+Vault NAV and TVL history
+Daily snapshots kept in append-only time-series stores, backfilled up to today
+"""
+from datetime import date
+from typing import Dict, List
+
+import numpy as np
+from services.resample import downsample
+from services.timeseries import TimeSeriesStore, series_path
+
+HISTORY_DAYS = 1095  # Longest range any history endpoint serves
+GENERATOR_VERSION = 2  # Bump when generation changes so stored series are rebuilt, not continued
+
+# name -> (daily log-return range, seed) for generated snapshots. Small drift: the
+# history is generated backwards from today's value, so over HISTORY_DAYS these
+# grow TVL by about 70% and NAV by about 8% on average.
+SERIES = {
+    "tvl": ((-0.02, 0.021), 42),
+    "nav": ((-0.003, 0.00315), 43),
+}
+
+_stores: Dict[str, TimeSeriesStore] = {}
+_backfilled_on: Dict[str, date] = {}
+
+
+def _current_value(name: str) -> float:
+    # Today's snapshot is the figure /api/vault/stats reports
+    from data.consistent_data import TOTAL_VAULT_VALUE_USD, VAULT_SHARE_PRICE
+
+    return {"tvl": TOTAL_VAULT_VALUE_USD, "nav": VAULT_SHARE_PRICE}[name]
+
+
+def _open(name: str) -> TimeSeriesStore:
+    try:
+        return TimeSeriesStore(name, series_path(f"{name}.v{GENERATOR_VERSION}"))
+    except OSError as e:
+        # Read-only filesystem etc.: keep the history in memory for this process
+        print(f"Error opening {name} time series file: {e}, using in-memory store")
+        return TimeSeriesStore(name)
+
+
+def _backfill(name: str, store: TimeSeriesStore):
+    # Append one generated snapshot per missing day, ending at today's value
+    (low, high), seed = SERIES[name]
+    current = _current_value(name)
+    today = np.datetime64("today", "D")
+    last = store.last()
+    if last is None:
+        first_day = today - (HISTORY_DAYS - 1)
+    else:
+        first_day = last[0].astype("datetime64[D]") + 1
+    missing = int((today - first_day).astype(np.int64)) + 1
+    if missing <= 0:
+        return
+
+    rng = np.random.default_rng([seed, int(first_day.astype(np.int64))])
+    log_returns = rng.uniform(low, high, size=missing)
+    if last is None:
+        # Walk backwards from today: each day is today's value less the returns after it
+        log_values = np.log(current) - (np.cumsum(log_returns[::-1])[::-1] - log_returns)
+    else:
+        # Continue from the last stored value, spreading the gap to today's value over the new days
+        log_returns += (np.log(current / last[1]) - log_returns.sum()) / missing
+        log_values = np.log(last[1]) + np.cumsum(log_returns)
+    values = np.exp(log_values)
+    try:
+        store.extend(first_day + np.arange(missing), values)
+    except ValueError:
+        # Another worker appended these days first
+        pass
+
+
+def get_series(name: str) -> TimeSeriesStore:
+    """
+    Open (once per process) the named series, backfilled through today.
+    """
+    store = _stores.get(name)
+    if store is None:
+        store = _stores[name] = _open(name)
+    today = date.today()
+    if _backfilled_on.get(name) != today:
+        _backfill(name, store)
+        _backfilled_on[name] = today
+    return store
+
+
+def history_points(
+    name: str,
+    field: str,
+    days: int,
+    points: int,
+    resolution: str = "raw",
+    method: str = "lttb",
+    digits: int = 2,
+) -> List[dict]:
+    """
+    Chart points ({"date", field}) for the last ``days`` days of a series.
+    Day/week/month rollups come straight from the store; the slice is then
+    downsampled to ``points`` and only the kept points are formatted.
+    """
+    timestamps, values = get_series(name).history(days, resolution)
+    positions = downsample(timestamps, values, points, method=method)
+    date_format = "%b %d, %Y" if days > 30 else "%b %d"
+    return [
+        {"date": timestamp.strftime(date_format), field: value}
+        for timestamp, value in zip(
+            timestamps[positions].tolist(), np.round(values[positions], digits).tolist()
+        )
+    ]
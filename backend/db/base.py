@@ -0,0 +1,92 @@
+"""
+Repository base class for reading one table through a pooled Database
+Builds parameterized SELECTs for a whitelisted set of columns and decodes VARIANT (JSON) values
+"""
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from db.database import Database
+
+
+@lru_cache(maxsize=256)
+def select_sql(table: str, columns: Tuple[str, ...], where: Tuple[str, ...], order_by: str, limit: bool) -> str:
+    # One string per query shape, so the backend sees identical text and can reuse its prepared statement
+    sql = f"SELECT {', '.join(columns)} FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if order_by:
+        sql += f" ORDER BY {order_by}"
+    if limit:
+        sql += " LIMIT ?"
+    return sql
+
+
+def to_json_value(value: Any) -> Any:
+    """
+    A column value as the TypeScript worker returned it: timestamps as
+    ISO-8601 UTC strings with milliseconds, NUMBER as float.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(timespec="milliseconds") + "Z"
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+class Repository:
+    """
+    Read access to one table. ``columns`` lists what callers may select (in
+    table order); ``json_columns`` are VARIANT columns decoded from JSON text.
+    """
+
+    table = ""
+    columns: Tuple[str, ...] = ()
+    json_columns: FrozenSet[str] = frozenset()
+
+    def __init__(self, database: Database):
+        self.database = database
+
+    def select(self, columns: Optional[Sequence[str]] = None) -> Tuple[str, ...]:
+        """
+        The validated column list; None selects every column.
+        """
+        if columns is None:
+            return self.columns
+        unknown = [column for column in columns if column not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown {self.table} columns: {', '.join(unknown)}")
+        return tuple(columns)
+
+    async def fetch(
+        self,
+        operation: str,
+        columns: Optional[Sequence[str]] = None,
+        where: Sequence[str] = (),
+        params: Sequence[Any] = (),
+        order_by: str = "created_at DESC",
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rows matching the ``where`` conditions (joined with AND, ``?`` bound
+        from ``params``) as dicts of the selected columns.
+        """
+        sql = select_sql(self.table, self.select(columns), tuple(where), order_by, limit is not None)
+        if limit is not None:
+            params = (*params, int(limit))
+        rows = await self.database.fetch_all(f"{self.table}.{operation}", sql, params)
+        return [self._decode(row) for row in rows]
+
+    def _decode(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        for name, value in row.items():
+            if name in self.json_columns and isinstance(value, str):
+                row[name] = json.loads(value)
+            else:
+                row[name] = to_json_value(value)
+        return row
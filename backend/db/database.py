@@ -0,0 +1,280 @@
+"""
+Pooled database connections for the Snowflake schema (decisions, trade_signals, market_snapshots)
+Snowflake in production; a SQLite or DuckDB file with the same schema stands in for development and tests
+"""
+import abc
+import asyncio
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from services.metrics import track_upstream
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+try:
+    import snowflake.connector as snowflake_connector
+except ImportError:
+    snowflake_connector = None
+
+# snowflake://  |  sqlite:///path/to/file.db  |  duckdb:///path/to/file.duckdb
+# Unset keeps reads on the TypeScript dashboard worker
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "4"))
+
+# Local stand-in for snowflake_schema.sql. VARIANT columns hold JSON text and
+# created_at holds ISO-8601 UTC text, which sorts like the timestamp it encodes.
+LOCAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    id VARCHAR PRIMARY KEY,
+    created_at VARCHAR NOT NULL,
+    market_id VARCHAR NOT NULL,
+    market_question VARCHAR,
+    final_direction VARCHAR NOT NULL,
+    final_size DOUBLE NOT NULL,
+    agent_outputs VARCHAR NOT NULL,
+    consensus_reasoning VARCHAR,
+    raw_market_data VARCHAR
+);
+CREATE INDEX IF NOT EXISTS decisions_created_at ON decisions (created_at, id);
+CREATE INDEX IF NOT EXISTS decisions_direction ON decisions (final_direction, created_at, id);
+
+CREATE TABLE IF NOT EXISTS trade_signals (
+    id VARCHAR PRIMARY KEY,
+    created_at VARCHAR NOT NULL,
+    decision_id VARCHAR NOT NULL,
+    market_id VARCHAR NOT NULL,
+    signal VARCHAR NOT NULL,
+    size_usd DOUBLE NOT NULL,
+    solana_tx_hash VARCHAR,
+    status VARCHAR NOT NULL,
+    execution_reasoning VARCHAR
+);
+CREATE INDEX IF NOT EXISTS trade_signals_status ON trade_signals (status, created_at);
+
+CREATE TABLE IF NOT EXISTS market_snapshots (
+    id VARCHAR PRIMARY KEY,
+    created_at VARCHAR NOT NULL,
+    market_id VARCHAR NOT NULL,
+    source VARCHAR NOT NULL,
+    snapshot VARCHAR NOT NULL
+);
+CREATE INDEX IF NOT EXISTS market_snapshots_market ON market_snapshots (market_id, created_at);
+"""
+
+
+class DatabaseError(Exception):
+    """Raised when a database backend is misconfigured or unavailable."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of at most ``size`` DB-API connections, opened on first
+    use and reused after that. A connection that raised is closed rather than
+    handed to the next caller.
+    """
+
+    def __init__(self, connect: Callable[[], Any], size: int = DATABASE_POOL_SIZE):
+        self._connect = connect
+        self.size = size
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.opened = 0
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+                self.opened += 1
+            try:
+                yield conn
+            except BaseException:
+                _close_quietly(conn)
+                raise
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                _close_quietly(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+def _close_quietly(conn: Any):
+    try:
+        conn.close()
+    except Exception as e:
+        print(f"Error closing database connection: {e}")
+
+
+class Database(abc.ABC):
+    """
+    A pooled connection to one backend. Queries use ``?`` placeholders with
+    bound parameters and run on worker threads so they never block the event
+    loop; rows come back as dicts keyed by lower-case column name.
+    """
+
+    name = "database"
+    # Placeholder for a bound ISO-8601 timestamp compared against created_at
+    timestamp_param = "?"
+
+    def __init__(self, pool_size: int = DATABASE_POOL_SIZE):
+        self.pool = ConnectionPool(self.connect, pool_size)
+
+    @abc.abstractmethod
+    def connect(self) -> Any:
+        """Open one new connection for the pool."""
+
+    async def fetch_all(self, operation: str, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """
+        Run one parameterized query, counted under ``operation`` in the upstream metrics.
+        """
+        async with track_upstream(self.name, operation):
+            return await asyncio.to_thread(self._fetch_all, sql, tuple(params))
+
+    def _fetch_all(self, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                names = [column[0].lower() for column in cursor.description]
+                return [dict(zip(names, row)) for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+
+    def create_schema(self):
+        """
+        Create the tables and indexes of the local stand-in schema.
+        """
+        with self.pool.connection() as conn:
+            for statement in LOCAL_SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.commit()
+
+    def close(self):
+        self.pool.close()
+
+
+class SQLiteDatabase(Database):
+    name = "sqlite"
+
+    def __init__(self, path: str, pool_size: int = DATABASE_POOL_SIZE):
+        self.path = path
+        super().__init__(pool_size)
+
+    def connect(self) -> Any:
+        # Connections move between worker threads but the pool gives each to one thread at a time.
+        # Query text is built once per shape, so sqlite's statement cache keeps them prepared.
+        return sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+
+
+class DuckDBDatabase(Database):
+    name = "duckdb"
+
+    def __init__(self, path: str, pool_size: int = DATABASE_POOL_SIZE):
+        if duckdb is None:
+            raise DatabaseError("DATABASE_URL is duckdb:// but the duckdb package is not installed")
+        self.path = path
+        self._root = None
+        self._root_lock = threading.Lock()
+        super().__init__(pool_size)
+
+    def connect(self) -> Any:
+        # One database instance per file; pooled connections are cursors on it
+        with self._root_lock:
+            if self._root is None:
+                self._root = duckdb.connect(self.path)
+            return self._root.cursor()
+
+    def close(self):
+        super().close()
+        if self._root is not None:
+            self._root.close()
+            self._root = None
+
+
+class SnowflakeDatabase(Database):
+    name = "snowflake"
+    timestamp_param = "TO_TIMESTAMP_NTZ(?)"
+
+    def __init__(self, pool_size: int = DATABASE_POOL_SIZE):
+        if snowflake_connector is None:
+            raise DatabaseError(
+                "DATABASE_URL is snowflake:// but snowflake-connector-python is not installed"
+            )
+        account = os.getenv("SNOWFLAKE_ACCOUNT")
+        user = os.getenv("SNOWFLAKE_USERNAME")
+        password = os.getenv("SNOWFLAKE_PASSWORD")
+        if not account or not user or not password:
+            raise DatabaseError(
+                "Snowflake credentials not found in environment variables. "
+                "Required: SNOWFLAKE_ACCOUNT, SNOWFLAKE_USERNAME, SNOWFLAKE_PASSWORD"
+            )
+        # Same account / region handling as src/database/snowflake.ts
+        region = os.getenv("SNOWFLAKE_REGION")
+        if "." in account and region:
+            account = account.split(".")[0]
+        self.options = {
+            "account": account,
+            "user": user,
+            "password": password,
+            "warehouse": os.getenv("SNOWFLAKE_WAREHOUSE", "COMPUTE_WH"),
+            "database": os.getenv("SNOWFLAKE_DATABASE", "QUACK_DB"),
+            "schema": os.getenv("SNOWFLAKE_SCHEMA", "PUBLIC"),
+            # qmark binds are sent to the server with the statement instead of interpolated client-side
+            "paramstyle": "qmark",
+        }
+        if region:
+            self.options["region"] = region
+        super().__init__(pool_size)
+
+    def connect(self) -> Any:
+        return snowflake_connector.connect(**self.options)
+
+    def create_schema(self):
+        raise DatabaseError("Create the Snowflake tables with snowflake_schema.sql")
+
+
+def create_database(url: str, pool_size: int = DATABASE_POOL_SIZE) -> Optional[Database]:
+    """
+    The backend named by a DATABASE_URL, or None if ``url`` is empty.
+    """
+    if not url:
+        return None
+    scheme, _, rest = url.partition("://")
+    path = rest[1:] if rest.startswith("/") else rest
+    if scheme == "sqlite":
+        if not path:
+            # Every pooled connection would get its own empty in-memory database
+            raise DatabaseError("sqlite DATABASE_URL needs a file path, e.g. sqlite:///data/local.db")
+        return SQLiteDatabase(path, pool_size)
+    if scheme == "duckdb":
+        return DuckDBDatabase(path or ":memory:", pool_size)
+    if scheme == "snowflake":
+        return SnowflakeDatabase(pool_size)
+    raise DatabaseError(f"Unsupported DATABASE_URL scheme: {scheme}")
+
+
+def _create_default() -> Optional[Database]:
+    try:
+        return create_database(DATABASE_URL)
+    except DatabaseError as e:
+        print(f"Database not configured, using the dashboard worker: {e}")
+        return None
+
+
+database = _create_default()
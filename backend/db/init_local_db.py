@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Create a local SQLite / DuckDB stand-in for the Snowflake schema, optionally seeded with synthetic decisions
+Run from backend/: python db/init_local_db.py sqlite:///data/local.db [--seed 500]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db.database import create_database
+from db.repositories import DECISION_COLUMNS
+
+# OR REPLACE so re-seeding an existing file is idempotent (SQLite and DuckDB both accept it)
+DECISION_INSERT = (
+    f"INSERT OR REPLACE INTO decisions ({', '.join(DECISION_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in DECISION_COLUMNS)})"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("url", help="sqlite:///path or duckdb:///path (use as DATABASE_URL)")
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many synthetic decisions")
+    args = parser.parse_args()
+
+    db = create_database(args.url, pool_size=1)
+    db.create_schema()
+    if args.seed:
+        # Same rows the benchmarks' fake dashboard serves
+        from benchmarks.fixtures import fake_decisions
+
+        rows = [
+            (
+                d["id"], d["created_at"], d["market_id"], d["market_question"], d["final_direction"],
+                d["final_size"], d["agent_outputs"], d["consensus_reasoning"],
+                json.dumps({"market_id": d["market_id"], "question": d["market_question"]}),
+            )
+            for d in fake_decisions(args.seed)
+        ]
+        with db.pool.connection() as conn:
+            conn.executemany(DECISION_INSERT, rows)
+            conn.commit()
+    db.close()
+    print(f"Initialized {args.url}" + (f" with {args.seed} decisions" if args.seed else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Repositories for the decisions, trade_signals and market_snapshots tables
+Native replacements for the queries in src/services/snowflake/dashboard.ts
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+from db.base import Repository
+from db.database import Database, database
+
+DECISION_COLUMNS = (
+    "id",
+    "created_at",
+    "market_id",
+    "market_question",
+    "final_direction",
+    "final_size",
+    "agent_outputs",
+    "consensus_reasoning",
+    "raw_market_data",
+)
+
+
+class DecisionRepository(Repository):
+    table = "decisions"
+    columns = DECISION_COLUMNS
+    json_columns = frozenset({"agent_outputs", "raw_market_data"})
+
+    async def latest(self, limit: int = 20, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        return await self.fetch("latest", columns, limit=limit)
+
+    async def page(
+        self,
+        limit: int = 20,
+        direction: Optional[str] = None,
+        cursor_created_at: Optional[str] = None,
+        cursor_id: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        One page newest first, strictly after the (created_at, id) keyset cursor.
+        """
+        where, params = [], []
+        if direction:
+            where.append("final_direction = ?")
+            params.append(direction)
+        if cursor_created_at and cursor_id:
+            ts = self.database.timestamp_param
+            where.append(f"(created_at < {ts} OR (created_at = {ts} AND id < ?))")
+            params.extend([cursor_created_at, cursor_created_at, cursor_id])
+        return await self.fetch(
+            "page", columns, where, params, order_by="created_at DESC, id DESC", limit=limit
+        )
+
+    async def get(self, decision_id: str, columns: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        rows = await self.fetch("get", columns, ["id = ?"], [decision_id], order_by="", limit=1)
+        return rows[0] if rows else None
+
+
+class TradeSignalRepository(Repository):
+    table = "trade_signals"
+    columns = (
+        "id",
+        "created_at",
+        "decision_id",
+        "market_id",
+        "signal",
+        "size_usd",
+        "solana_tx_hash",
+        "status",
+        "execution_reasoning",
+    )
+
+    async def by_status(self, status: str, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        return await self.fetch("by_status", columns, ["status = ?"], [status])
+
+
+class MarketSnapshotRepository(Repository):
+    table = "market_snapshots"
+    columns = ("id", "created_at", "market_id", "source", "snapshot")
+    json_columns = frozenset({"snapshot"})
+
+    async def history(self, market_id: str, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        return await self.fetch("history", columns, ["market_id = ?"], [market_id])
+
+
+class DashboardReads:
+    """
+    The dashboard worker's read methods (dashboard.ts names and positional
+    arguments) served directly from a Database.
+    """
+
+    def __init__(self, db: Database):
+        self.database = db
+        self.decisions = DecisionRepository(db)
+        self.trade_signals = TradeSignalRepository(db)
+        self.market_snapshots = MarketSnapshotRepository(db)
+        self._methods = {
+            "getLatestDecisions": self.decisions.latest,
+            "getDecisionsPage": self.decisions.page,
+            "getDecisionById": self.decisions.get,
+            "getTradesByStatus": self.trade_signals.by_status,
+            "getMarketHistory": self.market_snapshots.history,
+        }
+
+    def serves(self, method: str) -> bool:
+        return method in self._methods
+
+    async def call(self, method: str, *params: Any) -> Any:
+        return await self._methods[method](*params)
+
+
+# None when DATABASE_URL is unset; reads then go through the dashboard worker
+dashboard_reads = DashboardReads(database) if database is not None else None
@@ -1,8 +1,6 @@
 """
 Router modules for organizing API endpoints
 """
-# Import all routers to make them available
-from . import vault, users, positions, governance, agents, reports, agentDecision
-
-__all__ = ["vault", "users", "positions", "governance", "agents", "reports", "agentDecision"]
+# Routers are imported by app.main (eagerly, or on first use with LAZY_ROUTERS)
+__all__ = ["vault", "users", "positions", "governance", "agents", "reports", "agentDecision", "decisions", "admin"]
 
@@ -0,0 +1,49 @@
+"""
+Admin endpoints
+Serves request profiles captured by the sampling profiler
+"""
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Path, Query
+from fastapi.responses import PlainTextResponse
+from services.profiler import request_profiler, verify_token
+
+router = APIRouter()
+
+
+def require_admin(token: Optional[str]):
+    # Same signed token that opts a request into profiling (services.profiler.sign_token)
+    if not request_profiler.secret:
+        raise HTTPException(status_code=404, detail="Profiler admin is disabled (set PROFILER_SECRET)")
+    if not verify_token(token, request_profiler.secret):
+        raise HTTPException(status_code=403, detail="Invalid or expired X-Profile token")
+
+
+@router.get("/profiles")
+async def list_profiles(x_profile: Optional[str] = Header(None)):
+    """
+    Summaries of the buffered request profiles, newest first.
+    """
+    require_admin(x_profile)
+    return {
+        "sampleRate": request_profiler.sample_rate,
+        "intervalMs": request_profiler.interval_ms,
+        "profiles": [p.summary() for p in reversed(request_profiler.profiles)],
+    }
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str = Path(..., description="Profile ID (X-Profile-Id response header)"),
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+    x_profile: Optional[str] = Header(None),
+):
+    """
+    One profile as speedscope JSON or collapsed stacks (flamegraph.pl input).
+    """
+    require_admin(x_profile)
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    return profile.speedscope()
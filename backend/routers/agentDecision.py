@@ -2,22 +2,18 @@
 Agent decision endpoint
 Calls the TypeScript decision engine
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any, List, Literal, Optional
-import subprocess
-import json
 import os
-import sys
-from pathlib import Path
+import time
+from fastapi import APIRouter, HTTPException, Path, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Literal, Optional
+from services.decision_batch import BATCH_MAX_MARKETS, BATCH_TIMEOUT, run_batch
+from services.decision_engine import call_typescript_service, DecisionEngineBusy, MAX_CONCURRENT_DECISIONS
+from services.jobs import JobQueue, JobQueueFull, format_sse, stream_job_events
 
 router = APIRouter()
 
-# Path to the TypeScript decision service
-BACKEND_DIR = Path(__file__).parent.parent
-TS_SERVICE = BACKEND_DIR / "agent_engine" / "services" / "decisionService.ts"
-TS_SERVICE_JS = BACKEND_DIR / "dist" / "agent_engine" / "services" / "decisionService.js"
-
 
 class MarketData(BaseModel):
     symbol: Optional[str] = None
@@ -72,6 +68,14 @@ class AgentAnalysis(BaseModel):
     reasoning: str
 
 
+class DecisionCacheInfo(BaseModel):
+    hit: bool
+    key: Optional[str] = None  # Hash of the normalized request; None if it can't be cached
+    cached_at: Optional[str] = None
+    age_seconds: Optional[float] = None
+    ttl_seconds: float
+
+
 class DecisionResponse(BaseModel):
     status: Literal["ok", "error"]
     decision_id: Optional[str] = None
@@ -83,79 +87,100 @@ class DecisionResponse(BaseModel):
     decision: Optional[ConsensusDecision] = None
     agents: Optional[List[AgentOutput]] = None
     error: Optional[str] = None
+    cache: Optional[DecisionCacheInfo] = None  # Decision cache provenance
+
+
+class BatchDecisionRequest(BaseModel):
+    markets: List[MarketData] = Field(..., min_length=1, max_length=BATCH_MAX_MARKETS)
+    data: Optional[AgentData] = None  # Shared by every market in the batch
+
+
+class BatchDecisionItem(BaseModel):
+    index: int  # Position in the request's markets list
+    market: Dict[str, Any]  # The market as evaluated (after enrichment)
+    status: Literal["ok", "error", "timeout"]
+    result: Optional[DecisionResponse] = None
+    error: Optional[str] = None
+    elapsed_ms: Optional[float] = None
+
+
+class BatchDecisionResponse(BaseModel):
+    results: List[BatchDecisionItem]
+    completed: int
+    failed: int
+    timed_out: int
+    elapsed_ms: float
+
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+    priority: int
+    status_url: str
+    events_url: str
 
 
-def call_typescript_service(request_data: Dict[str, Any]) -> Dict[str, Any]:
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    priority: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    progress: List[str] = []
+    result: Optional[DecisionResponse] = None
+    error: Optional[str] = None
+
+
+def build_request_data(request: DecisionRequest) -> Dict[str, Any]:
     """
-    Call the TypeScript decision service
-    Tries compiled JS first, then falls back to ts-node
+    Convert a DecisionRequest into the payload expected by decisionService.ts.
     """
-    request_json = json.dumps(request_data)
-    
-    # Try compiled JavaScript first
-    if TS_SERVICE_JS.exists():
-        try:
-            result = subprocess.run(
-                ["node", str(TS_SERVICE_JS)],
-                input=request_json,
-                capture_output=True,
-                text=True,
-                timeout=60,
-                cwd=str(BACKEND_DIR)
-            )
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-        except Exception as e:
-            print(f"Error running compiled JS: {e}")
+    request_data = {}
     
-    # Fall back to ts-node
-    try:
-        result = subprocess.run(
-            ["npx", "ts-node", "--project", "tsconfig.json", str(TS_SERVICE)],
-            input=request_json,
-            capture_output=True,
-            text=True,
-            timeout=120,  # Increased timeout for full pipeline
-            cwd=str(BACKEND_DIR)
-        )
-        if result.returncode == 0:
-            # Log stderr for debugging (contains console.log output)
-            if result.stderr:
-                print(f"[TypeScript] Logs: {result.stderr[:500]}")  # First 500 chars of logs
-            
-            # Parse JSON from stdout (should be clean JSON now)
-            stdout_lines = result.stdout.strip().split('\n')
-            # Find the last line that looks like JSON (in case there are any stray logs)
-            json_line = None
-            for line in reversed(stdout_lines):
-                line = line.strip()
-                if line and (line.startswith('{') or line.startswith('[')):
-                    json_line = line
-                    break
-            
-            if json_line:
-                return json.loads(json_line)
-            else:
-                # Fallback: try parsing entire stdout
-                return json.loads(result.stdout.strip())
+    if request.market:
+        market_dict = request.market.dict(exclude_none=True)
+        # If market is empty or missing required fields, pass empty dict for auto-selection
+        if not market_dict or (not market_dict.get("symbol") and not market_dict.get("question")):
+            request_data["market"] = {}
         else:
-            error_msg = result.stderr or result.stdout or "Unknown error"
-            raise Exception(f"ts-node error: {error_msg}")
-    except FileNotFoundError:
-        raise Exception(
-            "TypeScript service not available. Please install dependencies:\n"
-            "  cd backend && npm install\n"
-            "Then either compile: npm run build\n"
-            "Or ensure ts-node is available: npm install -g ts-node"
-        )
-    except json.JSONDecodeError as e:
-        raise Exception(f"Invalid response from TypeScript service: {e}")
-    except subprocess.TimeoutExpired:
-        raise Exception("TypeScript service timed out after 60 seconds")
+            request_data["market"] = market_dict
+    else:
+        request_data["market"] = {}
+    
+    if request.data:
+        request_data["data"] = request.data.dict(exclude_none=True)
+    else:
+        request_data["data"] = {}
+    
+    return request_data
+
+
+def to_decision_response(result: Dict[str, Any]) -> DecisionResponse:
+    """
+    Map the engine's enhanced response to DecisionResponse.
+    """
+    return DecisionResponse(
+        status=result.get("status", "ok"),
+        decision_id=result.get("decision_id"),
+        investment_decision=result.get("investment_decision"),
+        agent_analysis=result.get("agent_analysis"),
+        conversation_logs=result.get("conversation_logs"),
+        market_info=result.get("market_info"),
+        # Legacy fields for backward compatibility
+        decision=result.get("decision"),
+        agents=result.get("agents"),
+        error=result.get("error"),
+        cache=result.get("cache"),
+    )
 
 
 @router.post("/decision", response_model=DecisionResponse)
-async def get_agent_decision(request: DecisionRequest):
+async def get_agent_decision(
+    request: DecisionRequest,
+    response: Response,
+    refresh: bool = Query(False, description="Skip the decision cache and run the engine"),
+):
     """
     Run the 5-agent Gemini decision engine and return enhanced consensus.
     This endpoint calls the TypeScript decision engine and returns:
@@ -163,48 +188,153 @@ async def get_agent_decision(request: DecisionRequest):
     - Agent analysis with 4-sentence reasoning from each agent
     - Full conversation logs (initial, debate, final)
     - Market information
+    Repeat requests for the same market, price bucket and data are served
+    from the decision cache; "cache" in the response says which.
     """
     try:
-        # Convert request to dict, handling None/empty cases
-        request_data = {}
-        
-        if request.market:
-            market_dict = request.market.dict(exclude_none=True)
-            # If market is empty or missing required fields, pass empty dict for auto-selection
-            if not market_dict or (not market_dict.get("symbol") and not market_dict.get("question")):
-                request_data["market"] = {}
-            else:
-                request_data["market"] = market_dict
-        else:
-            request_data["market"] = {}
+        request_data = build_request_data(request)
         
-        if request.data:
-            request_data["data"] = request.data.dict(exclude_none=True)
-        else:
-            request_data["data"] = {}
-        
-        # Call TypeScript service
-        result = call_typescript_service(request_data)
-        
-        # Map enhanced response to DecisionResponse
-        response = DecisionResponse(
-            status=result.get("status", "ok"),
-            decision_id=result.get("decision_id"),
-            investment_decision=result.get("investment_decision"),
-            agent_analysis=result.get("agent_analysis"),
-            conversation_logs=result.get("conversation_logs"),
-            market_info=result.get("market_info"),
-            # Legacy fields for backward compatibility
-            decision=result.get("decision"),
-            agents=result.get("agents"),
-            error=result.get("error")
-        )
+        # Call TypeScript service (runs off the event loop, queued behind a concurrency limit)
+        result = await call_typescript_service(request_data, refresh=refresh)
         
-        return response
+        cache = result.get("cache") if isinstance(result, dict) else None
+        if cache:
+            response.headers["X-Decision-Cache"] = "hit" if cache["hit"] else "miss"
+        return to_decision_response(result)
         
+    except DecisionEngineBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error processing decision: {str(e)}"
         )
 
+
+def to_batch_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    result = item.get("result")
+    return {**item, "result": to_decision_response(result).dict() if isinstance(result, dict) else None}
+
+
+def batch_summary(items: List[Dict[str, Any]], started: float) -> Dict[str, Any]:
+    return {
+        "completed": sum(1 for item in items if item["status"] == "ok"),
+        "failed": sum(1 for item in items if item["status"] == "error"),
+        "timed_out": sum(1 for item in items if item["status"] == "timeout"),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+@router.post("/decision/batch", response_model=BatchDecisionResponse)
+async def run_decision_batch(
+    request: BatchDecisionRequest,
+    stream: bool = Query(True, description="Stream results as Server-Sent Events as each market finishes"),
+    timeout: float = Query(BATCH_TIMEOUT, gt=0, le=BATCH_TIMEOUT, description="Seconds before unfinished markets are reported as timed out"),
+):
+    """
+    Run the decision engine on many markets in one warm worker.
+    Market data is enriched once for the whole batch and markets run with
+    bounded concurrency. Streamed responses send a "result" event per market
+    in completion order and a final "done" summary; otherwise the results are
+    returned together, in request order. Either way, markets unfinished at the
+    timeout come back with status "timeout" alongside the finished ones.
+    """
+    markets = [market.dict(exclude_none=True) for market in request.markets]
+    unidentified = [i for i, market in enumerate(markets) if not market.get("symbol") and not market.get("question")]
+    if unidentified:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Markets need a symbol or question (indexes {unidentified})",
+        )
+    data = request.data.dict(exclude_none=True) if request.data else {}
+    started = time.perf_counter()
+
+    if not stream:
+        items = [to_batch_item(item) async for item in run_batch(markets, data, timeout=timeout)]
+        items.sort(key=lambda item: item["index"])
+        return {"results": items, **batch_summary(items, started)}
+
+    async def events():
+        items = []
+        async for item in run_batch(markets, data, timeout=timeout, heartbeat=15.0):
+            if item is None:
+                yield ": keepalive\n\n"
+                continue
+            item = to_batch_item(item)
+            items.append(item)
+            yield format_sse({"event": "result", "data": item})
+        yield format_sse({"event": "done", "data": batch_summary(items, started)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def run_decision_job(request_data: Dict[str, Any], report_progress) -> Dict[str, Any]:
+    """
+    Job handler: run one decision and store the mapped response as the job result.
+    """
+    result = await call_typescript_service(request_data, on_progress=report_progress)
+    return to_decision_response(result).dict()
+
+
+decision_jobs = JobQueue(
+    run_decision_job,
+    workers=int(os.getenv("DECISION_JOB_WORKERS", str(MAX_CONCURRENT_DECISIONS))),
+    result_ttl=float(os.getenv("DECISION_JOB_TTL", "3600")),
+    max_jobs=int(os.getenv("DECISION_JOB_MAX", "1000")),
+)
+
+
+@router.post("/decision/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_decision_job(
+    request: DecisionRequest,
+    priority: int = Query(0, description="Lower values run first")
+):
+    """
+    Queue a decision run and return immediately with a job id.
+    Poll GET /decision/jobs/{job_id} or stream GET /decision/jobs/{job_id}/events.
+    """
+    try:
+        job = decision_jobs.submit(build_request_data(request), priority=priority)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "priority": job.priority,
+        "status_url": f"/api/agents/decision/jobs/{job.id}",
+        "events_url": f"/api/agents/decision/jobs/{job.id}/events",
+    }
+
+
+@router.get("/decision/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_decision_job(job_id: str = Path(..., description="Job ID")):
+    """
+    Get the status, progress and (once finished) result of a decision job.
+    """
+    job = decision_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    
+    return job.to_dict()
+
+
+@router.get("/decision/jobs/{job_id}/events")
+async def stream_decision_job(job_id: str = Path(..., description="Job ID")):
+    """
+    Server-Sent Events stream of a job's status changes and progress messages.
+    Ends with a "result" event carrying the same body as the status endpoint.
+    """
+    job = decision_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    
+    return StreamingResponse(
+        stream_job_events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,63 +2,142 @@
 Agent-related endpoints
 Handles AI agent personas and debate transcripts
 """
-from fastapi import APIRouter, Path
+import asyncio
+from fastapi import APIRouter, Header, Path, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import Optional
 from schemas.agents import (
     AgentsResponse,
     DebateTranscriptResponse
 )
+from services.decision_index import decision_index
+from services.decision_transform import build_debate_transcript
+from services.http_cache import PreparedResponse
+from services.debate_hub import debate_hub, stream_debate_events, REPLAY_SIZE
+from services.metrics import FALLBACK_RESPONSES
 
 router = APIRouter()
 
 
+# Agent personas from the TypeScript agent engine; serialized and compressed once
+AGENT_PERSONAS = [
+    {
+        "id": "fundamental-agent",
+        "name": "Fundamental Agent",
+        "role": "Fundamental Analysis & Events",
+        "avatar": "📈",
+        "description": "Specializes in logical, factual, and event-based reasoning. Analyzes fundamentals, news events, partnerships, protocol upgrades, and ecosystem developments. Focuses on tokenomics, supply dynamics, user growth, transaction volume, and developer activity. Bases decisions on factual information and logical analysis, ignoring short-term price movements.",
+        "specialty": "Fundamental Analysis"
+    },
+    {
+        "id": "quant-agent",
+        "name": "Quant Agent",
+        "role": "Quantitative Analysis & Statistics",
+        "avatar": "📊",
+        "description": "Specializes in probability, statistics, and numerical analysis. Uses ONLY numerical data: prices, volumes, returns, volatility, correlations. Applies statistical models like mean reversion, momentum, and volatility clustering. Calculates probabilities and expected values. Uses technical indicators (RSI, MACD, Bollinger Bands) and analyzes volume profiles and market microstructure.",
+        "specialty": "Quantitative Analysis"
+    },
+    {
+        "id": "sentiment-agent",
+        "name": "Sentiment Agent",
+        "role": "Social Media & Narrative Analysis",
+        "avatar": "📰",
+        "description": "Specializes in social media narrative, momentum, and trend-driven analysis. Analyzes Twitter, Reddit, and Discord sentiment. Tracks narrative shifts, hype cycles, and momentum patterns. Monitors influencer activity, community engagement, and viral potential. Considers market psychology, FOMO/FUD dynamics, and contrarian signals when sentiment is extreme.",
+        "specialty": "Sentiment Analysis"
+    },
+    {
+        "id": "risk-agent",
+        "name": "Risk Agent",
+        "role": "Risk Management & Portfolio Protection",
+        "avatar": "🛡️",
+        "description": "Conservative, tail-risk-aware agent that prioritizes capital preservation over returns. Limits position sizes to manage portfolio heat. Evaluates correlation with existing positions, sets maximum drawdown limits, and uses conservative position sizing (typically 5-15% of portfolio per position). Rejects high-risk opportunities even if profitable. Considers liquidity, slippage risks, and worst-case scenarios.",
+        "specialty": "Risk Management"
+    },
+    {
+        "id": "strategist-agent",
+        "name": "Strategist Agent",
+        "role": "Market Structure & Strategy",
+        "avatar": "⚡",
+        "description": "Specializes in market structure, incentives, and inefficiencies. Analyzes market mechanics, identifies arbitrage opportunities, and considers incentive structures and game theory. Evaluates market maker behavior, order flow, funding rates, basis, and derivatives pricing. Identifies market manipulation patterns and strategic positioning opportunities.",
+        "specialty": "Market Strategy"
+    },
+]
+
+AGENT_PERSONAS_RESPONSE = PreparedResponse(AGENT_PERSONAS)
+
+
 @router.get("", response_model=AgentsResponse)
-async def get_agents():
+async def get_agents(request: Request):
     """
     Get all agent personas from the TypeScript agent engine.
     Returns the 5 specialized trading agents with their real personas.
     """
-    return [
-        {
-            "id": "fundamental-agent",
-            "name": "Fundamental Agent",
-            "role": "Fundamental Analysis & Events",
-            "avatar": "📈",
-            "description": "Specializes in logical, factual, and event-based reasoning. Analyzes fundamentals, news events, partnerships, protocol upgrades, and ecosystem developments. Focuses on tokenomics, supply dynamics, user growth, transaction volume, and developer activity. Bases decisions on factual information and logical analysis, ignoring short-term price movements.",
-            "specialty": "Fundamental Analysis"
-        },
-        {
-            "id": "quant-agent",
-            "name": "Quant Agent",
-            "role": "Quantitative Analysis & Statistics",
-            "avatar": "📊",
-            "description": "Specializes in probability, statistics, and numerical analysis. Uses ONLY numerical data: prices, volumes, returns, volatility, correlations. Applies statistical models like mean reversion, momentum, and volatility clustering. Calculates probabilities and expected values. Uses technical indicators (RSI, MACD, Bollinger Bands) and analyzes volume profiles and market microstructure.",
-            "specialty": "Quantitative Analysis"
-        },
-        {
-            "id": "sentiment-agent",
-            "name": "Sentiment Agent",
-            "role": "Social Media & Narrative Analysis",
-            "avatar": "📰",
-            "description": "Specializes in social media narrative, momentum, and trend-driven analysis. Analyzes Twitter, Reddit, and Discord sentiment. Tracks narrative shifts, hype cycles, and momentum patterns. Monitors influencer activity, community engagement, and viral potential. Considers market psychology, FOMO/FUD dynamics, and contrarian signals when sentiment is extreme.",
-            "specialty": "Sentiment Analysis"
-        },
-        {
-            "id": "risk-agent",
-            "name": "Risk Agent",
-            "role": "Risk Management & Portfolio Protection",
-            "avatar": "🛡️",
-            "description": "Conservative, tail-risk-aware agent that prioritizes capital preservation over returns. Limits position sizes to manage portfolio heat. Evaluates correlation with existing positions, sets maximum drawdown limits, and uses conservative position sizing (typically 5-15% of portfolio per position). Rejects high-risk opportunities even if profitable. Considers liquidity, slippage risks, and worst-case scenarios.",
-            "specialty": "Risk Management"
-        },
+    return AGENT_PERSONAS_RESPONSE.respond(request)
+
+
+# Shown until the first decision run has been broadcast
+PLACEHOLDER_LIVE_DEBATE = {
+    "proposalId": "prop-002",
+    "messages": [
         {
-            "id": "strategist-agent",
-            "name": "Strategist Agent",
-            "role": "Market Structure & Strategy",
-            "avatar": "⚡",
-            "description": "Specializes in market structure, incentives, and inefficiencies. Analyzes market mechanics, identifies arbitrage opportunities, and considers incentive structures and game theory. Evaluates market maker behavior, order flow, funding rates, basis, and derivatives pricing. Identifies market manipulation patterns and strategic positioning opportunities.",
-            "specialty": "Market Strategy"
+            "agent": "Quant Analyst",
+            "message": "Current analysis...",
+            "timestamp": "14:28:33",
+            "vote": "YES"
         },
     ]
+}
+
+
+# /debate/live routes must be registered before /debate/{proposal_id}, which would capture them
+@router.get("/debate/live", response_model=DebateTranscriptResponse)
+async def get_live_debate():
+    """
+    Get the current live debate transcript (the latest decision run).
+    Served from the in-process debate hub; no upstream query.
+    """
+    return debate_hub.snapshot() or PLACEHOLDER_LIVE_DEBATE
+
+
+@router.get("/debate/live/stream")
+async def stream_live_debate(
+    replay: int = Query(REPLAY_SIZE, ge=0, le=REPLAY_SIZE, description="Past events to replay on connect"),
+    last_event_id: Optional[int] = Header(None, description="Resume after this event id (set by EventSource)"),
+):
+    """
+    Server-Sent Events stream of live debate events (debate, progress, message, end).
+    Every viewer shares the same feed from the decision engine.
+    """
+    return StreamingResponse(
+        stream_debate_events(debate_hub, replay, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/debate/live/ws")
+async def live_debate_socket(websocket: WebSocket, replay: int = REPLAY_SIZE):
+    """
+    WebSocket variant of the live debate stream; one JSON event per text frame.
+    """
+    await websocket.accept()
+    subscriber = debate_hub.subscribe(max(0, min(replay, REPLAY_SIZE)))
+
+    async def forward():
+        while True:
+            event = await subscriber.queue.get()
+            await websocket.send_text(event["ws"])
+
+    sender = asyncio.create_task(forward())
+    try:
+        # Reading is how a closed socket is noticed between debates
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        debate_hub.unsubscribe(subscriber)
 
 
 @router.get("/debate/{proposal_id}", response_model=DebateTranscriptResponse)
@@ -67,76 +146,21 @@ async def get_debate_transcript(proposal_id: str = Path(..., description="Propos
     Get full debate transcript for a specific proposal.
     Returns the complete conversation between all agents from Snowflake.
     """
-    # Try to fetch from Snowflake first
+    # Try to fetch from Snowflake first (point lookup by id, served from the local index when possible)
+    # Only the fetch falls back; a bug in building the transcript must surface as a 500.
+    # Index hits never leave the process; misses are tracked as upstream calls by the
+    # dashboard worker or the database they go to.
     try:
-        import subprocess
-        import json
-        from pathlib import Path as PathLib
-        
-        BACKEND_DIR = PathLib(__file__).parent.parent
-        script_content = f"""
-import {{ getLatestDecisions }} from './src/services/snowflake/dashboard';
-import {{ initSnowflake }} from './src/database/snowflake';
-
-async function run() {{
-  try {{
-    await initSnowflake();
-    const decisions = await getLatestDecisions(100);
-    const decision = decisions.find(d => d.id === '{proposal_id}');
-    if (decision) {{
-      const logs = decision.conversation_logs || {{}};
-      const initial = logs.initial_decisions || [];
-      const final = logs.final_decisions || [];
-      
-      // Convert agent outputs to debate messages
-      const messages = [];
-      
-      // Initial decisions
-      for (const agent of initial) {{
-        messages.push({{
-          agent: agent.agent || 'Unknown',
-          message: agent.decision?.reasoning || '',
-          timestamp: new Date().toLocaleTimeString(),
-          vote: agent.decision?.direction || 'NO'
-        }});
-      }}
-      
-      // Final decisions (after debate)
-      for (const agent of final) {{
-        messages.push({{
-          agent: agent.agent || 'Unknown',
-          message: agent.decision?.reasoning || '',
-          timestamp: new Date().toLocaleTimeString(),
-          vote: agent.decision?.direction || 'NO'
-        }});
-      }}
-      
-      console.log(JSON.stringify({{ proposalId: '{proposal_id}', messages }}));
-    }} else {{
-      console.log(JSON.stringify({{ proposalId: '{proposal_id}', messages: [] }}));
-    }}
-  }} catch (error) {{
-    console.error(JSON.stringify({{ error: String(error) }}));
-    process.exit(1);
-  }}
-}}
-
-run();
-"""
-        result = subprocess.run(
-            ["npx", "ts-node", "-e", script_content],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            cwd=str(BACKEND_DIR)
-        )
-        if result.returncode == 0:
-            transcript = json.loads(result.stdout)
-            if transcript.get("messages"):
-                return transcript
+        decision = await decision_index.lookup(proposal_id)
     except Exception as e:
-        print(f"Error fetching debate from Snowflake: {e}")
-    
+        print(f"ERROR: fetching debate from Snowflake failed, serving mock transcript: {e!r}")
+        FALLBACK_RESPONSES.inc(route="/api/agents/debate/{proposal_id}", reason="upstream_error")
+        decision = None
+    if decision:
+        transcript = build_debate_transcript(proposal_id, decision)
+        if transcript["messages"]:
+            return transcript
+
     # Fallback to mock data
     
     # Return different debates based on proposal ID to match governance outcomes
@@ -349,25 +373,3 @@ run();
                 },
             ]
         }
-
-
-@router.get("/debate/live", response_model=DebateTranscriptResponse)
-async def get_live_debate():
-    """
-    Get the current live debate transcript.
-    """
-    # TODO: Replace with real database query
-    # Example: SELECT * FROM debate_messages WHERE proposal_id = (SELECT id FROM proposals WHERE status = 'PENDING' ORDER BY timestamp DESC LIMIT 1)
-    
-    return {
-        "proposalId": "prop-002",
-        "messages": [
-            {
-                "agent": "Quant Analyst",
-                "message": "Current analysis...",
-                "timestamp": "14:28:33",
-                "vote": "YES"
-            },
-        ]
-    }
-
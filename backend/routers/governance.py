@@ -2,163 +2,179 @@
 Governance-related endpoints
 Handles AI proposals, voting, and agent reasoning
 """
-from fastapi import APIRouter, Path, Query, HTTPException
+from fastapi import APIRouter, Path, Query, HTTPException, Response
 from typing import Optional
 import random
-from datetime import datetime
-import subprocess
-import json
-from pathlib import Path as PathLib
 from schemas.governance import (
     ProposalsResponse,
+    ProposalsPageResponse,
     ProposalResponse,
     ProposalReasoningResponse,
     VoteRequest,
     VoteResponse
 )
-from data.consistent_data import ALL_BETS
+from data.consistent_data import BET_STORE
+from services.dashboard_worker import cached_dashboard_call
+from services.decision_index import decision_index
+from services.decision_transform import decisions_to_proposals
+from services.pagination import encode_cursor, decode_cursor, InvalidCursor
+from services.serialization import fast_response
+from services.http_cache import version_etag
+from services.metrics import FALLBACK_RESPONSES
 
 router = APIRouter()
 
-# Path to the TypeScript dashboard service
-BACKEND_DIR = PathLib(__file__).parent.parent
-TS_DASHBOARD = BACKEND_DIR / "src" / "services" / "snowflake" / "dashboard.ts"
+# Proposal status is derived from the decision direction, so status filters map onto final_direction
+STATUS_TO_DIRECTION = {"APPROVED": "YES", "REJECTED": "NO"}
 
 
-def call_typescript_dashboard(function_name: str, *args):
+def bet_to_proposal(bet: dict) -> dict:
     """
-    Call TypeScript dashboard functions via ts-node
+    Convert a mock bet from consistent_data into the Proposal shape.
     """
-    script_content = f"""
-import {{ {function_name} }} from './src/services/snowflake/dashboard';
-import {{ initSnowflake }} from './src/database/snowflake';
+    return {
+        "id": bet["id"],
+        "market": bet["betDescription"],  # Use betDescription as market (Polymarket bet)
+        "direction": "LONG" if bet["vote"] == "YES" else "SHORT",
+        "positionSize": bet["positionSize"],
+        "riskScore": bet["riskScore"],
+        "confidence": bet["confidence"],
+        "status": bet["status"],
+        "summary": bet["betDescription"],  # Use betDescription as summary
+        "timestamp": bet["timestamp"],
+        "dataSources": [f"https://polymarket.com/bet/{bet['id']}"],
+        "betStatus": bet["betStatus"],
+        "betResult": bet["betResult"],
+        "closedAt": bet.get("closedAt"),
+        "vote": bet["vote"]  # YES or NO
+    }
 
-async function run() {{
-  try {{
-    await initSnowflake();
-    const result = await {function_name}({', '.join(map(str, args))});
-    console.log(JSON.stringify(result));
-  }} catch (error) {{
-    console.error(JSON.stringify({{ error: str(error) }}));
-    process.exit(1);
-  }}
-}}
 
-run();
-"""
+async def fetch_decision_page(limit: int, status: Optional[str], cursor: Optional[dict]):
+    """
+    Fetch one page of real proposals, newest first, with status and keyset
+    conditions evaluated in Snowflake. Returns (proposals, next_cursor).
+    """
+    direction = None
+    if status:
+        direction = STATUS_TO_DIRECTION.get(status)
+        if direction is None:
+            # Real decisions are only ever APPROVED or REJECTED
+            return [], None
+    
+    after_ts = cursor["t"] if cursor else None
+    after_id = cursor["id"] if cursor else None
+    # One extra row tells us whether another page exists
+    decisions = await cached_dashboard_call("getDecisionsPage", limit + 1, direction, after_ts, after_id)
+    decision_index.add_many(decisions)
     
+    proposals = decisions_to_proposals(decisions[:limit])
+    next_cursor = None
+    if len(decisions) > limit:
+        last = decisions[limit - 1]
+        next_cursor = encode_cursor("db", last.get("created_at"), last.get("id"))
+    return proposals, next_cursor
+
+
+def fetch_mock_page(limit: int, status: Optional[str], cursor: Optional[dict]):
+    """
+    Page through mock bets in timestamp order. Returns (proposals, next_cursor).
+    """
+    after = (cursor["t"], cursor["id"]) if cursor else None
+    bets, has_more = BET_STORE.page(limit, after=after, status=status)
+    
+    proposals = [bet_to_proposal(bet) for bet in bets]
+    next_cursor = None
+    if has_more:
+        timestamp, bet_id = BET_STORE.key(bets[-1])
+        next_cursor = encode_cursor("mock", timestamp, bet_id)
+    return proposals, next_cursor
+
+
+async def load_proposals_page(
+    response: Response,
+    status: Optional[str],
+    limit: int,
+    cursor: Optional[str],
+    use_real_data: bool,
+):
+    """
+    One page of proposals for either version of the listing. Returns
+    (proposals, next_cursor); sets the ETag on ``response`` for mock pages.
+    """
     try:
-        result = subprocess.run(
-            ["npx", "ts-node", "-e", script_content],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            cwd=str(BACKEND_DIR)
-        )
-        if result.returncode == 0:
-            return json.loads(result.stdout)
-        else:
-            return []
-    except Exception as e:
-        print(f"Error calling TypeScript dashboard: {e}")
-        return []
+        page_cursor = decode_cursor(cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    status = status.upper() if status else None
+    proposals, next_cursor = [], None
+    source = page_cursor["s"] if page_cursor else ("db" if use_real_data else "mock")
+    
+    if source == "db":
+        # Fetch real decisions from Snowflake
+        try:
+            proposals, next_cursor = await fetch_decision_page(limit, status, page_cursor)
+            if not proposals and not page_cursor and not status:
+                # No decisions stored yet
+                source = "mock"
+        except Exception as e:
+            if page_cursor:
+                # Mock data here would silently restart the listing at the first mock page
+                print(f"ERROR: fetching decisions page failed: {e!r}")
+                raise HTTPException(status_code=503, detail="Decisions are temporarily unavailable, retry this page")
+            print(f"ERROR: fetching real decisions failed, falling back to mock data: {e!r}")
+            FALLBACK_RESPONSES.inc(route="/api/governance/proposals", reason="upstream_error")
+            source = "mock"
+    
+    # Fallback to mock data if the first page of real data failed or use_real_data=False
+    if source == "mock":
+        try:
+            proposals, next_cursor = fetch_mock_page(limit, status, page_cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Malformed cursor")
+        # Mock bets are fixed for the process lifetime, so the query itself is the version stamp
+        response.headers["ETag"] = version_etag("proposals", BET_STORE.timestamp[-1].item(), status, limit, cursor)
+    
+    return proposals, next_cursor
 
 
 @router.get("/proposals", response_model=ProposalsResponse)
 async def get_proposals(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by status"),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
     use_real_data: bool = Query(True, description="Use real decisions from Snowflake")
 ):
     """
-    Get all governance proposals.
-    If use_real_data=True, fetches from Snowflake decisions.
+    Get governance proposals, one page at a time.
+    If use_real_data=True, fetches from Snowflake decisions (newest first).
     Otherwise, uses mock data from consistent_data.py
+    The body is a bare list, as it has always been; the cursor for the next
+    page is ONLY returned in the X-Next-Cursor header (absent on the last
+    page). /v2/proposals returns it in the body instead.
     """
-    proposals = []
-    
-    if use_real_data:
-        # Fetch real decisions from Snowflake
-        try:
-            decisions = call_typescript_dashboard("getLatestDecisions", limit * 2)  # Get more to filter
-            
-            for decision in decisions:
-                # Extract agent outputs
-                agent_outputs = decision.get("agent_outputs", [])
-                if isinstance(agent_outputs, str):
-                    try:
-                        agent_outputs = json.loads(agent_outputs)
-                    except:
-                        agent_outputs = []
-                
-                # Calculate average confidence
-                if agent_outputs:
-                    total_confidence = sum(
-                        agent.get("decision", {}).get("confidence", 0) 
-                        for agent in agent_outputs
-                    )
-                    avg_confidence = total_confidence / len(agent_outputs) if agent_outputs else 0
-                else:
-                    avg_confidence = 0
-                
-                # Determine status
-                direction = decision.get("final_direction", "NO")
-                decision_status = "APPROVED" if direction == "YES" else "REJECTED"
-                
-                # Extract market data
-                market_data = decision.get("raw_market_data", {})
-                if isinstance(market_data, str):
-                    try:
-                        market_data = json.loads(market_data)
-                    except:
-                        market_data = {}
-                
-                proposal = {
-                    "id": decision.get("id", ""),
-                    "market": decision.get("market_question", decision.get("market_id", "Unknown Market")),
-                    "direction": "LONG" if direction == "YES" else "SHORT",
-                    "positionSize": f"${decision.get('final_size', 0):,.0f}",
-                    "riskScore": 5.0,  # Could be calculated from agent outputs
-                    "confidence": int(avg_confidence),
-                    "status": decision_status,
-                    "summary": decision.get("consensus_reasoning", "")[:200] + "..." if len(decision.get("consensus_reasoning", "")) > 200 else decision.get("consensus_reasoning", ""),
-                    "timestamp": decision.get("created_at", datetime.now().isoformat()),
-                    "dataSources": [f"https://polymarket.com/event/{decision.get('market_id', '')}"],
-                    "betStatus": "OPEN",
-                    "betResult": None,
-                    "closedAt": None,
-                    "vote": direction
-                }
-                proposals.append(proposal)
-        except Exception as e:
-            print(f"Error fetching real decisions: {e}, falling back to mock data")
-            use_real_data = False
-    
-    # Fallback to mock data if real data fetch failed or use_real_data=False
-    if not use_real_data or not proposals:
-        for bet in ALL_BETS:
-            proposal = {
-                "id": bet["id"],
-                "market": bet["betDescription"],
-                "direction": "LONG" if bet["vote"] == "YES" else "SHORT",
-                "positionSize": bet["positionSize"],
-                "riskScore": bet["riskScore"],
-                "confidence": bet["confidence"],
-                "status": bet["status"],
-                "summary": bet["betDescription"],
-                "timestamp": bet["timestamp"],
-                "dataSources": [f"https://polymarket.com/bet/{bet['id']}"],
-                "betStatus": bet["betStatus"],
-                "betResult": bet["betResult"],
-                "closedAt": bet.get("closedAt"),
-                "vote": bet["vote"]
-            }
-            proposals.append(proposal)
-    
-    if status:
-        proposals = [p for p in proposals if p["status"] == status.upper()]
-    
-    return proposals[:limit]
+    proposals, next_cursor = await load_proposals_page(response, status, limit, cursor, use_real_data)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return fast_response(proposals, headers=response.headers)
+
+
+@router.get("/v2/proposals", response_model=ProposalsPageResponse)
+async def get_proposals_page(
+    response: Response,
+    status: Optional[str] = Query(None, description="Filter by status"),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    use_real_data: bool = Query(True, description="Use real decisions from Snowflake")
+):
+    """
+    Get governance proposals, one page at a time, as {items, next_cursor}.
+    Same pages and cursors as /proposals; next_cursor is None on the last page.
+    """
+    proposals, next_cursor = await load_proposals_page(response, status, limit, cursor, use_real_data)
+    return fast_response({"items": proposals, "next_cursor": next_cursor}, headers=response.headers)
 
 
 @router.get("/proposals/{proposal_id}", response_model=ProposalResponse)
@@ -166,28 +182,12 @@ async def get_proposal(proposal_id: str = Path(..., description="Proposal ID")):
     """
     Get details for a single proposal.
     """
-    # Find the proposal in ALL_BETS
-    bet = next((b for b in ALL_BETS if b["id"] == proposal_id), None)
+    bet = BET_STORE.get(proposal_id)
     
     if not bet:
         raise HTTPException(status_code=404, detail="Proposal not found")
     
-    return {
-        "id": bet["id"],
-        "market": bet["betDescription"],  # Use betDescription as market (Polymarket bet)
-        "direction": "LONG" if bet["vote"] == "YES" else "SHORT",
-        "positionSize": bet["positionSize"],
-        "riskScore": bet["riskScore"],
-        "confidence": bet["confidence"],
-        "status": bet["status"],
-        "summary": bet["betDescription"],  # Use betDescription as summary
-        "timestamp": bet["timestamp"],
-        "dataSources": [f"https://polymarket.com/bet/{bet['id']}"],
-        "betStatus": bet["betStatus"],
-        "betResult": bet["betResult"],
-        "closedAt": bet.get("closedAt"),
-        "vote": bet["vote"]  # YES or NO
-    }
+    return bet_to_proposal(bet)
 
 
 @router.get("/proposals/{proposal_id}/reasoning", response_model=ProposalReasoningResponse)
@@ -259,11 +259,11 @@ async def get_random_polymarket_bet():
     Returns a JSON object matching the Proposal interface.
     This endpoint is designed for AI systems to pull random bets with a side (YES/NO).
     """
-    # Select a random bet from ALL_BETS
-    if not ALL_BETS:
+    # Select a random bet from the bet store
+    if not len(BET_STORE):
         raise HTTPException(status_code=404, detail="No bets available")
     
-    bet = random.choice(ALL_BETS)
+    bet = BET_STORE.to_dict(random.randrange(len(BET_STORE)))
     
     # Generate a Polymarket URL (using the bet ID or slug)
     # In production, you would fetch this from Polymarket API
@@ -4,6 +4,7 @@ Handles current open trading positions
 """
 from fastapi import APIRouter
 from schemas.positions import PositionsResponse
+from services.serialization import fast_response
 
 router = APIRouter()
 
@@ -15,5 +16,5 @@ async def get_current_positions():
     """
     from data.consistent_data import generate_positions
     
-    return generate_positions()
+    return fast_response(generate_positions())
 
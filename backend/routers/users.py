@@ -11,6 +11,9 @@ from schemas.users import (
     AgentCommentaryResponse,
     UserDepositsResponse
 )
+from services.resample import DEFAULT_POINTS, MAX_POINTS, RESOLUTION_PATTERN, METHOD_PATTERN
+from data.vault_series import history_points
+from services.serialization import fast_response
 
 router = APIRouter()
 
@@ -45,19 +48,19 @@ async def get_user_profile(wallet: str = Query(..., description="Wallet address"
 @router.get("/nav/history", response_model=NavHistoryResponse)
 async def get_user_nav_history(
     wallet: str = Query(..., description="Wallet address"),
-    days: int = Query(30, ge=1, le=365)
+    days: int = Query(30, ge=1, le=365),
+    points: int = Query(DEFAULT_POINTS, ge=2, le=MAX_POINTS, description="Maximum points to return"),
+    resolution: str = Query("raw", pattern=RESOLUTION_PATTERN, description="Bucket to one point per day/week/month"),
+    method: str = Query("lttb", pattern=METHOD_PATTERN, description="Downsampling method"),
 ):
     """
     Get user's personal NAV history.
+    Vault shares are priced at the vault NAV, so this is the vault NAV series.
     """
     if not wallet:
         raise HTTPException(status_code=400, detail="Wallet address is required")
     
-    # TODO: Replace with real database query
-    return [
-        {"date": "Jan 1", "nav": 1.0000},
-        {"date": "Jan 8", "nav": 1.0124},
-    ]
+    return fast_response(history_points("nav", "nav", days, points, resolution, method, digits=4))
 
 
 @router.get("/commentary", response_model=AgentCommentaryResponse)
@@ -13,6 +13,9 @@ from schemas.vault import (
     DepositRequest,
     DepositResponse
 )
+from services.resample import DEFAULT_POINTS, MAX_POINTS, RESOLUTION_PATTERN, METHOD_PATTERN
+from data.vault_series import history_points
+from services.serialization import fast_response
 
 router = APIRouter()
 
@@ -24,7 +27,7 @@ async def get_vault_stats(wallet: Optional[str] = Query(None)):
     If wallet address is provided, includes user-specific data.
     """
     from data.consistent_data import (
-        TOTAL_VAULT_VALUE_USD, USER_DEPOSITED_USD, USER_WIN_COUNT, USER_LOSE_COUNT, 
+        TOTAL_VAULT_VALUE_USD, VAULT_SHARE_PRICE, USER_DEPOSITED_USD, USER_WIN_COUNT, USER_LOSE_COUNT, 
         USER_WIN_RATE, USER_WIN_AMOUNT, VAULT_OWNERSHIP_PERCENT, VAULT_SHARES
     )
     
@@ -33,7 +36,7 @@ async def get_vault_stats(wallet: Optional[str] = Query(None)):
         "winUserCount": 912,
         "loseUserCount": 335,
         "winPercent": 73.1,
-        "vaultSharePrice": 1.0847,
+        "vaultSharePrice": VAULT_SHARE_PRICE,
     }
     
     if wallet:
@@ -49,59 +52,44 @@ async def get_vault_stats(wallet: Optional[str] = Query(None)):
 
 
 @router.get("/nav/history", response_model=NavHistoryResponse)
-async def get_nav_history(days: int = Query(30, ge=1, le=365)):
+async def get_nav_history(
+    days: int = Query(30, ge=1, le=365),
+    points: int = Query(DEFAULT_POINTS, ge=2, le=MAX_POINTS, description="Maximum points to return"),
+    resolution: str = Query("raw", pattern=RESOLUTION_PATTERN, description="Bucket to one point per day/week/month"),
+    method: str = Query("lttb", pattern=METHOD_PATTERN, description="Downsampling method"),
+):
     """
     Get NAV (Net Asset Value) history over time.
     """
-    # TODO: Replace with real database query
-    # Example: SELECT date, nav FROM nav_history WHERE date >= NOW() - INTERVAL '{days} days'
-    return [
-        {"date": "Jan 1", "nav": 1.0000},
-        {"date": "Jan 8", "nav": 1.0124},
-        {"date": "Jan 15", "nav": 1.0287},
-    ]
+    return fast_response(history_points("nav", "nav", days, points, resolution, method, digits=4))
 
 
 @router.get("/tvl/history", response_model=TvlHistoryResponse)
-async def get_tvl_history(days: int = Query(30, ge=1, le=1095)):
+async def get_tvl_history(
+    days: int = Query(30, ge=1, le=1095),
+    points: int = Query(DEFAULT_POINTS, ge=2, le=MAX_POINTS, description="Maximum points to return"),
+    resolution: str = Query("raw", pattern=RESOLUTION_PATTERN, description="Bucket to one point per day/week/month"),
+    method: str = Query("lttb", pattern=METHOD_PATTERN, description="Downsampling method"),
+):
     """
     Get Total Value Locked (TVL) history over time.
     """
-    # TODO: Replace with real database query
-    from datetime import datetime, timedelta
-    import random
-    
-    # Generate data points for the requested days
-    data = []
-    base_value = 2500000.0
-    random.seed(42)  # For consistent data
-    
-    for i in range(days):
-        date = datetime.now() - timedelta(days=days - i - 1)
-        # Generate realistic TVL with some volatility
-        change = random.uniform(-0.02, 0.03)
-        base_value *= (1 + change)
-        data.append({
-            "date": date.strftime("%b %d, %Y") if days > 30 else date.strftime("%b %d"),
-            "value": round(base_value, 2)
-        })
-    
-    # Limit to ~200 points for performance
-    if len(data) > 200:
-        step = len(data) // 200
-        data = data[::step]
-    
-    return data
+    return fast_response(history_points("tvl", "value", days, points, resolution, method))
 
 
 @router.get("/portfolio/amount", response_model=PortfolioAmountResponse)
-async def get_portfolio_amount_history(days: int = Query(30, ge=1, le=1095)):
+async def get_portfolio_amount_history(
+    days: int = Query(30, ge=1, le=1095),
+    points: int = Query(DEFAULT_POINTS, ge=2, le=MAX_POINTS, description="Maximum points to return"),
+    resolution: str = Query("raw", pattern=RESOLUTION_PATTERN, description="Bucket to one point per day/week/month"),
+    method: str = Query("lttb", pattern=METHOD_PATTERN, description="Downsampling method"),
+):
     """
     Get portfolio amount history over time.
     Uses consistent data that matches user stats.
     """
     from data.consistent_data import generate_portfolio_amount_history
-    return generate_portfolio_amount_history(days)
+    return fast_response(generate_portfolio_amount_history(days, points, resolution, method))
 
 
 @router.get("/allocations", response_model=MarketAllocationResponse)
@@ -25,6 +25,11 @@ class Proposal(BaseModel):
 ProposalsResponse = List[Proposal]
 
 
+class ProposalsPageResponse(BaseModel):
+    items: List[Proposal]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page; None on the last page
+
+
 class ProposalResponse(Proposal):
     pass
 
@@ -0,0 +1,4 @@
+"""
+Service modules shared across routers
+Long-lived workers, caches and other infrastructure used by the API
+"""
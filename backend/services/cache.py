@@ -0,0 +1,236 @@
+"""
+Async TTL + LRU cache with single-flight loading, and single-flight call coalescing
+Used to share upstream (Snowflake, decision engine) results between concurrent requests
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from services.metrics import SINGLE_FLIGHT_CALLS
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after ``ttl`` seconds.
+
+    ``get_or_load`` runs at most one loader per key at a time: concurrent
+    callers for the same key await the same upstream call instead of issuing
+    their own. Loader errors are never cached.
+    """
+
+    def __init__(self, name: str, ttl: float = 60.0, max_size: int = 256):
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for ``key``, loading it once if missing.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader, self._generation))
+            self._inflight[key] = task
+        # Shield so one caller disconnecting doesn't cancel the load for everyone
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        try:
+            value = await loader()
+            # Don't store results that started before an invalidation
+            if generation == self._generation:
+                self.set(key, value)
+            return value
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None):
+        """
+        Drop all entries, or only those whose key matches ``predicate``.
+        """
+        self.invalidations += 1
+        if predicate is None:
+            self._entries.clear()
+            self._generation += 1
+            self._inflight.clear()
+            return
+        for key in [k for k in self._entries if predicate(k)]:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+class _Flight:
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self.listeners: List[Callable[[Any], None]] = []
+
+    def notify(self, message: Any):
+        for listener in list(self.listeners):
+            listener(message)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one run.
+
+    The first caller (the leader) starts ``fn(notify)`` as its own task;
+    callers arriving while it runs (followers) await the same task. A
+    caller that is cancelled (e.g. its client disconnected) only stops
+    waiting: the run is cancelled once no caller is left waiting on it.
+    Anything passed to ``notify`` reaches every waiting caller's listener.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.leaders = 0
+        self.followers = 0
+        self.abandoned = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[Callable[[Any], None]], Awaitable[Any]],
+        listener: Optional[Callable[[Any], None]] = None,
+    ) -> Any:
+        flight = self._flights.get(key)
+        if flight is not None and flight.task.get_loop() is not asyncio.get_running_loop():
+            flight = None
+        if flight is None:
+            self.leaders += 1
+            SINGLE_FLIGHT_CALLS.inc(group=self.name, role="leader")
+            flight = _Flight()
+            flight.task = asyncio.ensure_future(fn(flight.notify))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.followers += 1
+            SINGLE_FLIGHT_CALLS.inc(group=self.name, role="follower")
+
+        if listener is not None:
+            flight.listeners.append(listener)
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # Last one waiting: nobody wants the result any more
+                self.abandoned += 1
+                SINGLE_FLIGHT_CALLS.inc(group=self.name, role="abandoned")
+                self._forget(key, flight)
+                flight.task.cancel()
+                # Let the run unwind (e.g. release its decision slot) before propagating
+                await asyncio.wait([flight.task])
+            raise
+        finally:
+            flight.waiters -= 1
+            if listener is not None and listener in flight.listeners:
+                flight.listeners.remove(listener)
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        # New callers start a fresh run once this one has finished or been abandoned
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.followers
+        return {
+            "name": self.name,
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "abandoned": self.abandoned,
+            "coalesce_rate": round(self.followers / calls, 4) if calls else 0.0,
+        }
+
+
+# Decisions change a few times an hour; keep dashboard reads for a minute by default
+dashboard_cache = TTLCache(
+    "dashboard",
+    ttl=float(os.getenv("DASHBOARD_CACHE_TTL", "60")),
+    max_size=int(os.getenv("DASHBOARD_CACHE_SIZE", "256")),
+)
+
+_decision_written_hooks: List[Callable[[Dict[str, Any]], None]] = []
+
+
+def on_decision_written(hook: Callable[[Dict[str, Any]], None]) -> Callable[[Dict[str, Any]], None]:
+    """
+    Register a callback to run whenever a new decision has been stored.
+    """
+    _decision_written_hooks.append(hook)
+    return hook
+
+
+def notify_decision_written(result: Dict[str, Any]):
+    """
+    Fire the decision-written hooks (cache invalidation and friends).
+    """
+    for hook in _decision_written_hooks:
+        try:
+            hook(result)
+        except Exception as e:
+            print(f"Error in decision-written hook: {e}")
+
+
+@on_decision_written
+def _invalidate_dashboard_cache(result: Dict[str, Any]):
+    dashboard_cache.invalidate()
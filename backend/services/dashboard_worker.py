@@ -0,0 +1,273 @@
+"""
+Persistent Node sidecar for the TypeScript dashboard service
+Keeps one ts-node process (and its Snowflake connection) alive for the app lifetime
+"""
+import asyncio
+import itertools
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from db.repositories import dashboard_reads
+from services.cache import dashboard_cache
+from services.metrics import track_upstream
+
+BACKEND_DIR = Path(__file__).parent.parent
+TS_WORKER = BACKEND_DIR / "src" / "services" / "snowflake" / "dashboardWorker.ts"
+
+DEFAULT_COMMAND = ["npx", "ts-node", str(TS_WORKER)]
+
+
+class DashboardWorkerError(Exception):
+    """Raised when the worker returns an error or dies mid-call."""
+
+
+class DashboardWorkerExited(DashboardWorkerError):
+    """Raised for calls pending when the worker process exits."""
+
+    outcome = "nonzero_exit"  # Upstream outcome in services.metrics
+
+
+class DashboardWorker:
+    """
+    Client for the long-lived dashboard worker.
+
+    Messages are framed JSON-RPC 2.0 (``Content-Length`` header + JSON body)
+    over the worker's stdin/stdout. Each call gets its own id, so any number of
+    requests can be in flight at once. If the process exits, pending calls fail
+    and the worker is restarted with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        command: Optional[List[str]] = None,
+        cwd: Path = BACKEND_DIR,
+        default_timeout: float = 30.0,
+        max_backoff: float = 30.0,
+        service: str = "dashboard",
+    ):
+        self.command = command or DEFAULT_COMMAND
+        self.service = service  # Upstream service name in services.metrics
+        self.cwd = cwd
+        self.default_timeout = default_timeout
+        self.max_backoff = max_backoff
+
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._tasks: List[asyncio.Task] = []
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._restart_task: Optional[asyncio.Task] = None
+        self._backoff = 0.5
+        self._stopping = False
+        self.restarts = 0
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self):
+        """
+        Start the worker process if it is not already running.
+        """
+        self._bind_loop()
+        async with self._start_lock:
+            if self.running:
+                return
+            self._stopping = False
+            self._process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(self.cwd),
+            )
+            process = self._process
+            self._tasks = [
+                asyncio.create_task(self._read_responses(process)),
+                asyncio.create_task(self._drain_stderr(process)),
+            ]
+
+    async def stop(self):
+        """
+        Stop the worker and fail any calls still waiting on it.
+        """
+        self._stopping = True
+        if self._restart_task:
+            self._restart_task.cancel()
+            self._restart_task = None
+
+        process = self._process
+        self._process = None
+        if process and process.returncode is None:
+            try:
+                process.stdin.close()
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except (asyncio.TimeoutError, ProcessLookupError, BrokenPipeError):
+                process.kill()
+                await process.wait()
+
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._fail_pending(DashboardWorkerError("Dashboard worker stopped"))
+
+    async def call(self, method: str, *params: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Invoke a dashboard function in the worker and return its JSON result.
+        """
+        # A new event loop (e.g. a fresh test client) must not reuse the old loop's process and futures
+        self._bind_loop()
+        if not self.running:
+            await self.start()
+        # The process may exit (and be cleared) between starting it and writing to it
+        process = self._process
+        if process is None or process.returncode is not None:
+            raise DashboardWorkerError("Dashboard worker is not running")
+
+        request_id = next(self._ids)
+        future = self._loop.create_future()
+        self._pending[request_id] = future
+
+        body = json.dumps({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": method,
+            "params": list(params),
+        }).encode("utf-8")
+
+        try:
+            async with track_upstream(self.service, method):
+                stdin = process.stdin
+                stdin.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+                await stdin.drain()
+                return await asyncio.wait_for(future, timeout or self.default_timeout)
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise DashboardWorkerError(f"Dashboard worker pipe closed: {e}")
+        finally:
+            self._pending.pop(request_id, None)
+
+    def _bind_loop(self):
+        # Futures and locks belong to one event loop; start fresh if the loop changed
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._start_lock = asyncio.Lock()
+            self._process = None
+            self._pending = {}
+            self._tasks = []
+            self._restart_task = None
+
+    async def _read_responses(self, process: asyncio.subprocess.Process):
+        reader = process.stdout
+        try:
+            while True:
+                length = None
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        raise EOFError
+                    line = line.strip()
+                    if not line:
+                        if length is not None:
+                            break
+                        continue
+                    name, _, value = line.decode("utf-8", "replace").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value.strip())
+
+                body = await reader.readexactly(length)
+                self._dispatch(json.loads(body))
+        except (EOFError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Dashboard worker protocol error: {e}")
+            process.kill()
+
+        await process.wait()
+        self._on_exit(process)
+
+    async def _drain_stderr(self, process: asyncio.subprocess.Process):
+        # Worker logs go to stderr; read them so the pipe never fills up
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                return
+
+    def _dispatch(self, message: Dict[str, Any]):
+        future = self._pending.get(message.get("id"))
+        if future is None or future.done():
+            # Caller already timed out
+            return
+        if "error" in message:
+            error = message["error"] or {}
+            future.set_exception(DashboardWorkerError(error.get("message", "Unknown worker error")))
+        else:
+            future.set_result(message.get("result"))
+            self._backoff = 0.5
+
+    def _fail_pending(self, error: Exception):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    def _on_exit(self, process: asyncio.subprocess.Process):
+        if self._process is not process:
+            return
+        self._process = None
+        self._fail_pending(DashboardWorkerExited(
+            f"Dashboard worker exited with code {process.returncode}"
+        ))
+        if not self._stopping:
+            print(f"Dashboard worker exited with code {process.returncode}, restarting in {self._backoff}s")
+            self._restart_task = asyncio.create_task(self._restart(self._backoff))
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+
+    async def _restart(self, delay: float):
+        await asyncio.sleep(delay)
+        if self._stopping or self.running:
+            return
+        try:
+            await self.start()
+            self.restarts += 1
+        except Exception as e:
+            print(f"Error restarting dashboard worker: {e}")
+
+
+dashboard_worker = DashboardWorker()
+
+
+def dashboard_call(function_name: str, *args) -> Any:
+    """
+    Call a dashboard function uncached: in-process through the configured
+    database (DATABASE_URL) when it serves the method, else in the worker.
+    """
+    if dashboard_reads is not None and dashboard_reads.serves(function_name):
+        return dashboard_reads.call(function_name, *args)
+    return dashboard_worker.call(function_name, *args)
+
+
+async def cached_dashboard_call(function_name: str, *args) -> Any:
+    """
+    Call a dashboard function through the shared TTL cache.
+    Concurrent identical calls share one upstream query; errors propagate.
+    """
+    return await dashboard_cache.get_or_load(
+        (function_name, args),
+        lambda: dashboard_call(function_name, *args),
+    )
+
+
+async def call_typescript_dashboard(function_name: str, *args) -> Any:
+    """
+    Call a TypeScript dashboard function through the persistent worker (cached).
+    Returns an empty list on error, matching the old subprocess behaviour.
+    """
+    try:
+        return await cached_dashboard_call(function_name, *args)
+    except Exception as e:
+        print(f"Error calling TypeScript dashboard: {e}")
+        return []
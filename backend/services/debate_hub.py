@@ -0,0 +1,162 @@
+"""
+Live debate broadcast hub
+Decision runs publish here once; every SSE/WebSocket viewer gets the events pushed
+"""
+import asyncio
+import itertools
+import json
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+from services.decision_transform import build_debate_transcript
+
+REPLAY_SIZE = 100  # Events kept for late joiners
+CLIENT_QUEUE_SIZE = 256
+
+
+class Subscriber:
+    """
+    One viewer's bounded event queue. When a viewer falls behind, its oldest
+    undelivered events are dropped so it can never hold up the publisher.
+    """
+
+    def __init__(self, max_size: int = CLIENT_QUEUE_SIZE):
+        self.queue: asyncio.Queue = asyncio.Queue(max_size)
+        self.dropped = 0
+
+    def offer(self, event: Dict[str, Any]):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class DebateHub:
+    """
+    In-process fan-out of live debate events.
+
+    Event kinds:
+      debate    a decision run started            {"proposalId", "market"}
+      progress  engine log line                   {"proposalId", "message"}
+      message   one agent's debate message        {"proposalId", agent, message, timestamp, vote}
+      end       run finished                      {"proposalId", "status", "decisionId", "error"}
+
+    The last ``replay_size`` events are kept and replayed to new subscribers.
+    """
+
+    def __init__(self, replay_size: int = REPLAY_SIZE, client_queue_size: int = CLIENT_QUEUE_SIZE):
+        self.client_queue_size = client_queue_size
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=replay_size)
+        self.current: Optional[str] = None
+        self.published = 0
+        self._ids = itertools.count(1)
+        self._subscribers: Set[Subscriber] = set()
+
+    def publish(self, kind: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        event_id = next(self._ids)
+        event = {"id": event_id, "event": kind, "data": data, "timestamp": time.time()}
+        # Encode once for every viewer: SSE frame and WebSocket text frame
+        payload = json.dumps(data)
+        event["sse"] = f"id: {event_id}\nevent: {kind}\ndata: {payload}\n\n"
+        event["ws"] = f'{{"id": {event_id}, "event": {json.dumps(kind)}, "data": {payload}}}'
+        self.history.append(event)
+        self.published += 1
+        for subscriber in self._subscribers:
+            subscriber.offer(event)
+        return event
+
+    def subscribe(self, replay: int = REPLAY_SIZE, after_id: Optional[int] = None) -> Subscriber:
+        """
+        Register a viewer, pre-loading up to ``replay`` past events (only those
+        after ``after_id`` when resuming).
+        """
+        subscriber = Subscriber(self.client_queue_size)
+        past = [e for e in self.history if after_id is None or e["id"] > after_id]
+        for event in past[-replay:] if replay > 0 else []:
+            subscriber.offer(event)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def begin(self, request_data: Dict[str, Any]) -> str:
+        """
+        Announce a new decision run and return its id.
+        """
+        run_id = f"run-{uuid.uuid4().hex[:12]}"
+        self.current = run_id
+        market = request_data.get("market") or {}
+        self.publish("debate", {
+            "proposalId": run_id,
+            "market": market.get("question") or market.get("symbol"),
+        })
+        return run_id
+
+    def progress(self, run_id: str, line: str):
+        self.publish("progress", {"proposalId": run_id, "message": line})
+
+    def finish(self, run_id: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        """
+        Publish the agents' messages from a finished run, then its end event.
+        """
+        decision_id = (result or {}).get("decision_id")
+        if result:
+            transcript = build_debate_transcript(run_id, result)
+            for message in transcript["messages"]:
+                self.publish("message", {"proposalId": run_id, **message})
+        self.publish("end", {
+            "proposalId": run_id,
+            "status": "error" if error or not result else result.get("status", "ok"),
+            "decisionId": decision_id,
+            "error": error or (result or {}).get("error"),
+        })
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Transcript of the most recent run still in the replay buffer.
+        """
+        if self.current is None:
+            return None
+        messages = [
+            {key: e["data"][key] for key in ("agent", "message", "timestamp", "vote")}
+            for e in self.history
+            if e["event"] == "message" and e["data"]["proposalId"] == self.current
+        ]
+        return {"proposalId": self.current, "messages": messages}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "buffered": len(self.history),
+            "dropped": sum(s.dropped for s in self._subscribers),
+        }
+
+
+debate_hub = DebateHub()
+
+
+async def stream_debate_events(
+    hub: DebateHub,
+    replay: int = REPLAY_SIZE,
+    after_id: Optional[int] = None,
+    keepalive: float = 15.0,
+) -> AsyncIterator[str]:
+    """
+    Yield hub events as Server-Sent Events until the client goes away.
+    Each event carries its id, so reconnecting clients resume via Last-Event-ID.
+    """
+    subscriber = hub.subscribe(replay, after_id)
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield event["sse"]
+    finally:
+        hub.unsubscribe(subscriber)
+
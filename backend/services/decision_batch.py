@@ -0,0 +1,171 @@
+"""
+Batch decision runs over one warm decision worker
+Fans a list of markets out under the process-wide decision limit and yields each result as it finishes
+"""
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+from services.cache import notify_decision_written
+from services.dashboard_worker import DashboardWorker
+from services.decision_cache import decision_cache
+from services.debate_hub import debate_hub
+from services.decision_engine import MAX_CONCURRENT_DECISIONS, TS_NODE_TIMEOUT, decision_engine, decision_flights
+
+BACKEND_DIR = Path(__file__).parent.parent
+TS_WORKER = BACKEND_DIR / "agent_engine" / "services" / "decisionWorker.ts"
+TS_WORKER_JS = BACKEND_DIR / "dist" / "agent_engine" / "services" / "decisionWorker.js"
+
+# Markets one batch has running or waiting at once; all batches and single decisions
+# together stay within MAX_CONCURRENT_DECISIONS running pipelines
+BATCH_CONCURRENCY = int(os.getenv("BATCH_DECISION_CONCURRENCY", str(MAX_CONCURRENT_DECISIONS)))
+BATCH_MAX_MARKETS = int(os.getenv("BATCH_DECISION_MAX_MARKETS", "100"))
+BATCH_TIMEOUT = float(os.getenv("BATCH_DECISION_TIMEOUT", "600"))  # Seconds for the whole batch
+
+
+def worker_command() -> List[str]:
+    # Compiled JavaScript if built, else ts-node (slower to start, but only once per worker)
+    if TS_WORKER_JS.exists():
+        return ["node", str(TS_WORKER_JS)]
+    return ["npx", "ts-node", "--project", "tsconfig.json", str(TS_WORKER)]
+
+
+# Same framed JSON-RPC sidecar as the dashboard worker, serving decisionWorker.ts
+decision_worker = DashboardWorker(
+    command=worker_command(),
+    default_timeout=TS_NODE_TIMEOUT,
+    service="decision_worker",
+)
+
+
+async def enrich_markets(markets: List[Dict[str, Any]], worker: DashboardWorker, timeout: float) -> List[Dict[str, Any]]:
+    """
+    Fill the markets in from one shared Polymarket listing fetch. Enrichment is
+    best effort: on any failure the markets are used as given.
+    """
+    try:
+        entries = await asyncio.wait_for(worker.call("enrichMarkets", markets), timeout)
+        if isinstance(entries, list) and len(entries) == len(markets):
+            return entries
+        print("Market enrichment returned an unexpected shape, using markets as given")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"Market enrichment failed, using markets as given: {e}")
+    return [{"market": market, "polymarket": None} for market in markets]
+
+
+async def run_batch(
+    markets: List[Dict[str, Any]],
+    data: Optional[Dict[str, Any]] = None,
+    concurrency: int = BATCH_CONCURRENCY,
+    timeout: float = BATCH_TIMEOUT,
+    heartbeat: Optional[float] = None,
+    worker: DashboardWorker = decision_worker,
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Run one decision per market and yield a result item per market in
+    completion order: ``{"index", "market", "status", "result", "error", "elapsed_ms"}``
+    with status ``ok``, ``error`` or ``timeout``.
+
+    ``data`` (portfolio, sentiment, ...) is shared by every market. Markets
+    with a decision in the decision cache are answered from it, and a market
+    identical to a decision already running (single or batch) waits for that
+    run. Each run holds a ``decision_engine`` slot, so batches can't exceed
+    the process-wide limit. Markets still running when ``timeout`` expires
+    are cancelled and yielded as ``timeout``; the worker may still finish
+    (and store) them. With ``heartbeat`` set, None is yielded after that
+    many idle seconds.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    entries = await enrich_markets(markets, worker, timeout)
+    slots = asyncio.Semaphore(concurrency)
+    shared = data or {}
+
+    async def run_one(index: int, entry: Dict[str, Any]) -> Dict[str, Any]:
+        market = entry.get("market") or markets[index]
+        agent_data = {**shared, "marketData": market}
+        if entry.get("polymarket"):
+            agent_data["polymarket"] = entry["polymarket"]
+        item = {"index": index, "market": market, "status": "error", "result": None, "error": None}
+
+        # Keyed on the market as submitted, exactly as a single /decision request for it
+        # is, so batches and single requests share cached decisions and runs
+        request_data = {"market": markets[index], "data": shared}
+        key = decision_cache.key(request_data)
+        cached = await decision_cache.get(key)
+        if cached is not None:
+            return {**item, "status": "ok", "result": cached, "elapsed_ms": 0.0}
+
+        async def run(notify) -> Dict[str, Any]:
+            async with slots, decision_engine.slot(bounded=False):
+                # Live viewers follow every run through the debate hub, as for single decisions
+                run_id = debate_hub.begin({"market": market, "data": agent_data})
+                try:
+                    result = await worker.call("processDecision", market, agent_data)
+                except asyncio.CancelledError:
+                    debate_hub.finish(run_id, error="Batch timed out")
+                    raise
+                except Exception as e:
+                    debate_hub.finish(run_id, error=str(e) or type(e).__name__)
+                    raise
+            debate_hub.finish(run_id, result if isinstance(result, dict) else None)
+            result = await decision_cache.put(key, result)
+            if isinstance(result, dict) and result.get("status", "ok") == "ok":
+                # The engine stores each successful decision in Snowflake
+                notify_decision_written(result)
+            return result
+
+        started = time.perf_counter()
+        flight_key = decision_cache.request_key(request_data)
+        try:
+            if flight_key is None:
+                result = await run(lambda line: None)
+            else:
+                # A market already being decided (single request or another batch) shares that run
+                result = await decision_flights.do(flight_key, run)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            item["error"] = str(e) or type(e).__name__
+        else:
+            item["result"] = result
+            if isinstance(result, dict) and result.get("status", "ok") == "ok":
+                item["status"] = "ok"
+            else:
+                item["error"] = (result or {}).get("error") if isinstance(result, dict) else "Invalid engine response"
+        item["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return item
+
+    tasks = {asyncio.create_task(run_one(i, entry)): i for i, entry in enumerate(entries)}
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            wait = min(remaining, heartbeat) if heartbeat else remaining
+            done, pending = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+            if not done and heartbeat and deadline - loop.time() > 0:
+                yield None
+            for task in sorted(done, key=tasks.get):
+                yield task.result()
+    finally:
+        # Deadline passed or the caller went away: stop waiting on the rest, and let
+        # them unwind (debate hub, decision slots) before returning
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    for task in sorted(pending, key=tasks.get):
+        index = tasks[task]
+        yield {
+            "index": index,
+            "market": entries[index].get("market") or markets[index],
+            "status": "timeout",
+            "result": None,
+            "error": f"Batch timed out after {timeout:g} seconds",
+            "elapsed_ms": None,
+        }
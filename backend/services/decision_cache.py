@@ -0,0 +1,347 @@
+"""
+Content-addressed cache of decision engine results
+Keyed by a hash of the normalized request (market identity, bucketed price/volume, agent data), persisted to disk
+"""
+import asyncio
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev only
+    fcntl = None
+
+DECISION_CACHE_TTL = float(os.getenv("DECISION_CACHE_TTL", "900"))  # Seconds; 0 disables the cache
+DECISION_CACHE_SIZE = int(os.getenv("DECISION_CACHE_SIZE", "512"))
+# Prices within the same absolute bucket share a decision (Polymarket prices are 0-1 probabilities)
+DECISION_CACHE_PRICE_BUCKET = float(os.getenv("DECISION_CACHE_PRICE_BUCKET", "0.01"))
+# Volume and market cap span orders of magnitude, so they bucket by relative width
+DECISION_CACHE_VOLUME_TOLERANCE = float(os.getenv("DECISION_CACHE_VOLUME_TOLERANCE", "0.10"))
+
+KEY_VERSION = 2  # Bump when normalization changes so old entries stop matching
+
+
+def cache_path() -> Optional[Path]:
+    """
+    The cache file from DECISION_CACHE_PATH, or None to keep the cache in
+    memory (the default). Persisting is opt-in: the file is shared by every
+    process that points at it, so it should belong to one deployment.
+    """
+    path = os.getenv("DECISION_CACHE_PATH")
+    return Path(path) if path else None
+
+
+def price_bucket(value: Any, width: float) -> Optional[int]:
+    """
+    Index of the ``width``-wide bucket holding ``value``. The quotient is
+    rounded first so float error (0.29 / 0.01 == 28.999...) can't drop a
+    price into the bucket below.
+
+    >>> [price_bucket(p, 0.01) for p in (0.28, 0.29, 0.57, 0.58, 0.3)]
+    [28, 29, 57, 58, 30]
+    """
+    if not isinstance(value, (int, float)) or width <= 0:
+        return value
+    return math.floor(round(value / width, 9))
+
+
+def log_bucket(value: Any, tolerance: float) -> Optional[int]:
+    if not isinstance(value, (int, float)) or tolerance <= 0:
+        return value
+    if value <= 0:
+        return None
+    return math.floor(round(math.log(value) / math.log1p(tolerance), 9))
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds")
+
+
+def _parse_record(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        record = json.loads(line)
+        if isinstance(record["key"], str) and isinstance(record["stored_at"], (int, float)) and "result" in record:
+            return record
+    except (ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _dump_record(key: str, stored_at: float, result: Dict[str, Any]) -> bytes:
+    return (json.dumps({"key": key, "stored_at": stored_at, "result": result}, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class DecisionCache:
+    """
+    TTL + LRU map from request key to a successful engine result.
+
+    Two requests share a key when they name the same market (symbol and
+    whitespace/case-normalized question), their price falls in the same
+    ``price_bucket`` and volume / market cap within the same relative
+    ``volume_tolerance`` bucket, and their agent data (portfolio, sentiment,
+    ...) is identical. Requests without a market (engine auto-selection) are
+    never cached.
+
+    With a ``path`` every stored result is appended to a JSON-lines file.
+    Misses replay whatever was appended since the last read (everything, the
+    first time), so restarts and sibling workers reuse stored decisions. The
+    file is compacted when it holds mostly stale lines. File access (and
+    waiting on the inter-process lock) runs in worker threads; only the
+    event loop touches the in-memory entries.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DECISION_CACHE_TTL,
+        max_size: int = DECISION_CACHE_SIZE,
+        path: Optional[Path] = None,
+        price_bucket_width: float = DECISION_CACHE_PRICE_BUCKET,
+        volume_tolerance: float = DECISION_CACHE_VOLUME_TOLERANCE,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.path = path
+        self.price_bucket_width = price_bucket_width
+        self.volume_tolerance = volume_tolerance
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._offset = 0  # Bytes of the file already replayed
+        self._inode: Optional[int] = None  # Which file _offset refers to; compaction replaces it
+        self._lines = 0  # Lines in that file, for deciding when to compact
+        self._thread_lock = threading.Lock()
+        self._replay: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def normalize(self, request_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        The fields that decide a request's outcome, or None if it can't be cached.
+        """
+        market = request_data.get("market") or {}
+        symbol = str(market.get("symbol") or "").strip()
+        question = " ".join(str(market.get("question") or "").split()).lower()
+        if not symbol and not question:
+            return None
+        return {
+            "v": KEY_VERSION,
+            "buckets": [self.price_bucket_width, self.volume_tolerance],
+            "symbol": symbol,
+            "question": question,
+            "price": price_bucket(market.get("price"), self.price_bucket_width),
+            "volume24h": log_bucket(market.get("volume24h"), self.volume_tolerance),
+            "marketCap": log_bucket(market.get("marketCap"), self.volume_tolerance),
+            "data": request_data.get("data") or {},
+        }
+
+    def key(self, request_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Canonical hash of the normalized request, or None if it can't be cached.
+        """
+        if not self.enabled:
+            return None
+        return self.request_key(request_data)
+
+    def request_key(self, request_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Canonical hash of the normalized request whether or not caching is on
+        (None for auto-selection requests).
+        """
+        normalized = self.normalize(request_data)
+        if normalized is None:
+            return None
+        canonical = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+    async def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        The stored result for ``key`` with hit provenance, or None.
+        """
+        if key is None:
+            return None
+        entry = self._lookup(key)
+        if entry is None and self.path is not None:
+            # Another worker may have stored it since we last read the file
+            await self.replay()
+            entry = self._lookup(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        stored_at, result = entry
+        return {**result, "cache": self.provenance(key, stored_at, hit=True)}
+
+    async def put(self, key: Optional[str], result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a fresh result if it succeeded; returns it with miss provenance.
+        """
+        if not self.enabled or not isinstance(result, dict):
+            return result
+        stored_at = None
+        if key is not None and result.get("status", "ok") == "ok":
+            stored_at = time.time()
+            self._set(key, stored_at, result)
+            self.stores += 1
+            if self.path is not None:
+                await asyncio.to_thread(self._append, key, stored_at, result)
+        return {**result, "cache": self.provenance(key, stored_at, hit=False)}
+
+    async def replay(self):
+        """
+        Apply entries appended to the file since the last replay (all of them
+        the first time). Concurrent callers share one replay.
+        """
+        if self.path is None or not self.enabled:
+            return
+        task = self._replay
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._replay = asyncio.ensure_future(self._replay_appended())
+        # Shielded: lines already read must be applied even if this caller is cancelled
+        await asyncio.shield(task)
+
+    def provenance(self, key: Optional[str], stored_at: Optional[float], hit: bool) -> Dict[str, Any]:
+        return {
+            "hit": hit,
+            "key": key,
+            "cached_at": _iso(stored_at) if stored_at else None,
+            "age_seconds": round(time.time() - stored_at, 3) if stored_at else None,
+            "ttl_seconds": self.ttl,
+        }
+
+    def _lookup(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] + self.ttl < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _set(self, key: str, stored_at: float, result: Dict[str, Any]):
+        self._entries[key] = (stored_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _append(self, key: str, stored_at: float, result: Dict[str, Any]):
+        # Runs in a worker thread
+        line = _dump_record(key, stored_at, result)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._locked():
+                with open(self.path, "ab") as f:
+                    f.write(line)
+                    # Our own line needn't be replayed, if it directly follows what we've read
+                    if os.fstat(f.fileno()).st_ino == self._inode and f.tell() - len(line) == self._offset:
+                        self._offset = f.tell()
+                        self._lines += 1
+        except OSError as e:
+            print(f"Error persisting decision cache entry: {e}")
+
+    async def _replay_appended(self):
+        records = await asyncio.to_thread(self._read_appended, len(self._entries))
+        now = time.time()
+        for record in records:
+            if record["stored_at"] + self.ttl < now:
+                continue
+            current = self._entries.get(record["key"])
+            # Don't let an older line for the key overwrite a newer result
+            if current is None or current[0] < record["stored_at"]:
+                self._set(record["key"], record["stored_at"], record["result"])
+
+    def _read_appended(self, live: int) -> List[Dict[str, Any]]:
+        # Runs in a worker thread: reads lines appended since the last replay,
+        # the event loop applies them
+        if not self.path.exists():
+            return []
+        records = []
+        try:
+            with self._locked():
+                with open(self.path, "rb") as f:
+                    stat = os.fstat(f.fileno())
+                    if stat.st_ino != self._inode or stat.st_size < self._offset:
+                        # Replaced (compacted by another worker) or truncated: replay it from the start
+                        self._inode = stat.st_ino
+                        self._offset = 0
+                        self._lines = 0
+                    f.seek(self._offset)
+                    data = f.read()
+                complete = data.rfind(b"\n") + 1
+                self._offset += complete
+                lines = data[:complete].splitlines()
+                self._lines += len(lines)
+                records = [record for record in map(_parse_record, lines) if record is not None]
+                if self._lines > 2 * max(live, self.max_size // 4):
+                    self._compact()
+        except OSError as e:
+            print(f"Error loading decision cache: {e}")
+        return records
+
+    def _compact(self):
+        # Caller holds the file lock. Rewritten from the file rather than memory, so
+        # entries only a sibling worker has seen survive: newest live line per key,
+        # at most max_size keys.
+        latest: Dict[str, Tuple[float, bytes]] = {}
+        with open(self.path, "rb") as f:
+            for line in f:
+                record = _parse_record(line)
+                if record is not None and record["stored_at"] >= latest.get(record["key"], (0.0, b""))[0]:
+                    latest[record["key"]] = (record["stored_at"], line if line.endswith(b"\n") else line + b"\n")
+        cutoff = time.time() - self.ttl
+        kept = sorted(entry for entry in latest.values() if entry[0] >= cutoff)[-self.max_size:]
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            for _, line in kept:
+                f.write(line)
+            size = f.tell()
+        os.replace(tmp_path, self.path)
+        self._inode = os.stat(self.path).st_ino
+        self._offset = size
+        self._lines = len(kept)
+
+    @contextmanager
+    def _locked(self):
+        # Serialize file access between this process's threads and between worker processes
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(str(self.path) + ".lock", "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "name": "decisions",
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "path": str(self.path) if self.path else None,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+decision_cache = DecisionCache(path=cache_path())
@@ -0,0 +1,261 @@
+"""
+Async runner for the TypeScript decision engine
+Runs decisionService.ts without blocking the event loop, with bounded concurrency
+"""
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from services.cache import SingleFlight, notify_decision_written
+from services.decision_cache import decision_cache
+from services.debate_hub import debate_hub
+from services.metrics import track_upstream
+
+BACKEND_DIR = Path(__file__).parent.parent
+TS_SERVICE = BACKEND_DIR / "agent_engine" / "services" / "decisionService.ts"
+TS_SERVICE_JS = BACKEND_DIR / "dist" / "agent_engine" / "services" / "decisionService.js"
+
+# How many decision pipelines may run at once, and how many may wait for a slot
+MAX_CONCURRENT_DECISIONS = int(os.getenv("MAX_CONCURRENT_DECISIONS", "4"))
+MAX_QUEUED_DECISIONS = int(os.getenv("MAX_QUEUED_DECISIONS", "32"))
+
+JS_TIMEOUT = 60
+TS_NODE_TIMEOUT = 120  # Full pipeline under ts-node is slower
+
+# The final JSON line (full conversation logs) can be far above asyncio's 64 KiB default
+STREAM_LIMIT = 16 * 1024 * 1024
+
+# Receives each "[DecisionService] ..." log line while a pipeline runs
+ProgressCallback = Callable[[str], None]
+
+
+class DecisionEngineBusy(Exception):
+    """Raised when the decision queue is full."""
+
+
+class DecisionEngine:
+    """
+    Runs the decision pipeline as an async subprocess.
+
+    At most ``max_concurrency`` pipelines run at once in the process, whether
+    here or in the batch decision worker (see ``slot``); up to ``max_queue``
+    further callers wait in FIFO order for a slot and anything beyond that is
+    rejected with ``DecisionEngineBusy``.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_DECISIONS, max_queue: int = MAX_QUEUED_DECISIONS):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.queued = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self.in_flight = 0
+            self.queued = 0
+        return self._slots
+
+    @asynccontextmanager
+    async def slot(self, bounded: bool = True) -> AsyncIterator[None]:
+        """
+        Hold one of the process-wide pipeline slots. Every decision run takes
+        one, so the limit holds across single requests and batches. With
+        ``bounded`` unset the caller waits even when the queue is full (batches
+        bound their own waiters).
+        """
+        slots = self._semaphore()
+        if bounded and slots.locked() and self.queued >= self.max_queue:
+            raise DecisionEngineBusy(
+                f"Decision engine busy: {self.in_flight} running, {self.queued} queued"
+            )
+
+        self.queued += 1
+        try:
+            await slots.acquire()
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            slots.release()
+
+    async def run(self, request_data: Dict[str, Any], on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """
+        Run one decision request through the TypeScript engine.
+        """
+        async with self.slot():
+            # Live viewers follow every run through the debate hub
+            run_id = debate_hub.begin(request_data)
+
+            def report(line: str):
+                debate_hub.progress(run_id, line)
+                if on_progress:
+                    on_progress(line)
+
+            try:
+                result = await self._execute(json.dumps(request_data).encode("utf-8"), report)
+            except BaseException as e:
+                debate_hub.finish(run_id, error=str(e) or type(e).__name__)
+                raise
+        debate_hub.finish(run_id, result if isinstance(result, dict) else None)
+
+        # The engine stores each successful decision in Snowflake
+        if isinstance(result, dict) and result.get("status", "ok") == "ok":
+            notify_decision_written(result)
+        return result
+
+    async def _execute(self, request_json: bytes, on_progress: Optional[ProgressCallback]) -> Dict[str, Any]:
+        # Try compiled JavaScript first
+        if TS_SERVICE_JS.exists():
+            try:
+                async with track_upstream("decision_engine", "node") as call:
+                    returncode, stdout, _ = await run_subprocess(
+                        ["node", str(TS_SERVICE_JS)], request_json, JS_TIMEOUT, on_progress
+                    )
+                    if returncode == 0:
+                        return parse_json_output(stdout)
+                    call.outcome = "nonzero_exit"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error running compiled JS: {e}")
+
+        # Fall back to ts-node
+        async with track_upstream("decision_engine", "ts-node") as call:
+            try:
+                returncode, stdout, stderr = await run_subprocess(
+                    ["npx", "ts-node", "--project", "tsconfig.json", str(TS_SERVICE)],
+                    request_json,
+                    TS_NODE_TIMEOUT,
+                    on_progress,
+                )
+            except FileNotFoundError:
+                raise Exception(
+                    "TypeScript service not available. Please install dependencies:\n"
+                    "  cd backend && npm install\n"
+                    "Then either compile: npm run build\n"
+                    "Or ensure ts-node is available: npm install -g ts-node"
+                )
+            except asyncio.TimeoutError:
+                call.outcome = "timeout"
+                raise Exception(f"TypeScript service timed out after {TS_NODE_TIMEOUT} seconds")
+
+            if returncode != 0:
+                call.outcome = "nonzero_exit"
+                error_msg = stderr or stdout or "Unknown error"
+                raise Exception(f"ts-node error: {error_msg}")
+
+            # Log stderr for debugging (contains console.log output)
+            if stderr:
+                print(f"[TypeScript] Logs: {stderr[:500]}")  # First 500 chars of logs
+
+            try:
+                return parse_json_output(stdout)
+            except json.JSONDecodeError as e:
+                call.outcome = "json_error"
+                raise Exception(f"Invalid response from TypeScript service: {e}")
+
+
+async def run_subprocess(
+    cmd: List[str],
+    input_data: bytes,
+    timeout: float,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Tuple[int, str, str]:
+    """
+    Run a command asynchronously, feeding it stdin and collecting stdout/stderr.
+    Output is read line by line so engine log lines can be reported as progress.
+    The process is killed on timeout or if the awaiting task is cancelled.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=str(BACKEND_DIR),
+        limit=STREAM_LIMIT,
+    )
+
+    async def feed():
+        process.stdin.write(input_data)
+        await process.stdin.drain()
+        process.stdin.close()
+
+    async def collect(stream: asyncio.StreamReader) -> str:
+        lines = []
+        async for raw in stream:
+            line = raw.decode("utf-8", "replace")
+            lines.append(line)
+            if on_progress and line.startswith("[DecisionService]"):
+                on_progress(line.strip())
+        return "".join(lines)
+
+    async def communicate():
+        _, stdout, stderr = await asyncio.gather(feed(), collect(process.stdout), collect(process.stderr))
+        await process.wait()
+        return stdout, stderr
+
+    try:
+        stdout, stderr = await asyncio.wait_for(communicate(), timeout)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    return process.returncode, stdout, stderr
+
+
+def parse_json_output(stdout: str) -> Any:
+    """
+    Parse the engine's JSON result, skipping any stray log lines before it.
+    """
+    # Find the last line that looks like JSON (in case there are any stray logs)
+    for line in reversed(stdout.strip().split('\n')):
+        line = line.strip()
+        if line and (line.startswith('{') or line.startswith('[')):
+            return json.loads(line)
+    # Fallback: try parsing entire stdout
+    return json.loads(stdout.strip())
+
+
+decision_engine = DecisionEngine()
+decision_flights = SingleFlight("decisions")
+
+
+async def call_typescript_service(
+    request_data: Dict[str, Any],
+    on_progress: Optional[ProgressCallback] = None,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    Call the TypeScript decision service without blocking the event loop.
+    Tries compiled JS first, then falls back to ts-node.
+    Repeat requests are served from the decision cache unless ``refresh`` is
+    set; results carry cache provenance under "cache". Concurrent identical
+    requests share one engine run (see SingleFlight).
+    """
+    key = decision_cache.key(request_data)
+    cached = None if refresh else await decision_cache.get(key)
+    if cached is not None:
+        if on_progress:
+            on_progress(f"[DecisionCache] Served cached decision {cached.get('decision_id')}")
+        return cached
+
+    async def run(notify: ProgressCallback) -> Dict[str, Any]:
+        return await decision_cache.put(key, await decision_engine.run(request_data, notify))
+
+    # Identical requests arriving while one runs wait for it instead of starting their own
+    flight_key = decision_cache.request_key(request_data)
+    if flight_key is None:
+        return await run(on_progress or (lambda line: None))
+    return await decision_flights.do(flight_key, run, on_progress)
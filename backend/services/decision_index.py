@@ -0,0 +1,64 @@
+"""
+Local id -> decision index
+Decisions are insert-only, so once seen a decision can be served by id from memory
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+from services.dashboard_worker import cached_dashboard_call
+
+
+class DecisionIndex:
+    """
+    Bounded LRU map from decision id to decision record.
+
+    Filled from every decision list the API fetches; misses fall through to a
+    primary-key query in Snowflake, so lookups don't depend on the decision
+    being among the most recent rows.
+    """
+
+    def __init__(self, max_size: int = 5000):
+        self.max_size = max_size
+        self._decisions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._decisions)
+
+    def add(self, decision: Dict[str, Any]):
+        decision_id = decision.get("id")
+        if not decision_id:
+            return
+        self._decisions[decision_id] = decision
+        self._decisions.move_to_end(decision_id)
+        if len(self._decisions) > self.max_size:
+            self._decisions.popitem(last=False)
+
+    def add_many(self, decisions: Iterable[Dict[str, Any]]):
+        for decision in decisions:
+            if isinstance(decision, dict):
+                self.add(decision)
+
+    def get(self, decision_id: str) -> Optional[Dict[str, Any]]:
+        decision = self._decisions.get(decision_id)
+        if decision is not None:
+            self._decisions.move_to_end(decision_id)
+        return decision
+
+    async def lookup(self, decision_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a decision by id from the index, or fetch it by primary key.
+        Returns None if no such decision exists; upstream errors propagate.
+        """
+        decision = self.get(decision_id)
+        if decision is not None:
+            return decision
+
+        decision = await cached_dashboard_call("getDecisionById", decision_id)
+        if decision:
+            self.add(decision)
+        return decision or None
+
+    def clear(self):
+        self._decisions.clear()
+
+
+decision_index = DecisionIndex()
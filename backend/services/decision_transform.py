@@ -0,0 +1,147 @@
+"""
+Decision -> proposal transformation
+Single shared mapping from Snowflake decision rows to the frontend Proposal shape
+"""
+import json
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SUMMARY_LIMIT = 200  # Governance list view truncates long reasoning
+
+# Decisions are insert-only, so a transformed decision never goes stale
+_MEMO_SIZE = 5000
+_memo: "OrderedDict[Tuple[str, bool], Dict[str, Any]]" = OrderedDict()
+
+
+def parse_agent_outputs(value: Any) -> List[Dict[str, Any]]:
+    """
+    Return agent outputs as a list, decoding the VARIANT JSON string if needed.
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return value if isinstance(value, list) else []
+
+
+def average_confidence(agent_outputs: List[Dict[str, Any]]) -> float:
+    if not agent_outputs:
+        return 0
+    total = sum((agent.get("decision") or {}).get("confidence", 0) for agent in agent_outputs)
+    return total / len(agent_outputs)
+
+
+def _build(decision: Dict[str, Any], detailed: bool) -> Dict[str, Any]:
+    agent_outputs = parse_agent_outputs(decision.get("agent_outputs"))
+    direction = decision.get("final_direction", "NO")
+    reasoning = decision.get("consensus_reasoning") or ""
+    summary = reasoning
+    if not detailed and len(reasoning) > SUMMARY_LIMIT:
+        summary = reasoning[:SUMMARY_LIMIT] + "..."
+
+    proposal = {
+        "id": decision.get("id", ""),
+        "market": decision.get("market_question", decision.get("market_id", "Unknown Market")),
+        "direction": "LONG" if direction == "YES" else "SHORT",
+        "positionSize": f"${decision.get('final_size') or 0:,.0f}",
+        "riskScore": 5.0,  # Could be calculated from agent outputs
+        "confidence": int(average_confidence(agent_outputs)),
+        "status": "APPROVED" if direction == "YES" else "REJECTED",
+        "summary": summary,
+        "timestamp": decision.get("created_at", datetime.now().isoformat()),
+        "dataSources": [f"https://polymarket.com/event/{decision.get('market_id', '')}"],
+        "betStatus": "OPEN",  # Default, could be determined from market data
+        "betResult": None,
+        "closedAt": None,
+        "vote": direction,
+    }
+
+    if detailed:
+        # Additional fields for enhanced display
+        proposal.update({
+            "decision_id": decision.get("id"),
+            "agent_analysis": agent_outputs,
+            "investment_summary": reasoning,
+            "conversation_logs": {
+                "initial_decisions": agent_outputs,
+                "final_decisions": agent_outputs,
+            },
+        })
+    return proposal
+
+
+def decision_to_proposal(decision: Dict[str, Any], detailed: bool = False) -> Dict[str, Any]:
+    """
+    Transform one decision row, memoized per decision id.
+    ``detailed`` adds the agent analysis and conversation log fields and keeps
+    the full reasoning as the summary.
+    The returned dict is shared between requests and must not be mutated.
+    """
+    decision_id = decision.get("id")
+    if not decision_id:
+        return _build(decision, detailed)
+
+    key = (decision_id, detailed)
+    proposal = _memo.get(key)
+    if proposal is None:
+        proposal = _build(decision, detailed)
+        _memo[key] = proposal
+        if len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+    else:
+        _memo.move_to_end(key)
+    return proposal
+
+
+def decisions_to_proposals(
+    decisions: Iterable[Dict[str, Any]],
+    detailed: bool = False,
+    status: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Transform a batch of decision rows in a single pass, optionally keeping
+    only proposals with the given status.
+    """
+    proposals = []
+    for decision in decisions:
+        if not isinstance(decision, dict):
+            continue
+        proposal = decision_to_proposal(decision, detailed)
+        if status is None or proposal["status"] == status:
+            proposals.append(proposal)
+    return proposals
+
+
+def clear_memo():
+    _memo.clear()
+
+
+def build_debate_transcript(proposal_id: str, decision: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a decision's agent outputs into debate messages.
+    Uses the initial/final rounds from conversation_logs when present,
+    otherwise the stored agent_outputs as a single round.
+    """
+    logs = decision.get("conversation_logs") or {}
+    if logs:
+        rounds = [logs.get("initial_decisions") or [], logs.get("final_decisions") or []]
+    else:
+        rounds = [parse_agent_outputs(decision.get("agent_outputs"))]
+
+    timestamp = datetime.now().strftime("%H:%M:%S")
+    messages = []
+    for agents in rounds:
+        for agent in agents:
+            if not isinstance(agent, dict):
+                continue
+            agent_decision = agent.get("decision") or {}
+            messages.append({
+                "agent": agent.get("agent") or "Unknown",
+                "message": agent_decision.get("reasoning") or "",
+                "timestamp": timestamp,
+                "vote": agent_decision.get("direction") or "NO"
+            })
+
+    return {"proposalId": proposal_id, "messages": messages}
@@ -0,0 +1,211 @@
+"""
+Conditional GET and response compression
+Strong ETags / 304s for read endpoints, gzip or brotli above a size threshold
+"""
+import gzip
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from services.serialization import dump_json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MINIMUM_SIZE = 1024  # Smaller bodies aren't worth compressing
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # Per-request; prepared responses use the maximum
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def version_etag(*parts: Any) -> str:
+    """
+    Strong ETag from a version stamp (e.g. a cache generation and the query),
+    for routes that can tell the body is unchanged without hashing it.
+    """
+    return make_etag(repr(parts).encode("utf-8"))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches ``etag`` (in any content encoding).
+    """
+    if not if_none_match:
+        return False
+    base = _strip_encoding(etag)
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if _strip_encoding(candidate) == base:
+            return True
+    return False
+
+
+def _strip_encoding(etag: str) -> str:
+    # "<hash>-gzip" and "<hash>-br" are the encoded representations of "<hash>"
+    for suffix in ('-gzip"', '-br"'):
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def _encoded_etag(etag: str, encoding: str) -> str:
+    return etag[:-1] + f'-{encoding}"' if etag.endswith('"') else etag
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Preferred encoding the client accepts: brotli (if installed), then gzip.
+    """
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(name)
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=9 if best else GZIP_LEVEL)
+
+
+class PreparedResponse:
+    """
+    JSON payload serialized, hashed and compressed once, for data that never
+    changes while the process runs (persona lists and the like).
+    """
+
+    def __init__(self, data: Any, minimum_size: int = MINIMUM_SIZE):
+        self.body = dump_json(data)
+        self.etag = make_etag(self.body)
+        self.encoded: Dict[str, bytes] = {}
+        if len(self.body) >= minimum_size:
+            self.encoded["gzip"] = compress(self.body, "gzip", best=True)
+            if brotli is not None:
+                self.encoded["br"] = compress(self.body, "br", best=True)
+
+    def respond(self, request: Request) -> Response:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        body = self.encoded.get(encoding) if encoding else None
+        headers = {"ETag": self.etag, "Vary": "Accept-Encoding"}
+        if body is not None:
+            headers["ETag"] = _encoded_etag(self.etag, encoding)
+            headers["Content-Encoding"] = encoding
+
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            headers.pop("Content-Encoding", None)
+            return Response(status_code=304, headers=headers)
+        if body is None:
+            return Response(content=self.body, headers=headers, media_type="application/json")
+        return Response(content=body, headers=headers, media_type="application/json")
+
+
+class HTTPCacheMiddleware:
+    """
+    ASGI middleware for GET responses: adds a strong ETag (hashing the body
+    unless the route already set one), answers a matching If-None-Match with
+    304, and compresses bodies of at least ``minimum_size`` bytes.
+
+    Streamed responses (SSE, chunked bodies) and non-200 responses pass
+    through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        accept_encoding = request_headers.get("accept-encoding", "")
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            content_type = headers.get("content-type", "")
+            if (
+                start["status"] != 200
+                or message.get("more_body", False)
+                or content_type.startswith("text/event-stream")
+            ):
+                # Errors and streams go out as they are
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            await self._finish(start, headers, message.get("body", b""), if_none_match, accept_encoding, send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _finish(
+        self,
+        start: Message,
+        headers: MutableHeaders,
+        body: bytes,
+        if_none_match: Optional[str],
+        accept_encoding: str,
+        send: Send,
+    ):
+        encoding = None
+        if (
+            "content-encoding" not in headers
+            and len(body) >= self.minimum_size
+            and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        ):
+            headers.add_vary_header("Accept-Encoding")
+            encoding = choose_encoding(accept_encoding)
+
+        etag = headers.get("etag") or make_etag(body)
+        if encoding:
+            etag = _encoded_etag(etag, encoding)
+        headers["etag"] = etag
+
+        if etag_matches(if_none_match, etag):
+            not_modified = MutableHeaders()
+            for name in ("etag", "vary", "cache-control"):
+                if name in headers:
+                    not_modified[name] = headers[name]
+            await send({"type": "http.response.start", "status": 304, "headers": not_modified.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if encoding:
+            body = compress(body, encoding)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+
+        await send(start)
+        await send({"type": "http.response.body", "body": body})
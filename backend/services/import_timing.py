@@ -0,0 +1,128 @@
+"""
+Import-time accounting for cold starts
+Times every module imported while active, so the serverless handler's startup can be budgeted
+"""
+import os
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from typing import Any, Dict, List, Optional
+
+# Cold-start budget for the Mangum handler's imports; 0 disables the check
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "0"))
+
+
+class _TimedLoader:
+    """
+    Proxy around a module loader that times ``exec_module``.
+    """
+
+    def __init__(self, loader: Any, timer: "ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer._enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._exit(module.__name__)
+
+
+class ImportTimer(MetaPathFinder):
+    """
+    Records inclusive and self time (ms) for each module imported between
+    ``start()`` and ``stop()``, like ``python -X importtime`` but available at
+    runtime (e.g. inside a Vercel function) and reportable as JSON.
+    """
+
+    def __init__(self):
+        self.modules: Dict[str, Dict[str, float]] = {}
+        self.started_at: Optional[float] = None
+        self.total_ms = 0.0
+        self._stack: List[List[float]] = []  # [start, time spent in child imports]
+        self._finding = False
+
+    def start(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        self.started_at = time.perf_counter()
+
+    def stop(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        if self.started_at is not None:
+            self.total_ms += (time.perf_counter() - self.started_at) * 1000
+            self.started_at = None
+
+    def find_spec(self, fullname, path, target=None):
+        if self._finding:
+            return None
+        # Let the real finders locate the module, then time its loader
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _enter(self):
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _exit(self, name: str):
+        started, children = self._stack.pop()
+        inclusive = (time.perf_counter() - started) * 1000
+        if self._stack:
+            self._stack[-1][1] += inclusive
+        self.modules[name] = {"inclusive_ms": inclusive, "self_ms": inclusive - children}
+
+    def report(self, top: int = 25, budget_ms: float = IMPORT_BUDGET_MS) -> Dict[str, Any]:
+        """
+        Total import time, the slowest modules, and self time summed per
+        top-level package.
+        """
+        packages: Dict[str, float] = {}
+        for name, timing in self.modules.items():
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0.0) + timing["self_ms"]
+        slowest = sorted(self.modules.items(), key=lambda item: item[1]["inclusive_ms"], reverse=True)
+        return {
+            "total_ms": round(self.total_ms, 2),
+            "budget_ms": budget_ms or None,
+            "over_budget": bool(budget_ms) and self.total_ms > budget_ms,
+            "module_count": len(self.modules),
+            "packages": {
+                package: round(ms, 2)
+                for package, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)
+            },
+            "slowest": [
+                {"module": name, "inclusive_ms": round(t["inclusive_ms"], 2), "self_ms": round(t["self_ms"], 2)}
+                for name, t in slowest[:top]
+            ],
+        }
+
+    def summary(self, top: int = 5) -> str:
+        report = self.report(top)
+        packages = ", ".join(f"{name} {ms:.0f}ms" for name, ms in list(report["packages"].items())[:top])
+        line = f"Startup imports: {report['total_ms']:.0f}ms across {report['module_count']} modules ({packages})"
+        if report["over_budget"]:
+            line += f" - OVER BUDGET of {report['budget_ms']:.0f}ms"
+        return line
+
+
+import_timer = ImportTimer()
@@ -0,0 +1,214 @@
+"""
+In-process job queue for long-running work
+Jobs are submitted, run by a worker pool in priority order, and polled or streamed
+"""
+import asyncio
+import itertools
+import json
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+TERMINAL_STATES = (COMPLETED, FAILED)
+
+# Handler signature: (payload, report_progress) -> result
+JobHandler = Callable[[Any, Callable[[str], None]], Awaitable[Any]]
+
+
+class JobQueueFull(Exception):
+    """Raised when no more jobs can be accepted."""
+
+
+class Job:
+    """
+    A single unit of work and everything observers need to follow it.
+    """
+
+    MAX_EVENTS = 200
+
+    def __init__(self, payload: Any, priority: int = 0):
+        self.id = str(uuid.uuid4())
+        self.payload = payload
+        self.priority = priority
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=self.MAX_EVENTS)
+        self._subscribers: List[asyncio.Queue] = []
+        self._emit("status", QUEUED)
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATES
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def progress(self, message: str):
+        self._emit("progress", message)
+
+    def set_status(self, status: str):
+        self.status = status
+        self._emit("status", status)
+
+    def _emit(self, kind: str, data: Any):
+        event = {"event": kind, "data": data, "timestamp": time.time()}
+        self.events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": [e["data"] for e in self.events if e["event"] == "progress"],
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Priority queue plus a pool of worker tasks.
+
+    Lower ``priority`` values run first; equal priorities run in submission
+    order. Finished jobs are kept for ``result_ttl`` seconds and at most
+    ``max_jobs`` jobs are tracked, evicting the oldest finished ones first.
+    """
+
+    def __init__(self, handler: JobHandler, workers: int = 4, result_ttl: float = 3600, max_jobs: int = 1000):
+        self.handler = handler
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.max_jobs = max_jobs
+        self.jobs: Dict[str, Job] = {}
+        self._seq = itertools.count()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_workers(self):
+        # Workers start on first use so this also works with lifespan="off"
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.PriorityQueue()
+            self._worker_tasks = []
+            for job in self.jobs.values():
+                if job.status == QUEUED:
+                    self._queue.put_nowait((job.priority, next(self._seq), job.id))
+        self._worker_tasks = [t for t in self._worker_tasks if not t.done()]
+        while len(self._worker_tasks) < self.workers:
+            self._worker_tasks.append(asyncio.create_task(self._worker()))
+
+    def submit(self, payload: Any, priority: int = 0) -> Job:
+        """
+        Queue a job and return it immediately.
+        """
+        self._ensure_workers()
+        self.evict()
+        if len(self.jobs) >= self.max_jobs:
+            raise JobQueueFull(f"Job queue full ({len(self.jobs)} jobs tracked)")
+
+        job = Job(payload, priority)
+        self.jobs[job.id] = job
+        self._queue.put_nowait((priority, next(self._seq), job.id))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self.evict()
+        return self.jobs.get(job_id)
+
+    def evict(self):
+        """
+        Drop expired results, then the oldest finished jobs if over capacity.
+        """
+        now = time.time()
+        finished = sorted(
+            (job for job in self.jobs.values() if job.done),
+            key=lambda job: job.finished_at,
+        )
+        for job in finished:
+            expired = now - job.finished_at > self.result_ttl
+            if expired or len(self.jobs) >= self.max_jobs:
+                del self.jobs[job.id]
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                continue
+
+            job.started_at = time.time()
+            job.set_status(RUNNING)
+            try:
+                job.result = await self.handler(job.payload, job.progress)
+                job.finished_at = time.time()
+                job.set_status(COMPLETED)
+            except asyncio.CancelledError:
+                job.error = "Job cancelled"
+                job.finished_at = time.time()
+                job.set_status(FAILED)
+                raise
+            except Exception as e:
+                job.error = str(e)
+                job.finished_at = time.time()
+                job.set_status(FAILED)
+
+
+async def stream_job_events(job: Job, keepalive: float = 15.0) -> AsyncIterator[str]:
+    """
+    Yield a job's events as Server-Sent Events until it finishes.
+    Past events are replayed first so late subscribers see the full history.
+    """
+    history = list(job.events)
+    queue = job.subscribe()
+    try:
+        for event in history:
+            yield format_sse(event)
+        if job.done:
+            yield format_sse({"event": "result", "data": job.to_dict()})
+            return
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(event)
+            if event["event"] == "status" and event["data"] in TERMINAL_STATES:
+                yield format_sse({"event": "result", "data": job.to_dict()})
+                return
+    finally:
+        job.unsubscribe(queue)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
@@ -0,0 +1,88 @@
+"""
+Deferred router registration for serverless cold starts
+Routers are imported and mounted on the first request under their prefix instead of at startup
+"""
+import importlib
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Opt-in; the Vercel handler (api/index.py) turns it on for cold starts
+LAZY_ROUTERS = os.getenv("LAZY_ROUTERS", "").lower() in ("1", "true", "yes")
+
+# Paths that need every route mounted (the OpenAPI schema lists them all)
+LOAD_ALL_PATHS = ("/docs", "/redoc", "/openapi.json")
+
+
+class RouterRegistry:
+    """
+    Router modules with the prefix/tags they are mounted under.
+
+    Entries are mounted in registration order; entries sharing a prefix are
+    always mounted together so their relative route order stays the same as
+    with eager registration.
+    """
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self.entries: List[Tuple[str, str, List[str]]] = []
+        self.loaded: set = set()
+        self.load_ms: Dict[str, float] = {}
+
+    def add(self, module: str, prefix: str, tags: List[str]):
+        self.entries.append((module, prefix, tags))
+
+    def match(self, path: str) -> List[Tuple[str, str, List[str]]]:
+        return [
+            entry for entry in self.entries
+            if path == entry[1] or path.startswith(entry[1] + "/")
+        ]
+
+    def load(self, entries: Optional[List[Tuple[str, str, List[str]]]] = None):
+        """
+        Import and mount ``entries`` (default: all) that aren't mounted yet.
+        """
+        for entry in self.entries if entries is None else entries:
+            module_name, prefix, tags = entry
+            key = f"{module_name}:{prefix}"
+            if key in self.loaded:
+                continue
+            started = time.perf_counter()
+            module = importlib.import_module(f"routers.{module_name}")
+            self.app.include_router(module.router, prefix=prefix, tags=tags)
+            self.load_ms[key] = round((time.perf_counter() - started) * 1000, 2)
+            self.loaded.add(key)
+            # Regenerate /openapi.json with the new routes
+            self.app.openapi_schema = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "registered": len(self.entries),
+            "loaded": len(self.loaded),
+            "load_ms": dict(self.load_ms),
+        }
+
+
+class LazyRouterMiddleware:
+    """
+    ASGI middleware that mounts the routers a request needs before routing it.
+    """
+
+    def __init__(self, app: ASGIApp, registry: RouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            root_path = scope.get("root_path", "")
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path):]
+            if path in LOAD_ALL_PATHS:
+                self.registry.load()
+            else:
+                self.registry.load(self.registry.match(path))
+        await self.app(scope, receive, send)
@@ -0,0 +1,341 @@
+"""
+In-process metrics with Prometheus text export
+Per-route latency histograms, in-flight gauges and upstream (Node/Snowflake) call outcomes
+"""
+import asyncio
+import bisect
+import json
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Seconds; decision runs can take up to the ts-node timeout
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+QUANTILES = (0.5, 0.95, 0.99)
+WINDOW_SIZE = 1024  # Recent observations kept per series for exact quantiles
+
+UPSTREAM_OUTCOMES = ("success", "timeout", "nonzero_exit", "json_error", "error")
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """
+    A named metric family with a fixed set of label names.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def total(self) -> float:
+        return sum(self._values.values())
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: Any):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any):
+        self._values[self._key(labels)] = value
+
+
+def _nearest_rank(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _HistogramSeries:
+    def __init__(self, bucket_count: int, window_size: int):
+        self.counts = [0] * (bucket_count + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.window: Deque[float] = deque(maxlen=window_size)
+
+
+class Histogram(Metric):
+    """
+    Cumulative-bucket histogram (Prometheus ``histogram``). Each series also
+    keeps its last ``window_size`` observations, exported as exact p50/p95/p99
+    under ``<name>_window``.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        window_size: int = WINDOW_SIZE,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.window_size = window_size
+        self._series: Dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: Any):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _HistogramSeries(len(self.buckets), self.window_size)
+        series.counts[bisect.bisect_left(self.buckets, value)] += 1
+        series.sum += value
+        series.count += 1
+        series.window.append(value)
+
+    def quantile(self, q: float, **labels: Any) -> Optional[float]:
+        """
+        Exact ``q`` quantile of the series' recent observations (None if empty).
+        """
+        series = self._series.get(self._key(labels))
+        if series is None or not series.window:
+            return None
+        return _nearest_rank(sorted(series.window), q)
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(self._key(labels))
+        return series.count if series else 0
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        window_lines = [
+            f"# HELP {self.name}_window {self.help} (quantiles over the last {self.window_size} observations)",
+            f"# TYPE {self.name}_window gauge",
+        ]
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series.sum)}")
+            lines.append(f"{self.name}_count{labels} {series.count}")
+
+            ordered = sorted(series.window)
+            for q in QUANTILES:
+                value = _nearest_rank(ordered, q)
+                quantile = f'quantile="{q}"'
+                window_lines.append(
+                    f"{self.name}_window{_format_labels(self.labelnames, key, quantile)} {_format_value(value)}"
+                )
+        return lines + window_lines
+
+
+class MetricsRegistry:
+    """
+    Metric families in registration order, rendered together for /metrics.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), **kwargs: Any) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, **kwargs))
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format (version 0.0.4).
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+)
+HTTP_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds", ("method", "route")
+)
+HTTP_IN_FLIGHT = metrics.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ("method", "route")
+)
+UPSTREAM_CALLS = metrics.counter(
+    "upstream_calls_total", "Calls to upstream services by outcome", ("service", "operation", "outcome")
+)
+UPSTREAM_DURATION = metrics.histogram(
+    "upstream_call_duration_seconds", "Upstream call latency in seconds", ("service", "operation")
+)
+SINGLE_FLIGHT_CALLS = metrics.counter(
+    "single_flight_calls_total",
+    "Calls through single-flight groups: leaders run, followers are coalesced onto a leader's run",
+    ("group", "role"),
+)
+FALLBACK_RESPONSES = metrics.counter(
+    "fallback_responses_total",
+    "Responses served from mock data because the real source failed",
+    ("route", "reason"),
+)
+
+
+def classify_exception(error: BaseException) -> str:
+    """
+    Upstream outcome for a failed call. Exceptions may declare their own
+    with an ``outcome`` attribute.
+    """
+    outcome = getattr(error, "outcome", None)
+    if outcome in UPSTREAM_OUTCOMES:
+        return outcome
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return "timeout"
+    if isinstance(error, json.JSONDecodeError):
+        return "json_error"
+    return "error"
+
+
+class UpstreamCall:
+    """
+    Handle for one tracked upstream call; set ``outcome`` to record a failure
+    that didn't raise (e.g. a nonzero exit that falls back to another path).
+    """
+
+    def __init__(self):
+        self.outcome: Optional[str] = "success"
+
+
+@asynccontextmanager
+async def track_upstream(service: str, operation: str = "") -> AsyncIterator[UpstreamCall]:
+    """
+    Time an upstream call and count it by outcome. Exceptions are classified
+    (unless the caller set an outcome first) and re-raised; a cancelled
+    caller isn't counted.
+    """
+    call = UpstreamCall()
+    started = time.perf_counter()
+    try:
+        yield call
+    except asyncio.CancelledError:
+        call.outcome = None
+        raise
+    except BaseException as e:
+        # An outcome the caller already set (e.g. nonzero_exit) wins over the exception type
+        if call.outcome == "success":
+            call.outcome = classify_exception(e)
+        raise
+    finally:
+        if call.outcome is not None:
+            UPSTREAM_DURATION.observe(time.perf_counter() - started, service=service, operation=operation)
+            UPSTREAM_CALLS.inc(service=service, operation=operation, outcome=call.outcome)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    The matched route's path template (e.g. ``/api/agents/debate/{proposal_id}``),
+    so label cardinality stays bounded; ``unmatched`` for 404s.
+    """
+    app = scope.get("app")
+    partial = None
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency and in-flight requests
+    per route. Event streams are counted but kept out of the latency histogram.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status = 500
+        streaming = False
+
+        async def send_wrapper(message: Message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == b"content-type" and value.startswith(b"text/event-stream"):
+                        streaming = True
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method=method, route=route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec(method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
+            if not streaming:
+                HTTP_DURATION.observe(time.perf_counter() - started, method=method, route=route)
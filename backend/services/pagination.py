@@ -0,0 +1,33 @@
+"""
+Opaque cursor tokens for keyset pagination
+A cursor records the sort key (timestamp, id) of the last item on a page
+"""
+import base64
+import json
+from typing import Any, Dict, Optional
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded."""
+
+
+def encode_cursor(source: str, timestamp: Any, item_id: str) -> str:
+    payload = json.dumps({"s": source, "t": timestamp, "id": item_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a cursor token into {"s": source, "t": timestamp, "id": id}.
+    Returns None for an empty token.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        cursor = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise InvalidCursor("Malformed cursor")
+    if not isinstance(cursor, dict) or not {"s", "t", "id"} <= cursor.keys():
+        raise InvalidCursor("Malformed cursor")
+    return cursor
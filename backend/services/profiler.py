@@ -0,0 +1,297 @@
+"""
+On-demand sampling profiler for individual requests
+Opt in per request with a signed X-Profile header, or profile a sampled percentage of requests
+"""
+import hashlib
+import hmac
+import itertools
+import os
+import random
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Signs X-Profile tokens (see sign_token); without it only sampling can trigger a profile
+# and the admin endpoints are disabled
+PROFILER_SECRET = os.getenv("PROFILER_SECRET", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # 0.0 - 1.0
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "20"))
+PROFILE_MAX_SECONDS = 30.0  # Sampling stops here, e.g. for long-lived streams
+
+PROFILE_HEADER = "x-profile"
+ADMIN_PREFIX = "/api/admin/"
+
+STDLIB_DIR = sysconfig.get_paths()["stdlib"] + os.sep
+
+Frame = Tuple[str, str, int]  # function, file, first line
+
+
+def _signature(secret: str, expires: int) -> str:
+    return hmac.new(secret.encode("utf-8"), f"profile:{expires}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def sign_token(ttl: int = 300, secret: Optional[str] = None) -> str:
+    """
+    An X-Profile token valid for ``ttl`` seconds:
+    python -c "from services.profiler import sign_token; print(sign_token())"
+    """
+    expires = int(time.time()) + ttl
+    return f"{expires}.{_signature(secret or PROFILER_SECRET, expires)}"
+
+
+def verify_token(token: Optional[str], secret: Optional[str] = None) -> bool:
+    secret = PROFILER_SECRET if secret is None else secret
+    if not token or not secret:
+        return False
+    expires, _, signature = token.partition(".")
+    try:
+        if int(expires) < time.time():
+            return False
+    except ValueError:
+        return False
+    return hmac.compare_digest(signature, _signature(secret, int(expires)))
+
+
+class Profile:
+    """
+    Stack samples collected while one request ran, aggregated by stack
+    (root first).
+    """
+
+    def __init__(self, profile_id: str, method: str, path: str, trigger: str, interval_ms: float):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.interval_ms = interval_ms
+        self.started_at = time.time()
+        self.duration_ms = 0.0
+        self.status: Optional[int] = None
+        self.samples: Counter = Counter()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "status": self.status,
+            "startedAt": self.started_at,
+            "durationMs": round(self.duration_ms, 2),
+            "intervalMs": self.interval_ms,
+            "samples": sum(self.samples.values()),
+        }
+
+    def collapsed(self) -> str:
+        """
+        Brendan Gregg's collapsed stack format (flamegraph.pl, speedscope, ...).
+        """
+        lines = [
+            ";".join(_frame_label(frame).replace(";", ":") for frame in stack) + f" {count}"
+            for stack, count in self.samples.most_common()
+        ]
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> Dict[str, Any]:
+        """
+        The profile as a speedscope file (https://www.speedscope.app).
+        """
+        frame_index: Dict[Frame, int] = {}
+        stacks: List[List[int]] = []
+        weights: List[float] = []
+        for stack, count in self.samples.items():
+            stacks.append([frame_index.setdefault(frame, len(frame_index)) for frame in stack])
+            weights.append(count * self.interval_ms)
+        name = f"{self.method} {self.path}"
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "evergreen-backend",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [
+                    {"name": function, "file": file, "line": line}
+                    for function, file, line in frame_index
+                ],
+            },
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": stacks,
+                "weights": weights,
+            }],
+        }
+
+
+def _frame_label(frame: Frame) -> str:
+    function, file, line = frame
+    return f"{function} ({file}:{line})"
+
+
+def _short_path(filename: str) -> str:
+    # Trim stdlib / site-packages / repo prefixes so labels stay readable
+    if filename.startswith(STDLIB_DIR):
+        return filename[len(STDLIB_DIR):]
+    for marker in ("site-packages/", "backend/"):
+        position = filename.rfind(marker)
+        if position != -1:
+            return filename[position + len(marker):]
+    return filename
+
+
+class StackSampler(threading.Thread):
+    """
+    Background thread that samples one thread's Python stack every
+    ``interval_ms`` into a Profile, then hands it to ``on_done`` once stopped.
+    """
+
+    def __init__(
+        self,
+        profile: Profile,
+        thread_id: int,
+        interval_ms: float,
+        on_done: Callable[[Profile], None],
+        max_seconds: float = PROFILE_MAX_SECONDS,
+    ):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.profile = profile
+        self.on_done = on_done
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.deadline = time.monotonic() + max_seconds
+        self._stopped = threading.Event()
+        self._labels: Dict[Any, Frame] = {}
+
+    def run(self):
+        while not self._stopped.wait(self.interval) and time.monotonic() < self.deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = self._labels.get(code)
+                if label is None:
+                    label = self._labels[code] = (code.co_name, _short_path(code.co_filename), code.co_firstlineno)
+                stack.append(label)
+                frame = frame.f_back
+            if stack:
+                self.profile.samples[tuple(reversed(stack))] += 1
+        # Past the deadline, wait for the request to end before publishing
+        self._stopped.wait()
+        self.on_done(self.profile)
+
+    def stop(self):
+        # No join: stop() runs on the event loop, and the thread exits by itself
+        self._stopped.set()
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and keeps the last ``buffer_size``
+    profiles. One request is profiled at a time; others run unprofiled.
+
+    Samples come from the event loop thread, so while a profiled request
+    awaits (e.g. on the Node subprocess) any other request the loop runs
+    shows up too, and pure waiting shows up as the loop's selector.
+    """
+
+    def __init__(
+        self,
+        secret: str = PROFILER_SECRET,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+        interval_ms: float = PROFILE_INTERVAL_MS,
+        buffer_size: int = PROFILE_BUFFER_SIZE,
+    ):
+        self.secret = secret
+        self.sample_rate = sample_rate
+        self.interval_ms = interval_ms
+        self.profiles: Deque[Profile] = deque(maxlen=buffer_size)
+        self._ids = itertools.count(1)
+        self._active = threading.Lock()
+        # Own generator so sampling never touches the global ``random`` state the mock data uses
+        self._random = random.Random()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.secret) or self.sample_rate > 0
+
+    def trigger(self, headers: Headers) -> Optional[str]:
+        """
+        Why this request should be profiled ("header" or "sampled"), or None.
+        """
+        if self.secret and verify_token(headers.get(PROFILE_HEADER), self.secret):
+            return "header"
+        if self.sample_rate > 0 and self._random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def start(self, method: str, path: str, trigger: str) -> Optional[StackSampler]:
+        if not self._active.acquire(blocking=False):
+            return None
+        profile = Profile(f"prof-{next(self._ids)}-{int(time.time())}", method, path, trigger, self.interval_ms)
+        sampler = StackSampler(profile, threading.get_ident(), self.interval_ms, self._store)
+        sampler.start()
+        return sampler
+
+    def finish(self, sampler: StackSampler, status: Optional[int]):
+        profile = sampler.profile
+        profile.status = status
+        profile.duration_ms = (time.time() - profile.started_at) * 1000
+        sampler.stop()
+
+    def _store(self, profile: Profile):
+        # Runs on the sampler thread after its last sample
+        self.profiles.append(profile)
+        self._active.release()
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return next((p for p in self.profiles if p.id == profile_id), None)
+
+
+request_profiler = RequestProfiler()
+
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware that samples the stacks of requests chosen by
+    ``RequestProfiler.trigger``. Profiled responses carry an X-Profile-Id
+    header; when profiling is off this is a single attribute check.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: RequestProfiler = request_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # Admin routes serve the profiles; profiling them would evict what is being fetched
+        if scope["type"] != "http" or not self.profiler.enabled or scope["path"].startswith(ADMIN_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        trigger = self.profiler.trigger(Headers(scope=scope))
+        sampler = self.profiler.start(scope["method"], scope["path"], trigger) if trigger else None
+        if sampler is None:
+            await self.app(scope, receive, send)
+            return
+
+        status = None
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = sampler.profile.id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.profiler.finish(sampler, status)
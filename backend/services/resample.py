@@ -0,0 +1,139 @@
+"""
+Time-series resampling for chart endpoints
+Shape-preserving downsampling (LTTB, min/max buckets) and day/week/month bucketing
+"""
+from typing import Sequence
+
+import numpy as np
+
+DEFAULT_POINTS = 200  # Enough for any chart width the frontend renders
+MAX_POINTS = 5000
+
+RESOLUTIONS = ("raw", "day", "week", "month")
+METHODS = ("lttb", "minmax")
+
+# Query parameter patterns for routers
+RESOLUTION_PATTERN = "^(" + "|".join(RESOLUTIONS) + ")$"
+METHOD_PATTERN = "^(" + "|".join(METHODS) + ")$"
+
+
+def period_ids(dates: np.ndarray, resolution: str) -> np.ndarray:
+    """
+    Integer id of the day/week/month period containing each date.
+    Weeks start on Monday.
+    """
+    days = np.asarray(dates).astype("datetime64[D]")
+    if resolution == "day":
+        return days.astype(np.int64)
+    if resolution == "week":
+        # 1970-01-01 was a Thursday
+        return (days.astype(np.int64) + 3) // 7
+    if resolution == "month":
+        return days.astype("datetime64[M]").astype(np.int64)
+    raise ValueError(f"Unknown resolution: {resolution}")
+
+
+def resolution_positions(dates: np.ndarray, resolution: str = "raw") -> np.ndarray:
+    """
+    Positions of the last point in each day/week/month period, or of every
+    point for ``raw``. ``dates`` must be sorted.
+    """
+    if resolution == "raw":
+        return np.arange(len(dates))
+    periods = period_ids(dates, resolution)
+    if len(periods) == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.append(np.flatnonzero(np.diff(periods)), len(periods) - 1)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: positions of ``points`` samples that keep
+    the visual shape of (x, y), including the first and last point.
+    """
+    n = len(y)
+    if points >= n:
+        return np.arange(n)
+    if points < 3:
+        return np.array([0, n - 1][:points], dtype=np.int64)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Interior buckets split points 1..n-2; bucket i covers [edges[i], edges[i+1])
+    edges = (np.arange(points - 1) * ((n - 2) / (points - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        # Pick the point forming the largest triangle with the previous pick
+        # and the next bucket's average
+        area = np.abs(
+            (x[a] - mean_x[i + 1]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (mean_y[i + 1] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Positions of the minimum and maximum of each bucket, plus the first and
+    last point. Keeps every peak and trough; returns at most ``points`` samples.
+    """
+    n = len(y)
+    if points >= n:
+        return np.arange(n)
+    if points < 4:
+        # Too few for one bucket's min and max: the ends, plus the extreme
+        # further from their midpoint when there's room for one more
+        ends = np.array([0, n - 1][:points], dtype=np.int64)
+        if points < 3:
+            return ends
+        y = np.asarray(y)
+        middle = (y[0] + y[-1]) / 2
+        low, high = int(np.argmin(y)), int(np.argmax(y))
+        extreme = low if middle - y[low] > y[high] - middle else high
+        return np.unique(np.append(ends, extreme))
+
+    buckets = (points - 2) // 2
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    bucket_ids = np.repeat(np.arange(buckets), np.diff(edges))
+    # Sorting by (bucket, value) puts each bucket's min first and max last
+    order = np.lexsort((np.asarray(y), bucket_ids))
+    return np.unique(np.concatenate(([0, n - 1], order[edges[:-1]], order[edges[1:] - 1])))
+
+
+def downsample(
+    dates: np.ndarray,
+    values: Sequence[float],
+    points: int = DEFAULT_POINTS,
+    resolution: str = "raw",
+    method: str = "lttb",
+) -> np.ndarray:
+    """
+    Sorted positions into ``dates``/``values`` to return for a chart:
+    the last point of each ``resolution`` period, reduced to at most ``points``
+    samples with ``method``. Callers format only the returned positions.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+
+    values = np.asarray(values, dtype=np.float64)
+    keep = resolution_positions(dates, resolution)
+    if len(keep) <= points:
+        return keep
+
+    if method == "minmax":
+        chosen = minmax(values[keep], points)
+    else:
+        x = np.asarray(dates)[keep].astype("datetime64[s]").astype(np.float64)
+        chosen = lttb(x, values[keep], points)
+    return keep[chosen]
@@ -0,0 +1,53 @@
+"""
+Fast JSON responses for large, internally produced payloads
+Skips FastAPI's response_model re-validation and jsonable_encoder when enabled
+"""
+import os
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Opt-in: routes keep their response_model for docs, but the payloads they
+# build themselves are trusted to already match it
+FAST_RESPONSES = os.getenv("FAST_RESPONSES", "").lower() in ("1", "true", "yes")
+
+# pydantic-core's serializer for plain dicts/lists, used when orjson isn't installed
+_any_adapter = TypeAdapter(Any)
+
+
+def dump_json(data: Any) -> bytes:
+    """
+    Serialize plain JSON-compatible data (dicts, lists, NumPy scalars/arrays with orjson).
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    return _any_adapter.dump_json(data)
+
+
+def fast_response(
+    data: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Any:
+    """
+    Wrap a route's payload in a pre-serialized JSON response when
+    FAST_RESPONSES is on; otherwise return it unchanged so FastAPI validates
+    it against the route's response_model as usual.
+
+    ``headers`` are set on the fast response; pass the injected Response's
+    headers here, since FastAPI ignores them when a Response is returned.
+    """
+    if not FAST_RESPONSES:
+        return data
+    return Response(
+        content=dump_json(data),
+        status_code=status_code,
+        headers=dict(headers) if headers else None,
+        media_type="application/json",
+    )
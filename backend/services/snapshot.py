@@ -0,0 +1,111 @@
+"""
+Versioned binary snapshots of NumPy arrays
+Written once at build time, memory-mapped read-only so every worker shares the same pages
+"""
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+MAGIC = b"EGSNAPSH"
+FORMAT_VERSION = 1
+ALIGNMENT = 64  # Every array starts on a cache-line boundary
+
+# magic, format version, length of the JSON header that follows
+PREAMBLE_DTYPE = np.dtype([("magic", "S8"), ("version", "<u4"), ("header_size", "<u4")])
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_snapshot(path: Path, arrays: Dict[str, np.ndarray], meta: Dict[str, Any], version: str):
+    """
+    Write ``arrays`` (1-D, fixed-size dtypes) plus JSON-serializable ``meta``
+    to ``path``, tagged with a dataset ``version``. The file is replaced
+    atomically so running workers keep their old mapping.
+    """
+    path = Path(path)
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        layout[name] = {"dtype": array.dtype.str, "length": len(array), "offset": offset}
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({"version": version, "meta": meta, "arrays": layout}).encode("utf-8")
+    data_start = _aligned(PREAMBLE_DTYPE.itemsize + len(header))
+
+    preamble = np.zeros(1, dtype=PREAMBLE_DTYPE)
+    preamble["magic"] = MAGIC
+    preamble["version"] = FORMAT_VERSION
+    preamble["header_size"] = len(header)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(preamble.tobytes())
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """
+    A snapshot file mapped read-only. ``arrays`` are zero-copy views into the
+    mapping, so their pages come from the OS page cache and are shared by
+    every process that maps the same file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        preamble = np.frombuffer(self._mmap, dtype=PREAMBLE_DTYPE, count=1)[0]
+        if preamble["magic"] != MAGIC:
+            raise ValueError(f"{self.path} is not a snapshot file")
+        if preamble["version"] != FORMAT_VERSION:
+            raise ValueError(f"{self.path} has snapshot format {preamble['version']}, expected {FORMAT_VERSION}")
+        header_end = PREAMBLE_DTYPE.itemsize + int(preamble["header_size"])
+        header = json.loads(self._mmap[PREAMBLE_DTYPE.itemsize:header_end])
+        data_start = _aligned(header_end)
+
+        self.version: str = header["version"]
+        self.meta: Dict[str, Any] = header["meta"]
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.frombuffer(
+                self._mmap,
+                dtype=np.dtype(spec["dtype"]),
+                count=spec["length"],
+                offset=data_start + spec["offset"],
+            )
+            for name, spec in header["arrays"].items()
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._mmap)
+
+
+def load_snapshot(path: Path, version: str) -> Optional[Snapshot]:
+    """
+    Map the snapshot at ``path`` if it exists and was built for ``version``;
+    otherwise None, and the caller rebuilds the data itself.
+    """
+    try:
+        snapshot = Snapshot(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ignoring snapshot {path}: {e}")
+        return None
+    if snapshot.version != version:
+        print(f"Ignoring snapshot {path}: built for dataset {snapshot.version}, expected {version}")
+        return None
+    return snapshot
@@ -0,0 +1,246 @@
+"""
+Append-only time-series store
+Array-backed (optionally memory-mapped) snapshots with prefix sums and day/week/month rollups
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from services.resample import period_ids
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev only
+    fcntl = None
+
+MAGIC = b"EGTSERIE"
+VERSION = 1
+INITIAL_CAPACITY = 1024
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("reserved", "<u4"),
+    ("count", "<u8"),
+    ("capacity", "<u8"),
+])
+RECORD_DTYPE = np.dtype([("ts", "<M8[s]"), ("value", "<f8")])
+
+ROLLUPS = ("day", "week", "month")
+
+
+class TimeSeriesStore:
+    """
+    Append-only series of (timestamp, value) snapshots in timestamp order.
+
+    With a ``path`` the records live in a memory-mapped file (32-byte header +
+    fixed-size records), so restarts and sibling workers reuse the stored
+    history instead of rebuilding it. Without one the store is in-memory.
+
+    Per process the store keeps a prefix sum of values and, for each rollup
+    resolution, the position of the last snapshot in every period. Appends
+    extend these incrementally; range queries are binary searches + slices.
+    """
+
+    def __init__(self, name: str, path: Optional[Path] = None):
+        self.name = name
+        self.path = Path(path) if path else None
+        self._header: np.ndarray = np.zeros(1, dtype=HEADER_DTYPE)
+        self._records: np.ndarray = np.zeros(0, dtype=RECORD_DTYPE)
+        self._count = 0
+        self._prefix = np.zeros(1, dtype=np.float64)
+        self._rollups: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            resolution: (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+            for resolution in ROLLUPS
+        }
+
+        if self.path is None:
+            self._allocate(INITIAL_CAPACITY)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._locked():
+                if not self.path.exists() or self.path.stat().st_size < HEADER_DTYPE.itemsize:
+                    self._create_file(INITIAL_CAPACITY)
+                self._map()
+        self._sync()
+
+    def __len__(self) -> int:
+        self._sync()
+        return self._count
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._records["ts"][:self._count]
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._records["value"][:self._count]
+
+    def last(self) -> Optional[Tuple[np.datetime64, float]]:
+        self._sync()
+        if not self._count:
+            return None
+        record = self._records[self._count - 1]
+        return record["ts"], float(record["value"])
+
+    def append(self, timestamp, value: float):
+        self.extend([timestamp], [value])
+
+    def extend(self, timestamps: Sequence, values: Sequence[float]):
+        """
+        Append snapshots. Timestamps must be strictly increasing and newer than
+        the last stored snapshot.
+        """
+        timestamps = np.asarray(timestamps, dtype="datetime64[s]")
+        values = np.asarray(values, dtype=np.float64)
+        if len(timestamps) != len(values):
+            raise ValueError("timestamps and values must have the same length")
+        if not len(timestamps):
+            return
+        if np.any(np.diff(timestamps) <= np.timedelta64(0, "s")):
+            raise ValueError("timestamps must be strictly increasing")
+
+        with self._locked():
+            self._sync()
+            if self._count and timestamps[0] <= self._records["ts"][self._count - 1]:
+                raise ValueError(f"{self.name}: snapshot not newer than the last stored one")
+
+            needed = self._count + len(timestamps)
+            if needed > len(self._records):
+                self._grow(max(needed, len(self._records) * 2))
+
+            start = self._count
+            self._records["ts"][start:needed] = timestamps
+            self._records["value"][start:needed] = values
+            if isinstance(self._records, np.memmap):
+                self._records.flush()
+            # Publish the records only after they are written
+            self._header["count"] = needed
+            if isinstance(self._header, np.memmap):
+                self._header.flush()
+        self._sync()
+
+    def history(
+        self,
+        days: int,
+        resolution: str = "raw",
+        now: Optional[np.datetime64] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (timestamps, values) for the last ``days`` days, either every snapshot
+        (``raw``) or the last snapshot of each day/week/month. Returns views.
+        """
+        self._sync()
+        now = np.datetime64("now", "s") if now is None else np.datetime64(now, "s")
+        start = int(np.searchsorted(self.timestamps, now - np.timedelta64(days, "D"), side="left"))
+        if resolution == "raw":
+            return self.timestamps[start:], self.values[start:]
+        _, positions = self._rollups[resolution]
+        positions = positions[np.searchsorted(positions, start):]
+        return self._records["ts"][positions], self._records["value"][positions]
+
+    def mean(self, days: int, now: Optional[np.datetime64] = None) -> Optional[float]:
+        """
+        Average of all snapshots in the last ``days`` days, from the prefix sums.
+        """
+        self._sync()
+        now = np.datetime64("now", "s") if now is None else np.datetime64(now, "s")
+        start = int(np.searchsorted(self.timestamps, now - np.timedelta64(days, "D"), side="left"))
+        if start >= self._count:
+            return None
+        return float((self._prefix[self._count] - self._prefix[start]) / (self._count - start))
+
+    def _sync(self):
+        # Pick up snapshots appended through the shared file by other processes
+        if self.path is not None and int(self._header["capacity"][0]) != len(self._records):
+            self._map()
+        count = int(self._header["count"][0])
+        if count > self._count:
+            self._index(self._count, count)
+            self._count = count
+
+    def _index(self, start: int, end: int):
+        # Extend prefix sums and rollups over records[start:end]
+        values = self._records["value"][start:end]
+        self._prefix = np.concatenate((self._prefix[:start + 1], self._prefix[start] + np.cumsum(values)))
+
+        timestamps = self._records["ts"][start:end]
+        for resolution in ROLLUPS:
+            periods, positions = self._rollups[resolution]
+            new_periods = period_ids(timestamps, resolution)
+            boundaries = np.append(np.flatnonzero(np.diff(new_periods)), len(new_periods) - 1)
+            new_periods = new_periods[boundaries]
+            new_positions = boundaries + start
+            if len(periods) and periods[-1] == new_periods[0]:
+                # The current period continues; its last snapshot moves forward
+                periods, positions = periods[:-1], positions[:-1]
+            self._rollups[resolution] = (
+                np.concatenate((periods, new_periods)),
+                np.concatenate((positions, new_positions)),
+            )
+
+    def _allocate(self, capacity: int):
+        records = np.zeros(capacity, dtype=RECORD_DTYPE)
+        records[:self._count] = self._records[:self._count]
+        self._records = records
+        self._header["magic"] = MAGIC
+        self._header["version"] = VERSION
+        self._header["capacity"] = capacity
+
+    def _grow(self, capacity: int):
+        if self.path is None:
+            self._allocate(capacity)
+            return
+        with open(self.path, "r+b") as f:
+            f.truncate(HEADER_DTYPE.itemsize + capacity * RECORD_DTYPE.itemsize)
+        self._header["capacity"] = capacity
+        self._header.flush()
+        self._map()
+
+    def _create_file(self, capacity: int):
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["capacity"] = capacity
+        with open(self.path, "wb") as f:
+            f.write(header.tobytes())
+            f.truncate(HEADER_DTYPE.itemsize + capacity * RECORD_DTYPE.itemsize)
+
+    def _map(self):
+        header = np.memmap(self.path, dtype=HEADER_DTYPE, mode="r+", shape=(1,))
+        if header["magic"][0] != MAGIC or header["version"][0] != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} time-series file")
+        capacity = int(header["capacity"][0])
+        self._header = header
+        self._records = np.memmap(
+            self.path, dtype=RECORD_DTYPE, mode="r+", offset=HEADER_DTYPE.itemsize, shape=(capacity,)
+        )
+
+    @contextmanager
+    def _locked(self):
+        # Serialize appends and file growth between worker processes
+        if self.path is None or fcntl is None:
+            yield
+            return
+        with open(str(self.path) + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def series_path(name: str) -> Optional[Path]:
+    """
+    File for a named series under TIMESERIES_DIR, or None to keep it in memory
+    (TIMESERIES_DIR set to an empty string).
+    """
+    directory = os.getenv("TIMESERIES_DIR")
+    if directory is None:
+        directory = str(Path(tempfile.gettempdir()) / "evergreen-timeseries")
+    if not directory:
+        return None
+    return Path(directory) / f"{name}.ts"
@@ -0,0 +1,104 @@
+/**
+ * JSON-RPC Worker
+ * Shared stdio transport for the long-lived workers the Python API talks to
+ * (dashboardWorker.ts, decisionWorker.ts).
+ *
+ * Protocol: every message on stdin/stdout is framed as
+ *   Content-Length: <bytes>\r\n\r\n<json body>
+ * Requests are { jsonrpc: "2.0", id, method, params } and responses carry the
+ * same id, so many calls can be in flight at once.
+ */
+
+export type Handler = (...params: any[]) => Promise<any>;
+
+export interface WorkerOptions {
+  name: string;
+  methods: Record<string, Handler>;
+  // Runs before every method except ping, e.g. to connect to Snowflake
+  beforeCall?: (method: string) => Promise<void>;
+}
+
+function send(message: any): void {
+  const body = Buffer.from(JSON.stringify(message), 'utf8');
+  process.stdout.write(`Content-Length: ${body.length}\r\n\r\n`);
+  process.stdout.write(body);
+}
+
+async function handle(options: WorkerOptions, request: any): Promise<void> {
+  const { id, method, params } = request;
+  const handler = options.methods[method];
+
+  if (!handler) {
+    send({ jsonrpc: '2.0', id, error: { code: -32601, message: `Unknown method: ${method}` } });
+    return;
+  }
+
+  try {
+    if (options.beforeCall && method !== 'ping') {
+      await options.beforeCall(method);
+    }
+    const result = await handler(...(Array.isArray(params) ? params : []));
+    send({ jsonrpc: '2.0', id, result: result === undefined ? null : result });
+  } catch (error) {
+    send({
+      jsonrpc: '2.0',
+      id,
+      error: { code: -32000, message: error instanceof Error ? error.message : String(error) },
+    });
+  }
+}
+
+/**
+ * Serve `options.methods` over stdin/stdout until the parent closes stdin.
+ */
+export function serveJsonRpc(options: WorkerOptions): void {
+  // stdout is reserved for protocol frames - route all logging to stderr
+  console.log = (...args: any[]) => console.error(...args);
+  console.info = (...args: any[]) => console.error(...args);
+
+  let buffer = Buffer.alloc(0);
+
+  process.stdin.on('data', (chunk: Buffer) => {
+    buffer = Buffer.concat([buffer, chunk]);
+
+    while (true) {
+      const headerEnd = buffer.indexOf('\r\n\r\n');
+      if (headerEnd === -1) {
+        return;
+      }
+
+      const header = buffer.slice(0, headerEnd).toString('utf8');
+      const match = /Content-Length:\s*(\d+)/i.exec(header);
+      if (!match) {
+        // Unrecoverable framing error - drop the header and resync
+        buffer = buffer.slice(headerEnd + 4);
+        continue;
+      }
+
+      const length = parseInt(match[1], 10);
+      const bodyStart = headerEnd + 4;
+      if (buffer.length < bodyStart + length) {
+        return;
+      }
+
+      const body = buffer.slice(bodyStart, bodyStart + length).toString('utf8');
+      buffer = buffer.slice(bodyStart + length);
+
+      let request: any;
+      try {
+        request = JSON.parse(body);
+      } catch (error) {
+        send({ jsonrpc: '2.0', id: null, error: { code: -32700, message: 'Parse error' } });
+        continue;
+      }
+      handle(options, request);
+    }
+  });
+
+  // Parent closed our stdin - shut down cleanly
+  process.stdin.on('end', () => {
+    process.exit(0);
+  });
+
+  console.error(`[${options.name}] Ready`);
+}
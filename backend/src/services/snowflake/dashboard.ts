@@ -31,27 +31,117 @@ export async function getLatestDecisions(limit: number = 20): Promise<DecisionRe
   try {
     const rows = await execute(query, [limit]);
     console.log(`[Snowflake] Retrieved ${rows.length} latest decisions`);
-    return rows.map((row: any) => ({
-      id: row.ID,
-      created_at: row.CREATED_AT,
-      market_id: row.MARKET_ID,
-      market_question: row.MARKET_QUESTION,
-      final_direction: row.FINAL_DIRECTION,
-      final_size: row.FINAL_SIZE,
-      agent_outputs: typeof row.AGENT_OUTPUTS === 'string' 
-        ? JSON.parse(row.AGENT_OUTPUTS) 
-        : row.AGENT_OUTPUTS,
-      consensus_reasoning: row.CONSENSUS_REASONING,
-      raw_market_data: typeof row.RAW_MARKET_DATA === 'string'
-        ? JSON.parse(row.RAW_MARKET_DATA)
-        : row.RAW_MARKET_DATA,
-    }));
+    return rows.map(mapDecisionRow);
   } catch (error) {
     console.error('[Snowflake] Error fetching latest decisions:', error);
     throw error;
   }
 }
 
+/**
+ * Get one page of decisions, newest first, using keyset pagination
+ * @param limit Maximum number of decisions to return
+ * @param direction Optional final_direction filter (YES or NO)
+ * @param cursorCreatedAt created_at of the last row on the previous page
+ * @param cursorId id of the last row on the previous page
+ * @returns Array of decision records strictly after the cursor
+ */
+export async function getDecisionsPage(
+  limit: number = 20,
+  direction: 'YES' | 'NO' | null = null,
+  cursorCreatedAt: string | null = null,
+  cursorId: string | null = null
+): Promise<DecisionRecord[]> {
+  const conditions: string[] = [];
+  const binds: any[] = [];
+
+  if (direction) {
+    conditions.push('final_direction = ?');
+    binds.push(direction);
+  }
+  if (cursorCreatedAt && cursorId) {
+    conditions.push('(created_at < TO_TIMESTAMP_NTZ(?) OR (created_at = TO_TIMESTAMP_NTZ(?) AND id < ?))');
+    binds.push(cursorCreatedAt, cursorCreatedAt, cursorId);
+  }
+  binds.push(limit);
+
+  const query = `
+    SELECT 
+      id,
+      created_at,
+      market_id,
+      market_question,
+      final_direction,
+      final_size,
+      agent_outputs,
+      consensus_reasoning,
+      raw_market_data
+    FROM decisions
+    ${conditions.length ? `WHERE ${conditions.join(' AND ')}` : ''}
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+  `;
+
+  try {
+    const rows = await execute(query, binds);
+    console.log(`[Snowflake] Retrieved page of ${rows.length} decisions`);
+    return rows.map(mapDecisionRow);
+  } catch (error) {
+    console.error('[Snowflake] Error fetching decisions page:', error);
+    throw error;
+  }
+}
+
+/**
+ * Get a single decision by primary key
+ * @param id The decision ID
+ * @returns The decision record, or null if no decision has that ID
+ */
+export async function getDecisionById(id: string): Promise<DecisionRecord | null> {
+  const query = `
+    SELECT 
+      id,
+      created_at,
+      market_id,
+      market_question,
+      final_direction,
+      final_size,
+      agent_outputs,
+      consensus_reasoning,
+      raw_market_data
+    FROM decisions
+    WHERE id = ?
+    LIMIT 1
+  `;
+
+  try {
+    const rows = await execute(query, [id]);
+    console.log(`[Snowflake] Retrieved decision: ${id} (${rows.length ? 'found' : 'not found'})`);
+    return rows.length ? mapDecisionRow(rows[0]) : null;
+  } catch (error) {
+    console.error('[Snowflake] Error fetching decision by id:', error);
+    throw error;
+  }
+}
+
+function mapDecisionRow(row: any): DecisionRecord {
+  return {
+    id: row.ID,
+    created_at: row.CREATED_AT,
+    market_id: row.MARKET_ID,
+    market_question: row.MARKET_QUESTION,
+    final_direction: row.FINAL_DIRECTION,
+    final_size: row.FINAL_SIZE,
+    agent_outputs: typeof row.AGENT_OUTPUTS === 'string' 
+      ? JSON.parse(row.AGENT_OUTPUTS) 
+      : row.AGENT_OUTPUTS,
+    consensus_reasoning: row.CONSENSUS_REASONING,
+    raw_market_data: typeof row.RAW_MARKET_DATA === 'string'
+      ? JSON.parse(row.RAW_MARKET_DATA)
+      : row.RAW_MARKET_DATA,
+  };
+}
+
 /**
  * Get trades by status
  * @param status Trade status: PENDING, EXECUTED, or FAILED
@@ -0,0 +1,37 @@
+/**
+ * Dashboard Worker
+ * Long-lived JSON-RPC worker that serves dashboard queries to the Python API.
+ *
+ * Protocol: Content-Length framed JSON-RPC 2.0 over stdio (see ../jsonRpcWorker.ts).
+ */
+
+import * as dashboard from './dashboard';
+import { initSnowflake } from '../../database/snowflake';
+import { Handler, serveJsonRpc } from '../jsonRpcWorker';
+
+const methods: Record<string, Handler> = {
+  ping: async () => 'pong',
+  getLatestDecisions: dashboard.getLatestDecisions,
+  getDecisionById: dashboard.getDecisionById,
+  getDecisionsPage: dashboard.getDecisionsPage,
+  getTradesByStatus: dashboard.getTradesByStatus,
+  getMarketHistory: dashboard.getMarketHistory,
+};
+
+let ready: Promise<void> | null = null;
+
+/**
+ * Initialize Snowflake once and share the connection across requests
+ */
+function ensureSnowflake(): Promise<void> {
+  if (!ready) {
+    ready = initSnowflake().catch((error) => {
+      // Allow the next request to retry the connection
+      ready = null;
+      throw error;
+    });
+  }
+  return ready;
+}
+
+serveJsonRpc({ name: 'DashboardWorker', methods, beforeCall: ensureSnowflake });